@@ -4,28 +4,37 @@ from __future__ import annotations
 
 import os
 import sys
-import tempfile
-from concurrent.futures import (
-    ProcessPoolExecutor,
-    ThreadPoolExecutor,
-    as_completed,
-)
+from operator import itemgetter
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import click
 from click import echo
 from colorama import Fore, Style, colorama_text
-from tqdm import tqdm
 
-from .lint import lint_file
-from .output import print_output
-from .reformat import reformat_file
-from .settings import Config
-from .src import get_src
+from .cache import ResultCache, build_entry, load_result
+from .lint import RULE_ERROR_CODE, TIMEOUT_CODE, lint_file, linter
+from .output import ReorderBuffer, ResultPrinter, print_output
+from .src import get_changed_src, get_src, has_pragma
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from typing_extensions import Any
+
+    from .lint import RuleProfile
     from .output import ProcessResult
+    from .reformat import FormatTimings
+    from .settings import Config
+
+# config of the current pool worker, see init_worker.
+worker_config: dict[str, Config] = {}
+
+# target bytes of template per task, and the fixed cost counted per file.
+CHUNK_SIZE = 256 * 1024
+FILE_OVERHEAD = 1024
+# minimum number of tasks per worker, to balance the load.
+CHUNKS_PER_WORKER = 4
 
 
 @click.command(context_settings={"help_option_names": ["-h", "--help"]})  # type: ignore[operator]
@@ -39,7 +48,6 @@ if TYPE_CHECKING:
         allow_dash=True,
     ),
     nargs=-1,
-    required=True,
     metavar="SRC ...",
 )
 @click.version_option(package_name="djlint")
@@ -122,6 +130,22 @@ if TYPE_CHECKING:
     is_flag=True,
     help="Count the number of occurrences of each error/warning code.",
 )
+@click.option(
+    "--profile-rules",
+    is_flag=True,
+    help="Show the time and matches of each linter rule.",
+)
+@click.option(
+    "--profile-rules-json",
+    type=click.Path(dir_okay=False, writable=True),
+    metavar="FILE",
+    help="Write the linter rule profile to a json file.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help="Show the time of each formatter stage and the line cache hit rate.",
+)
 @click.option(
     "--include",
     type=str,
@@ -240,6 +264,62 @@ if TYPE_CHECKING:
     help="Consolidate blank lines down to x lines. [default: 0]",
     show_default=False,
 )
+@click.option(
+    "--rule-timeout",
+    type=click.FloatRange(min=0),
+    metavar="SECONDS",
+    help="Stop a linter rule that runs longer on a file, 0 is no limit.",
+    show_default=False,
+)
+@click.option(
+    "--file-timeout",
+    type=click.FloatRange(min=0),
+    metavar="SECONDS",
+    help="Stop linting a file that takes longer, 0 is no limit.",
+    show_default=False,
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    help="Number of files to process in parallel, 0 uses all cores. [default: up to 4]",
+    show_default=False,
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Print the results of each file as soon as it is done.",
+)
+@click.option(
+    "--no-cache", is_flag=True, help="Do not read or write the result cache."
+)
+@click.option(
+    "--changed-since",
+    type=str,
+    metavar="REF",
+    help="Only check files that git reports as changed since a commit.",
+)
+@click.option(
+    "--staged", is_flag=True, help="Only check files that are staged in git."
+)
+@click.option(
+    "--watch", is_flag=True, help="Check the files again each time they change."
+)
+@click.option(
+    "--daemon",
+    is_flag=True,
+    help="Start a long-lived server that keeps the configuration warm.",
+)
+@click.option(
+    "--use-daemon",
+    is_flag=True,
+    help="Send the run to the djLint daemon, if it is running.",
+)
+@click.option(
+    "--daemon-socket",
+    type=click.Path(dir_okay=False),
+    help="Unix socket of the djLint daemon.",
+)
 @colorama_text(autoreset=True)
 def main(
     *,
@@ -261,6 +341,9 @@ def main(
     format_js: bool,
     configuration: str | None,
     statistics: bool,
+    profile_rules: bool,
+    profile_rules_json: str | None,
+    timings: bool,
     include: str,
     ignore_case: bool,
     ignore_blocks: str,
@@ -283,176 +366,431 @@ def main(
     no_function_formatting: bool,
     no_set_formatting: bool,
     max_blank_lines: int | None,
+    rule_timeout: float | None,
+    file_timeout: float | None,
+    no_cache: bool,
+    jobs: int | None,
+    stream: bool,
+    changed_since: str | None,
+    staged: bool,
+    watch: bool,
+    daemon: bool,
+    use_daemon: bool,
+    daemon_socket: str | None,
 ) -> None:
     """djLint · HTML template linter and formatter."""
-    config = Config(
-        src[0],
-        extension=extension,
-        ignore=ignore,
-        indent=indent,
-        quiet=quiet,
-        profile=profile,
-        require_pragma=require_pragma,
-        lint=lint or not (reformat or check),
-        reformat=reformat,
-        check=check,
-        use_gitignore=use_gitignore,
-        warn=warn,
-        preserve_leading_space=preserve_leading_space,
-        preserve_blank_lines=preserve_blank_lines,
-        format_css=format_css,
-        format_js=format_js,
-        configuration=configuration,
-        statistics=statistics,
-        include=include,
-        ignore_case=ignore_case,
-        ignore_blocks=ignore_blocks,
-        blank_line_after_tag=blank_line_after_tag,
-        blank_line_before_tag=blank_line_before_tag,
-        line_break_after_multiline_tag=line_break_after_multiline_tag,
-        custom_blocks=custom_blocks,
-        custom_html=custom_html,
-        exclude=exclude,
-        extend_exclude=extend_exclude,
-        linter_output_format=linter_output_format,
-        max_line_length=max_line_length,
-        max_attribute_length=max_attribute_length,
-        format_attribute_template_tags=format_attribute_template_tags,
-        per_file_ignores=per_file_ignores,
-        indent_css=indent_css,
-        indent_js=indent_js,
-        close_void_tags=close_void_tags,
-        no_line_after_yaml=no_line_after_yaml,
-        no_function_formatting=no_function_formatting,
-        no_set_formatting=no_set_formatting,
-        max_blank_lines=max_blank_lines,
-    )
+    socket_path = Path(daemon_socket) if daemon_socket else None
 
-    temp_file = None
+    if daemon:
+        if not supports_unix_sockets():
+            msg = "--daemon needs Unix domain sockets."
+            raise click.UsageError(msg)
 
-    try:
+        from .daemon import serve
+
+        serve(socket_path)
+        return
+
+    if not src:
+        msg = "Missing argument 'SRC ...'."
+        raise click.UsageError(msg)
+
+    options: dict[str, Any] = {
+        "extension": extension,
+        "ignore": ignore,
+        "indent": indent,
+        "quiet": quiet,
+        "profile": profile,
+        "require_pragma": require_pragma,
+        "lint": lint or not (reformat or check),
+        "reformat": reformat,
+        "check": check,
+        "use_gitignore": use_gitignore,
+        "warn": warn,
+        "preserve_leading_space": preserve_leading_space,
+        "preserve_blank_lines": preserve_blank_lines,
+        "format_css": format_css,
+        "format_js": format_js,
+        "configuration": configuration,
+        "statistics": statistics,
+        "profile_rules": profile_rules,
+        "profile_rules_json": profile_rules_json,
+        "timings": timings,
+        "include": include,
+        "ignore_case": ignore_case,
+        "ignore_blocks": ignore_blocks,
+        "blank_line_after_tag": blank_line_after_tag,
+        "blank_line_before_tag": blank_line_before_tag,
+        "line_break_after_multiline_tag": line_break_after_multiline_tag,
+        "custom_blocks": custom_blocks,
+        "custom_html": custom_html,
+        "exclude": exclude,
+        "extend_exclude": extend_exclude,
+        "linter_output_format": linter_output_format,
+        "max_line_length": max_line_length,
+        "max_attribute_length": max_attribute_length,
+        "format_attribute_template_tags": format_attribute_template_tags,
+        "per_file_ignores": per_file_ignores,
+        "indent_css": indent_css,
+        "indent_js": indent_js,
+        "close_void_tags": close_void_tags,
+        "no_line_after_yaml": no_line_after_yaml,
+        "no_function_formatting": no_function_formatting,
+        "no_set_formatting": no_set_formatting,
+        "max_blank_lines": max_blank_lines,
+        "rule_timeout": rule_timeout,
+        "file_timeout": file_timeout,
+        "no_cache": no_cache,
+        "jobs": jobs,
+        "stream": stream,
+        "changed_since": changed_since,
+        "staged": staged,
+    }
+
+    stdin_text = None
+    if use_daemon and supports_unix_sockets():
+        from .daemon import request
+
+        if "-" in src:
+            stdin_text = read_stdin()
+
+        response = request(socket_path, src, options, stdin_text)
+        if response is not None:
+            echo(response["output"], nl=False)
+            sys.exit(response["exit_code"])
+
+    from .settings import Config
+
+    config = Config(src[0], **options)
+
+    if watch:
         if "-" in src:
-            if config.files:
-                file_list = get_src((Path(x) for x in config.files), config)
+            msg = "--watch cannot be used with stdin."
+            raise click.UsageError(msg)
+
+        from .watch import watch as watch_files
+
+        watch_files(config, src)
+        return
+
+    if run(config, src, stdin_text=stdin_text):
+        sys.exit(1)
+
+
+def supports_unix_sockets() -> bool:
+    """Check if the platform has Unix sockets, which the daemon uses."""
+    import socket
+
+    return hasattr(socket, "AF_UNIX")
+
+
+def read_stdin() -> str:
+    """Read the template passed on stdin."""
+    return click.get_text_stream("stdin", encoding="utf-8").read()
 
-            else:
-                config.stdin = True
-                stdin_stream = click.get_text_stream("stdin", encoding="utf-8")
-                stdin_text = stdin_stream.read()
-                temp_file = tempfile.NamedTemporaryFile(  # noqa: SIM115
-                    mode="w", encoding="utf-8", delete=False
-                )
-                temp_file.write(stdin_text)
-                temp_file.seek(0)
 
-                # cannot use gitignore for stdin paths.
-                config.use_gitignore = False
+def run(
+    config: Config,
+    src: Sequence[str],
+    *,
+    stdin_text: str | None = None,
+    progress: bool = True,
+) -> int:
+    """Lint and format the source files and print the results.
+
+    Returns the exit status of the run.
+    """
+    printer = None
+    file_errors: list[ProcessResult] = []
+
+    if "-" in src and config.files:
+        file_list = get_src((Path(x) for x in config.files), config)
+    elif "-" in src:
+        config.stdin = True
+        if stdin_text is None:
+            stdin_text = read_stdin()
+        return run_stdin(config, stdin_text)
+    elif config.changed_since or config.staged:
+        file_list = get_changed_src((Path(x) for x in src), config)
+    else:
+        file_list = get_src((Path(x) for x in src), config)
+
+    if not file_list:
+        return 0
+
+    # the config fingerprint is computed here, once, and shipped to the
+    # workers along with the config.
+    cache = ResultCache(config) if config.cache else None
+
+    message = ""
+
+    if config.check:
+        message = "Checking"
+    elif config.reformat:
+        message = "Reformatting"
+
+    if config.lint:
+        if message:
+            message += " and "
+        message += "Linting"
+
+    bar_message = "{}{}{} {}{{n_fmt}}/{{total_fmt}}{} {}files{} {{bar}} {}{{elapsed}}{}".format(
+        Fore.BLUE + Style.BRIGHT,
+        message,
+        Style.RESET_ALL,
+        Fore.RED + Style.BRIGHT,
+        Style.RESET_ALL,
+        Fore.BLUE + Style.BRIGHT,
+        Style.RESET_ALL,
+        Fore.GREEN + Style.BRIGHT,
+        Style.RESET_ALL + "    ",
+    )
+    if not config.quiet:
+        echo()
+
+    # the pool and the progress bar are slow to import, and not needed for
+    # stdin or --version.
+    from concurrent.futures import (
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+        as_completed,
+    )
+
+    from tqdm import tqdm
+
+    progress_char = " »" if sys.platform == "win32" else "┈━"
+    worker_count = get_worker_count(config, len(file_list))
+    executor_cls = (
+        ProcessPoolExecutor if worker_count > 1 else ThreadPoolExecutor
+    )
 
-                file_list = get_src((Path(temp_file.name),), config)
+    # the config is sent to each worker once, tasks only carry paths.
+    with executor_cls(
+        max_workers=worker_count, initializer=init_worker, initargs=(config,)
+    ) as exe:
+        # streamed results are printed in path order, so the files are
+        # sent in that order, and few results wait for an earlier one.
+        futures = {
+            exe.submit(process_paths, chunk): chunk
+            for chunk in build_chunks(
+                file_list, worker_count, in_order=config.stream
+            )
+        }
+
+        if config.stream:
+            # print files in path order as soon as all earlier paths are
+            # done, without keeping the results around.
+            printer = ResultPrinter(config)
+            printer.start()
+            buffer = ReorderBuffer(printer, file_list)
+            for future in as_completed(futures):
+                for this_file, result in zip(
+                    futures.pop(future), future.result()
+                ):
+                    buffer.add(this_file, result)
+
+        elif progress:
+            elapsed = "00:00"
+            with tqdm(
+                total=len(file_list),
+                bar_format=bar_message,
+                colour="BLUE",
+                ascii=progress_char,
+                leave=False,
+            ) as pbar:
+                for future in as_completed(futures):
+                    file_errors.extend(future.result())
+                    pbar.update(len(futures[future]))
+                    elapsed = pbar.format_interval(pbar.format_dict["elapsed"])
 
+            finished_bar_message = f"{Fore.BLUE + Style.BRIGHT}{message}{Style.RESET_ALL} {Fore.GREEN + Style.BRIGHT}{{n_fmt}}/{{total_fmt}}{Style.RESET_ALL} {Fore.BLUE + Style.BRIGHT}files{Style.RESET_ALL} {{bar}} {Fore.GREEN + Style.BRIGHT}{elapsed}{Style.RESET_ALL}    "
+
+            with tqdm(
+                total=len(file_list),
+                initial=len(file_list),
+                bar_format=finished_bar_message,
+                colour="GREEN",
+                ascii=progress_char,
+                leave=True,
+            ):
+                pass
         else:
-            file_list = get_src((Path(x) for x in src), config)
-
-        if not file_list:
-            return
-
-        message = ""
-
-        if config.check:
-            message = "Checking"
-        elif config.reformat:
-            message = "Reformatting"
-
-        if config.lint:
-            if message:
-                message += " and "
-            message += "Linting"
-
-        bar_message = "{}{}{} {}{{n_fmt}}/{{total_fmt}}{} {}files{} {{bar}} {}{{elapsed}}{}".format(
-            Fore.BLUE + Style.BRIGHT,
-            message,
-            Style.RESET_ALL,
-            Fore.RED + Style.BRIGHT,
-            Style.RESET_ALL,
-            Fore.BLUE + Style.BRIGHT,
-            Style.RESET_ALL,
-            Fore.GREEN + Style.BRIGHT,
-            Style.RESET_ALL + "    ",
+            file_errors = [
+                result
+                for future in as_completed(futures)
+                for result in future.result()
+            ]
+
+    if cache is not None:
+        cache.prune()
+
+    error_count = (
+        printer.finish(len(file_list))
+        if printer
+        else print_output(config, file_errors, len(file_list))
+    )
+    return int(bool(error_count) and not config.warn)
+
+
+def run_stdin(config: Config, text: str) -> int:
+    """Lint and format a template from stdin in memory.
+
+    Editors pipe every buffer through here, so there is no temp file,
+    file walk or worker pool.
+    """
+    if not has_pragma(config, text):
+        echo(Fore.BLUE + "No files to check! 😢")
+        return 0
+
+    timings: FormatTimings | None = None
+    if config.reformat or config.check:
+        from .reformat import formatter, new_timings
+
+        if config.timings:
+            timings = new_timings()
+        text = formatter(config, text, timings=timings)
+
+    # use the line endings the code would have when read back from a file.
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    if config.reformat or config.check:
+        # only give back the formatted code.
+        echo(text.rstrip().encode("utf-8"))
+
+    printer = ResultPrinter(config)
+    printer.start()
+    if config.lint:
+        # the formatted code is linted, as it replaces the input.
+        profile: dict[str, RuleProfile] | None = (
+            {} if config.profile_rules else None
         )
-        if not config.stdin and not config.quiet:
-            echo()
+        result: ProcessResult = {
+            "lint_message": linter(config, text, "-", "-", profile=profile)
+        }
+        if profile is not None:
+            result["rule_profile"] = profile
+        printer.add(result)
+    if timings is not None:
+        printer.add({"format_timings": timings})
+
+    error_count = printer.finish(1)
+    return int(bool(error_count) and not config.warn)
+
+
+def get_worker_count(config: Config, file_count: int) -> int:
+    """Get the number of workers to use for a run."""
+    cpu_count = os.cpu_count() or 1
+    if config.jobs is None:
+        return min(cpu_count, file_count, 4)
+    return max(min(config.jobs or cpu_count, file_count), 1)
+
+
+def file_size(this_file: Path) -> int:
+    """Get the size of a file, used to schedule large files first."""
+    try:
+        return this_file.stat().st_size
+    except OSError:
+        return 0
+
 
-        progress_char = " »" if sys.platform == "win32" else "┈━"
-        worker_count = min(os.cpu_count() or 1, len(file_list), 4)
-        executor_cls = (
-            ProcessPoolExecutor if worker_count > 1 else ThreadPoolExecutor
+def build_chunks(
+    file_list: list[Path], worker_count: int, *, in_order: bool = False
+) -> list[list[Path]]:
+    """Split the files into tasks of about the same amount of work.
+
+    Small files are batched to save the pool bookkeeping of one task per
+    file, while each worker still gets several tasks to balance the load.
+    Large files go first so they do not set the tail latency, unless the
+    tasks are needed in path order.
+    """
+    if in_order:
+        sizes = [
+            (file_size(x) + FILE_OVERHEAD, x)
+            for x in sorted(file_list, key=str)
+        ]
+    else:
+        sizes = sorted(
+            ((file_size(x) + FILE_OVERHEAD, x) for x in file_list),
+            key=itemgetter(0),
+            reverse=True,
         )
+    chunk_size = min(
+        CHUNK_SIZE,
+        sum(size for size, _ in sizes) // (worker_count * CHUNKS_PER_WORKER),
+    )
 
-        with executor_cls(max_workers=worker_count) as exe:
-            futures = {
-                exe.submit(process, config, this_file): this_file
-                for this_file in file_list
-            }
-
-            if temp_file is None:
-                file_errors = []
-                elapsed = "00:00"
-                with tqdm(
-                    total=len(file_list),
-                    bar_format=bar_message,
-                    colour="BLUE",
-                    ascii=progress_char,
-                    leave=False,
-                ) as pbar:
-                    for future in as_completed(futures):
-                        file_errors.append(future.result())
-                        pbar.update()
-                        elapsed = pbar.format_interval(
-                            pbar.format_dict["elapsed"]
-                        )
-
-                finished_bar_message = f"{Fore.BLUE + Style.BRIGHT}{message}{Style.RESET_ALL} {Fore.GREEN + Style.BRIGHT}{{n_fmt}}/{{total_fmt}}{Style.RESET_ALL} {Fore.BLUE + Style.BRIGHT}files{Style.RESET_ALL} {{bar}} {Fore.GREEN + Style.BRIGHT}{elapsed}{Style.RESET_ALL}    "
-
-                with tqdm(
-                    total=len(file_list),
-                    initial=len(file_list),
-                    bar_format=finished_bar_message,
-                    colour="GREEN",
-                    ascii=progress_char,
-                    leave=True,
-                ):
-                    pass
-            else:
-                file_errors = [
-                    future.result() for future in as_completed(futures)
-                ]
-
-        if temp_file and (config.reformat or config.check):
-            # if using stdin, only give back formatted code.
-            echo(
-                Path(temp_file.name)
-                .read_text(encoding="utf-8")
-                .rstrip()
-                .encode("utf-8")
-            )
-    finally:
-        if temp_file:
-            try:
-                temp_file.close()
-            finally:
-                Path(temp_file.name).unlink(missing_ok=True)
-
-    if print_output(config, file_errors, len(file_list)) and not config.warn:
-        sys.exit(1)
+    chunks: list[list[Path]] = []
+    chunk: list[Path] = []
+    total = 0
+    for size, this_file in sizes:
+        if chunk and total + size > chunk_size:
+            chunks.append(chunk)
+            chunk = []
+            total = 0
+        chunk.append(this_file)
+        total += size
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def init_worker(config: Config) -> None:
+    """Install the config of the run in a pool worker."""
+    worker_config["config"] = config
+
+
+def process_paths(paths: list[Path]) -> list[ProcessResult]:
+    """Process a chunk of files with the config installed by init_worker."""
+    config = worker_config["config"]
+    return [process(config, this_file) for this_file in paths]
 
 
 def process(config: Config, this_file: Path) -> ProcessResult:
+    """Run linter or formatter, reusing cached results when possible."""
+    if not config.cache:
+        return process_file(config, this_file)
+
+    cache = ResultCache(config)
+    key = cache.key(this_file, this_file.read_bytes())
+    entry = cache.get(key)
+    if entry is not None:
+        return load_result(this_file, entry)
+
+    output = process_file(config, this_file)
+    # a file that ran out of time, or met a broken rule, is checked again
+    # on the next run.
+    if not any(
+        x["code"] in {TIMEOUT_CODE, RULE_ERROR_CODE}
+        for errors in output.get("lint_message", {}).values()
+        for x in errors
+    ):
+        cache.set(key, build_entry(config, this_file, output))
+    return output
+
+
+def process_file(config: Config, this_file: Path) -> ProcessResult:
     """Run linter or formatter."""
     output: ProcessResult = {}
-    if config.reformat or config.check:
+    if (config.reformat or config.check) and config.timings:
+        from .reformat import new_timings, reformat_file
+
+        timings = new_timings()
+        output["format_message"] = reformat_file(
+            config, this_file, timings=timings
+        )
+        output["format_timings"] = timings
+    elif config.reformat or config.check:
+        from .reformat import reformat_file
+
         output["format_message"] = reformat_file(config, this_file)
 
-    if config.lint:
+    if config.lint and config.profile_rules:
+        profile: dict[str, RuleProfile] = {}
+        output["lint_message"] = lint_file(config, this_file, profile=profile)
+        output["rule_profile"] = profile
+    elif config.lint:
         output["lint_message"] = lint_file(config, this_file)
 
     return output
@@ -0,0 +1,155 @@
+"""Persistent cache of lint and format results.
+
+Entries are keyed by the file path and content plus the config
+fingerprint, so an unchanged file skips the formatter and linter.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing_extensions import TypedDict
+
+    from .output import ProcessResult
+    from .settings import Config
+
+    class CacheEntry(TypedDict):
+        formatted: str | None
+        diff: list[str] | None
+        errors: list[dict[str, str]] | None
+
+
+CACHE_SUFFIX = ".json"
+
+
+class ResultCache:
+    """Directory of json entries with a least recently used size limit."""
+
+    def __init__(self, config: Config) -> None:
+        self.fingerprint = config.fingerprint
+        self.directory = config.cache_dir
+        self.max_size = config.max_cache_size * 1024 * 1024
+
+    def key(self, this_file: Path, content: bytes) -> str:
+        """Build the cache key of a file.
+
+        The path is part of the key because per-file-ignores and
+        python_module rules can depend on it.
+        """
+        digest = hashlib.sha256(self.fingerprint.encode("utf-8"))
+        digest.update(this_file.as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Load an entry and mark it as recently used."""
+        path = self.directory / (key + CACHE_SUFFIX)
+        try:
+            entry: CacheEntry = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Atomically write an entry. Failures leave the cache untouched."""
+        import tempfile
+
+        try:
+            self._ensure_directory()
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+
+        tmp = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            tmp.replace(self.directory / (key + CACHE_SUFFIX))
+        except OSError:
+            with contextlib.suppress(OSError):
+                tmp.unlink(missing_ok=True)
+
+    def prune(self) -> None:
+        """Evict the least recently used entries above the size limit."""
+        entries = []
+        try:
+            for path in self.directory.glob("*" + CACHE_SUFFIX):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=itemgetter(0)):
+            if total <= self.max_size:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+            total -= size
+
+    def _ensure_directory(self) -> None:
+        if self.directory.is_dir():
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / ".gitignore").write_text("*\n", encoding="utf-8")
+        (self.directory / "CACHEDIR.TAG").write_text(
+            "Signature: 8a477f597d28d172789f06886806bc55\n", encoding="utf-8"
+        )
+
+
+def load_result(this_file: Path, entry: CacheEntry) -> ProcessResult:
+    """Rebuild a process result from a cache entry.
+
+    Reformatting a file from the cache rewrites it with the stored output.
+    """
+    output: ProcessResult = {}
+    filename = str(this_file)
+
+    if entry["formatted"] is not None:
+        with this_file.open("w", encoding="utf-8", newline="") as f:
+            f.write(entry["formatted"])
+
+    if entry["diff"] is not None:
+        output["format_message"] = {filename: tuple(entry["diff"])}
+
+    if entry["errors"] is not None:
+        output["lint_message"] = {filename: entry["errors"]}  # type: ignore[dict-item]
+
+    return output
+
+
+def build_entry(
+    config: Config, this_file: Path, output: ProcessResult
+) -> CacheEntry:
+    """Build a cache entry from a fresh process result."""
+    filename = str(this_file)
+    diff = (
+        output["format_message"][filename]
+        if "format_message" in output
+        else None
+    )
+    formatted = None
+
+    if diff and config.reformat and not config.check:
+        # the file was rewritten, store the new content to replay it.
+        with this_file.open(encoding="utf-8", newline="") as f:
+            formatted = f.read()
+
+    return {
+        "formatted": formatted,
+        "diff": list(diff) if diff is not None else None,
+        "errors": (
+            list(output["lint_message"][filename])  # type: ignore[arg-type]
+            if "lint_message" in output
+            else None
+        ),
+    }
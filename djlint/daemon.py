@@ -0,0 +1,249 @@
+"""djLint daemon.
+
+A long-lived server that keeps the config of each project warm and
+runs lint and format requests sent by ``djlint --use-daemon``.
+
+Requests and responses are a single line of json over a Unix socket,
+so the module is only imported where those are available.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import getpass
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+from click import echo
+from colorama import Fore
+
+from . import main, run
+from .settings import Config, find_project_root
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from typing_extensions import Any, TypedDict
+
+    class DaemonRequest(TypedDict):
+        cwd: str
+        src: list[str]
+        options: dict[str, Any]
+        stdin: str | None
+        color: bool
+
+    class DaemonResponse(TypedDict):
+        output: str
+        exit_code: int
+
+
+# files that change the config of a project when they are edited.
+CONFIG_FILES = (
+    "pyproject.toml",
+    ".djlintrc",
+    ".djlint_rules.yaml",
+    ".gitignore",
+)
+
+
+def default_socket() -> Path:
+    """Get the socket path of the current user.
+
+    Other users must not reach the socket, so it goes in the runtime
+    directory of the user, or else in a directory of its own.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and Path(runtime_dir).is_dir():
+        return Path(runtime_dir) / "djlint.sock"
+    return (
+        Path(tempfile.gettempdir())
+        / f"djlint-{getpass.getuser()}"
+        / "djlint.sock"
+    )
+
+
+def is_owned(path: Path) -> bool:
+    """Check if a path belongs to the current user."""
+    try:
+        return path.stat().st_uid == os.getuid()
+    except OSError:
+        return False
+
+
+def config_stamp(root: Path, configuration: str | None) -> tuple[int, ...]:
+    """Get the modification times of the files a config is built from."""
+    paths = [root / x for x in CONFIG_FILES]
+    if configuration:
+        paths.append(Path(configuration))
+
+    return tuple(modified_time(x) for x in paths)
+
+
+def modified_time(path: Path) -> int:
+    """Get the modification time of a file, -1 if it is missing."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+class ConfigStore:
+    """Warm configs, one per project root and set of cli options."""
+
+    def __init__(self) -> None:
+        self.configs: dict[tuple[str, str], tuple[tuple[int, ...], Config]] = {}
+
+    def get(self, src: str, options: Mapping[str, Any]) -> Config:
+        """Get a config, rebuilding it if its config files changed."""
+        root = find_project_root(Path.cwd() if src == "-" else Path(src))
+        key = (str(root.resolve()), json.dumps(options, sort_keys=True))
+        stamp = config_stamp(root, options.get("configuration"))
+
+        cached = self.configs.get(key)
+        if cached is None or cached[0] != stamp:
+            config = Config(src, **options)
+            # build the compiled settings once, the copies share them.
+            _ = config.patterns, config.rule_plan, config.line_classifier
+            if config.cache:
+                _ = config.fingerprint
+            cached = self.configs[key] = (stamp, config)
+
+        # runs set some attributes, for example for stdin.
+        return copy.copy(cached[1])
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Serve requests one at a time, they share the working directory."""
+
+    def __init__(self, socket_path: Path) -> None:
+        # the socket is created private, other users cannot connect to it
+        # before its mode could be changed.
+        umask = os.umask(0o077)
+        try:
+            super().__init__(str(socket_path), RequestHandler)
+        finally:
+            os.umask(umask)
+        self.configs = ConfigStore()
+
+    def run_request(self, request: DaemonRequest) -> DaemonResponse:
+        """Run djLint as the client would have and capture the output."""
+        buffer = io.BytesIO()
+        output = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+        try:
+            os.chdir(request["cwd"])
+            src = request["src"]
+            config = self.configs.get(src[0], request["options"])
+
+            context = click.Context(main, color=request["color"])
+            with context, contextlib.redirect_stdout(output):
+                exit_code = run(
+                    config, src, stdin_text=request["stdin"], progress=False
+                )
+        except click.ClickException as error:
+            return {
+                "output": f"Error: {error.format_message()}\n",
+                "exit_code": error.exit_code,
+            }
+        except Exception as error:
+            return {"output": f"djLint daemon error: {error}\n", "exit_code": 2}
+
+        output.flush()
+        return {
+            "output": buffer.getvalue().decode("utf-8"),
+            "exit_code": exit_code,
+        }
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Read one request line and write one response line."""
+
+    server: DaemonServer
+
+    def handle(self) -> None:  # type: ignore[explicit-override]
+        """Handle a request."""
+        request = json.loads(self.rfile.readline())
+        response = self.server.run_request(request)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def is_running(socket_path: Path) -> bool:
+    """Check if a daemon is listening on the socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def serve(socket_path: Path | None) -> None:
+    """Run the daemon until it is interrupted."""
+    if socket_path is None:
+        socket_path = default_socket()
+        socket_path.parent.mkdir(mode=0o700, exist_ok=True)
+        if not is_owned(socket_path.parent):
+            msg = f"{socket_path.parent} belongs to another user."
+            raise click.UsageError(msg)
+
+    if socket_path.exists():
+        if is_running(socket_path):
+            msg = f"A djLint daemon is already running on {socket_path}."
+            raise click.UsageError(msg)
+        # left behind by a daemon that did not shut down cleanly.
+        socket_path.unlink()
+
+    # stop cleanly on kill as well as ctrl-c.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    with DaemonServer(socket_path) as server:
+        try:
+            echo(f"{Fore.BLUE}djLint daemon listening on {socket_path}")
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def request(
+    socket_path: Path | None,
+    src: Sequence[str],
+    options: dict[str, Any],
+    stdin_text: str | None,
+) -> DaemonResponse | None:
+    """Send a run to the daemon.
+
+    Returns None when no daemon answers, the caller then runs locally.
+    """
+    payload: DaemonRequest = {
+        "cwd": str(Path.cwd()),
+        "src": list(src),
+        "options": options,
+        "stdin": stdin_text,
+        "color": sys.stdout.isatty(),
+    }
+
+    socket_path = socket_path or default_socket()
+    # a socket made by another user could send back anything.
+    if not is_owned(socket_path):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with client.makefile("rb") as response:
+                result: DaemonResponse = json.loads(response.readline())
+    except (OSError, ValueError):
+        return None
+    return result
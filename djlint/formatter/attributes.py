@@ -5,11 +5,11 @@ from __future__ import annotations
 from functools import partial
 from typing import TYPE_CHECKING
 
-import regex as re
-
 from ..helpers import child_of_ignored_block
 
 if TYPE_CHECKING:
+    import regex as re
+
     from ..settings import Config
 
 
@@ -32,15 +32,14 @@ def format_template_tags(config: Config, attributes: str, spacing: int) -> str:
         |    ^----^ base indent
         |
         """
+        patterns = config.patterns
         indent = 0
         indented = ""
         indent_adder = spacing or 0
 
         for line_number, line in enumerate(attributes.splitlines()):
             # when checking for template tag, use "match" to force start of line check.
-            if re.match(
-                config.template_unindent, line.strip(), flags=re.I | re.X
-            ):
+            if patterns.template_unindent.match(line.strip()):
                 indent -= 1
                 tmp = (
                     (indent * config.indent)
@@ -48,9 +47,7 @@ def format_template_tags(config: Config, attributes: str, spacing: int) -> str:
                     + line.strip()
                 )
 
-            elif re.match(
-                config.tag_unindent_line, line.strip(), flags=re.I | re.X
-            ):
+            elif patterns.tag_unindent_line.match(line.strip()):
                 # if we are leaving an indented group, then remove the indent_adder
                 tmp = (
                     max(indent - 1, 0) * config.indent
@@ -58,11 +55,9 @@ def format_template_tags(config: Config, attributes: str, spacing: int) -> str:
                     + line.strip()
                 )
 
-            elif re.search(
-                config.template_indent, line.strip(), flags=re.I | re.X
-            ) and not re.search(
-                config.template_unindent, line.strip(), flags=re.I | re.X
-            ):
+            elif patterns.template_indent.search(
+                line.strip()
+            ) and not patterns.template_unindent.search(line.strip()):
                 # for open tags, search, but then check that they are not closed.
                 tmp = (
                     (indent * config.indent)
@@ -93,30 +88,15 @@ def format_template_tags(config: Config, attributes: str, spacing: int) -> str:
 
         return f"{match.group(1)}\n{match.group(2).strip()}"
 
-    break_char = config.break_before
+    patterns = config.patterns
 
     func = partial(add_break, "before")
 
-    attributes = re.sub(
-        break_char
-        + r".\K((?:{%|{{\#)[ ]*?(?:"
-        + config.break_template_tags
-        + ")[^}]+?[%|}]})",
-        func,
-        attributes,
-        flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
-    )
+    attributes = patterns.attribute_break_before.sub(func, attributes)
 
     func = partial(add_break, "after")
     # break after
-    attributes = re.sub(
-        r"((?:{%|{{\#)[ ]*?(?:"
-        + config.break_template_tags
-        + ")[^}]+?[%|}]})([^\n]+)$",
-        func,
-        attributes,
-        flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
-    )
+    attributes = patterns.attribute_break_after.sub(func, attributes)
     return add_indentation(config, attributes, spacing)
 
 
@@ -138,9 +118,7 @@ def format_attributes(config: Config, html: str, match: re.Match[str]) -> str:
     attributes = []
 
     # format attributes as groups
-    for attr_grp in re.finditer(
-        config.attribute_pattern, match.group(3).strip(), flags=re.VERBOSE
-    ):
+    for attr_grp in config.patterns.attribute.finditer(match.group(3).strip()):
         attrib_name = attr_grp.group(1)
         is_quoted = attr_grp.group(2) and attr_grp.group(2)[0] in {"'", '"'}
         quote = attr_grp.group(2)[0] if is_quoted else '"'
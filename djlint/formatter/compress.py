@@ -7,13 +7,14 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-import regex as re
 from HtmlTagNames import html_tag_names
 from HtmlVoidElements import html_void_elements
 
-from ..helpers import child_of_unformatted_block
+from ..regions import FormatRegions
 
 if TYPE_CHECKING:
+    import regex as re
+
     from ..settings import Config
 
 
@@ -38,7 +39,7 @@ def compress_html(html: str, config: Config) -> str:
         tags starting ignored blocks can have their attributes formatted,
         for example <textarea class="..." id="..."> can be formatted.
         """
-        if child_of_unformatted_block(config, html, match):
+        if regions.child_of_unformatted_block(match):
             return match.group()
 
         open_bracket = match.group(1)
@@ -65,9 +66,6 @@ def compress_html(html: str, config: Config) -> str:
 
         return f"{open_bracket}{tag}{attributes}{close_bracket}"
 
-    return re.sub(
-        config.html_tag_regex,
-        _clean_tag,
-        html,
-        flags=re.MULTILINE | re.VERBOSE | re.IGNORECASE,
-    )
+    regions = FormatRegions(config, html)
+
+    return config.patterns.html_tag.sub(_clean_tag, html)
@@ -11,7 +11,7 @@ from typing import TYPE_CHECKING
 
 import regex as re
 
-from ..helpers import inside_ignored_block, inside_template_block
+from ..regions import FormatRegions
 
 if TYPE_CHECKING:
     from ..settings import Config
@@ -19,6 +19,7 @@ if TYPE_CHECKING:
 
 def expand_html(html: str, config: Config) -> str:
     """Split single line html into many lines based on tags."""
+    patterns = config.patterns
 
     def add_html_line(out_format: str, match: re.Match[str]) -> str:
         """Add whitespace.
@@ -27,10 +28,10 @@ def expand_html(html: str, config: Config) -> str:
 
         Do not add whitespace if the tag is a in a template block
         """
-        if inside_ignored_block(config, html, match):
+        if regions.inside_ignored_block(match):
             return match.group(1)
 
-        if inside_template_block(config, html, match):
+        if regions.inside_template_block(match):
             return match.group(1)
 
         if out_format == "\n%s" and match.start() == 0:
@@ -38,35 +39,28 @@ def expand_html(html: str, config: Config) -> str:
 
         return out_format % match.group(1)
 
-    html_tags = config.break_html_tags
-
     add_left = partial(add_html_line, "\n%s")
     add_right = partial(add_html_line, "%s\n")
 
-    break_char = config.break_before
+    # the blocks are found again for each new version of the html.
+    regions = FormatRegions(config, html)
 
     # html tags - break before
-    html = re.sub(
-        rf"{break_char}\K(</?(?:{html_tags})\b(\"[^\"]*\"|'[^']*'|{{[^}}]*}}|[^'\">{{}}])*>)",
-        add_left,
-        html,
-        flags=re.IGNORECASE | re.VERBOSE,
-    )
+    html = patterns.html_break_before.sub(add_left, html)
+
+    regions = FormatRegions(config, html)
 
     # html tags - break after
-    html = re.sub(
-        rf"(</?(?:{html_tags})\b(\"[^\"]*\"|'[^']*'|{{[^}}]*}}|[^'\">{{}}])*>)(?!\s*?\n)(?=[^\n])",
-        add_right,
-        html,
-        flags=re.IGNORECASE | re.VERBOSE,
-    )
+    html = patterns.html_break_after.sub(add_right, html)
+
+    regions = FormatRegions(config, html)
 
     # template tag breaks
     def should_i_move_template_tag(
         out_format: str, match: re.Match[str]
     ) -> str:
         # ensure template tag is not inside an html tag and also not the first line of the file
-        if inside_ignored_block(config, html, match):
+        if regions.inside_ignored_block(match):
             return match.group(1)
 
         if not re.search(
@@ -88,22 +82,13 @@ def expand_html(html: str, config: Config) -> str:
 
     # template tags
     # break before
-    html = re.sub(
-        break_char
-        + r"\K((?:{%|{{\#)[ ]*?(?:"
-        + config.break_template_tags
-        + ")[^}]+?[%}]})",
-        partial(should_i_move_template_tag, "\n%s"),
-        html,
-        flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+    html = patterns.template_break_before.sub(
+        partial(should_i_move_template_tag, "\n%s"), html
     )
 
+    regions = FormatRegions(config, html)
+
     # break after
-    return re.sub(
-        r"((?:{%|{{\#)[ ]*?(?:"
-        + config.break_template_tags
-        + ")[^}]+?[%}]})(?=[^\n])",
-        partial(should_i_move_template_tag, "%s\n"),
-        html,
-        flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+    return patterns.template_break_after.sub(
+        partial(should_i_move_template_tag, "%s\n"), html
     )
@@ -5,22 +5,9 @@ from __future__ import annotations
 from functools import partial
 from typing import TYPE_CHECKING
 
-import json5 as json
 import regex as re
 
-from ..helpers import (
-    RE_FLAGS_IMV,
-    RE_FLAGS_IMVD,
-    RE_FLAGS_IVM,
-    RE_FLAGS_VI,
-    inside_ignored_block,
-    is_ignored_block_closing,
-    is_ignored_block_opening,
-    is_safe_closing_tag,
-    is_script_style_block_closing,
-    is_script_style_block_opening,
-)
-from .attributes import format_attributes
+from ..regions import FormatRegions
 
 if TYPE_CHECKING:
     from ..settings import Config
@@ -28,13 +15,17 @@ if TYPE_CHECKING:
 
 def indent_html(rawcode: str, config: Config) -> str:
     """Indent raw code."""
+    patterns = config.patterns
+
     if config.profile not in {"handlebars", "golang"}:
         # we can try to fix template tags. ignore handlebars
         # this should be done before indenting to line length
         # calc is preserved.
 
-        def fix_tag_spacing(html: str, match: re.Match[str]) -> str:
-            if inside_ignored_block(config, html, match):
+        def fix_tag_spacing(
+            regions: FormatRegions, match: re.Match[str]
+        ) -> str:
+            if regions.inside_ignored_block(match):
                 return match.group()
 
             return f"{match.group(1)} {match.group(2)} {match.group(3)}"
@@ -44,35 +35,36 @@ def indent_html(rawcode: str, config: Config) -> str:
         {{ tag }}
         {%- tag atrib -%}
         """
-        func = partial(fix_tag_spacing, rawcode)
+        func = partial(fix_tag_spacing, FormatRegions(config, rawcode))
 
-        rawcode = re.sub(
-            r"({%-?\+?)[ ]*?(\w(?:(?!%}).)*?)[ ]*?(\+?-?%})", func, rawcode
-        )
+        rawcode = patterns.template_tag_spacing.sub(func, rawcode)
 
-        rawcode = re.sub(
-            r"({{)[ ]*?(\w(?:(?!}}).)*?)[ ]*?(\+?-?}})", func, rawcode
-        )
+        rawcode = patterns.variable_tag_spacing.sub(func, rawcode)
 
     elif config.profile == "handlebars":
 
         def fix_handlebars_template_tags(
-            html: str, match: re.Match[str]
+            regions: FormatRegions, match: re.Match[str]
         ) -> str:
-            if inside_ignored_block(config, html, match):
+            if regions.inside_ignored_block(match):
                 return match.group()
 
             return f"{match.group(1)} {match.group(2)}"
 
-        func = partial(fix_handlebars_template_tags, rawcode)
+        func = partial(
+            fix_handlebars_template_tags, FormatRegions(config, rawcode)
+        )
         # handlebars templates
-        rawcode = re.sub(r"({{#(?:each|if).+?[^ ])(}})", func, rawcode)
+        rawcode = patterns.handlebars_tag_spacing.sub(func, rawcode)
 
-    rawcode_flat_list = re.split("\n", rawcode)
+    rawcode_flat_list = rawcode.split("\n")
 
     indent = config.indent
+    classify = config.line_classifier.classify
+    format_line_attributes = config.line_classifier.format_attributes
 
-    beautified_code = ""
+    # the indented lines are joined once at the end.
+    beautified_lines: list[str] = []
     indent_level = 0
     in_set_tag = False
     is_raw_first_line = False
@@ -80,76 +72,32 @@ def indent_html(rawcode: str, config: Config) -> str:
     is_block_raw = False
     jinja_replace_list = []
 
-    slt_html = config.indent_html_tags
-
-    # here using all tags cause we allow empty tags on one line
-    always_self_closing_html = config.always_self_closing_html_tags
-
-    # here using all tags cause we allow empty tags on one line
-    slt_template = config.optional_single_line_template_tags
-
     # nested ignored blocks..
     ignored_level = 0
 
     for item in rawcode_flat_list:
+        line = classify(item)
+
         # if a raw tag first line
-        is_ignored_block_opening_ = is_ignored_block_opening(config, item)
-        is_safe_closing_tag_ = is_safe_closing_tag(config, item)
-        if not is_block_raw and is_ignored_block_opening_:
+        if not is_block_raw and line.ignored_block_opening:
             is_raw_first_line = True
 
         # if a raw tag then start ignoring
-        if is_ignored_block_opening_:
+        if line.ignored_block_opening:
             is_block_raw = True
             ignored_level += 1
 
-        if is_script_style_block_opening(config, item):
+        if line.script_style_opening:
             in_script_style_tag = True
 
-        if is_safe_closing_tag_:
+        if line.safe_closing_tag:
             ignored_level -= 1
             ignored_level = max(ignored_level, 0)
             if is_block_raw and ignored_level == 0:
                 is_block_raw = False
 
-        if (
-            (not is_block_raw)
-            and re.search(
-                rf"^\s*?(?:{config.ignored_inline_blocks})",
-                item,
-                flags=RE_FLAGS_IVM,
-            )
-        ) or (
-            (not is_block_raw)
-            and
-            (
-                re.search(
-                    rf"""^(?:[^<\s].*?)? # start of a line, optionally with some text
-                    (?:
-                        (?:<({slt_html})>)(?:.*?)(?:</(?:\1)>) # <span>stuff</span> >>>> match 1
-                       |(?:<({slt_html})\b[^>]+?>)(?:.*?)(?:</(?:\2)>) # <span stuff>stuff</span> >>> match 2
-                       |(?:<(?:{always_self_closing_html})\b[^>]*?/?>) # <img stuff />
-                       |(?:<(?:{slt_html})\b[^>]*?/>) # <img />
-                       |(?:{{%[ ]*?({slt_template})[ ]+?.*?%}})(?:.*?)(?:{{%[ ]+?end(?:\3)[ ]+?.*?%}}) # >>> match 3
-                       |{config.ignored_inline_blocks}
-                    )[ \t]*?
-                    (?:
-                    .*? # anything
-                    (?: # followed by another slt
-                        (?:<({slt_html})>)(?:.*?)(?:</(?:\4)>) # <span>stuff</span> >>>> match 1
-                       |(?:<({slt_html})\b[^>]+?>)(?:.*?)(?:</(?:\5)>) # <span stuff>stuff</span> >>> match 2
-                       |(?:<(?:{always_self_closing_html})\b[^>]*?/?>) # <img stuff />
-                       |(?:<(?:{slt_html})\b[^>]*?/>) # <img />
-                       |(?:{{%[ ]*?({slt_template})[ ]+?.*?%}})(?:.*?)(?:{{%[ ]+?end(?:\6)[ ]+?.*?%}}) # >>> match 3
-                       |{config.ignored_inline_blocks}
-                    )[ \t]*?
-                    )*? # optional of course
-                    [^<]*?$ # with no other tags following until end of line
-                """,
-                    item,
-                    flags=RE_FLAGS_IVM,
-                )
-            )
+        if ((not is_block_raw) and line.ignored_inline) or (
+            (not is_block_raw) and line.single_line_tag
         ):
             tmp = (indent * indent_level) + item + "\n"
 
@@ -158,11 +106,7 @@ def indent_html(rawcode: str, config: Config) -> str:
             not config.no_set_formatting
             and not is_block_raw
             and in_set_tag
-            and re.search(
-                r"^(?!.*\{\%).*%\}.*$",
-                item,
-                flags=RE_FLAGS_IMV,
-            )
+            and line.set_closing
         ):
             indent_level = max(indent_level - 1, 0)
             in_set_tag = False
@@ -173,11 +117,7 @@ def indent_html(rawcode: str, config: Config) -> str:
             not config.no_set_formatting
             and not is_block_raw
             and in_set_tag
-            and re.search(
-                r"^[ ]*}|^[ ]*]",
-                item,
-                flags=RE_FLAGS_IMV,
-            )
+            and line.set_closing_bracket
         ):
             indent_level = max(indent_level - 1, 0)
             tmp = (indent * indent_level) + item + "\n"
@@ -185,34 +125,14 @@ def indent_html(rawcode: str, config: Config) -> str:
         # if unindent, move left
         elif (
             (not is_block_raw)
-            and not is_safe_closing_tag_
-            and re.search(
-                config.tag_unindent,
-                item,
-                flags=RE_FLAGS_IMV,
-            )
+            and not line.safe_closing_tag
+            and line.tag_unindent
             # and not ending in a slt like <span><strong></strong>.
-            and not re.search(
-                rf"(<({slt_html})>)(.*?)(</(\2)>[^<]*?$)",
-                item,
-                flags=RE_FLAGS_IVM,
-            )
-            and not re.search(
-                rf"(<({slt_html})\\b[^>]+?>)(.*?)(</(\2)>[^<]*?$)",
-                item,
-                flags=RE_FLAGS_IVM,
-            )
+            and not line.slt_ending
+            and not line.slt_attributes_ending
         ):
             # block to catch inline block followed by a non-break tag
-            if re.search(
-                rf"(^<({slt_html})>)(.*?)(</(\2)>)",
-                item,
-                flags=RE_FLAGS_IVM,
-            ) or re.search(
-                rf"(^<({slt_html})\b[^>]+?>)(.*?)(</(\2)>)",
-                item,
-                flags=RE_FLAGS_IVM,
-            ):
+            if line.slt_starting or line.slt_attributes_starting:
                 # unindent after instead of before
                 tmp = (indent * indent_level) + item + "\n"
                 indent_level = max(indent_level - 1, 0)
@@ -220,14 +140,7 @@ def indent_html(rawcode: str, config: Config) -> str:
                 indent_level = max(indent_level - 1, 0)
                 tmp = (indent * indent_level) + item + "\n"
 
-        elif (
-            not is_block_raw
-            and re.search(
-                r"^" + str(config.tag_unindent_line),
-                item,
-                flags=RE_FLAGS_IMV,
-            )
-        ):
+        elif not is_block_raw and line.tag_unindent_line:
             tmp = (indent * (indent_level - 1)) + item + "\n"
 
         # if indent, move right
@@ -237,11 +150,7 @@ def indent_html(rawcode: str, config: Config) -> str:
             not config.no_set_formatting
             and not is_block_raw
             and not in_set_tag
-            and re.search(
-                r"^([ ]*{%[ ]*?set)(?!.*%}).*$",
-                item,
-                flags=RE_FLAGS_IMV,
-            )
+            and line.set_opening
         ):
             tmp = (indent * indent_level) + item + "\n"
             indent_level += 1
@@ -252,25 +161,12 @@ def indent_html(rawcode: str, config: Config) -> str:
             not config.no_set_formatting
             and not is_block_raw
             and in_set_tag
-            and re.search(
-                r"(\{(?![^{}]*%[}\s])(?=[^{}]*$)|\[(?=[^\]]*$))",
-                item,
-                flags=RE_FLAGS_IMV,
-            )
-        ) or (
-            not is_block_raw
-            and re.search(
-                r"^(?:" + str(config.tag_indent) + r")",
-                item,
-                flags=RE_FLAGS_IMV,
-            )
-        ):
+            and line.set_opening_bracket
+        ) or (not is_block_raw and line.tag_indent):
             tmp = (indent * indent_level) + item + "\n"
             indent_level += 1
 
-        elif is_raw_first_line or (
-            is_safe_closing_tag_ and not is_block_raw
-        ):
+        elif is_raw_first_line or (line.safe_closing_tag and not is_block_raw):
             tmp = (indent * indent_level) + item + "\n"
 
         elif is_block_raw or not item.strip():
@@ -286,30 +182,21 @@ def indent_html(rawcode: str, config: Config) -> str:
 
         # if a opening raw tag then start ignoring.. only if there is no closing tag
         # on the same line
-        if is_ignored_block_opening_:
+        if line.ignored_block_opening:
             is_block_raw = True
             is_raw_first_line = False
 
         # if a normal tag, we can try to expand attributes
         elif not is_block_raw:
             # get leading space, and attributes
-
-            func = partial(format_attributes, config, item)
-
-            tmp = re.sub(
-                rf"(\s*?)(<(?:{config.indent_html_tags}))\s((?:\"[^\"]*\"|'[^']*'|{{[^}}]*}}|[^'\">{{}}\/])+?)(\s?/?>)",
-                func,
-                tmp,
-                flags=RE_FLAGS_VI,
-            )
+            tmp = format_line_attributes(item, tmp)
 
         # turn off raw block if we hit end - for one line raw blocks, but not an inline raw
-        if is_ignored_block_closing(config, item) and (
-            not in_script_style_tag
-            or is_script_style_block_closing(config, item)
+        if line.ignored_block_closing and (
+            not in_script_style_tag or line.script_style_closing
         ):
             in_script_style_tag = False
-            if not is_safe_closing_tag_:
+            if not line.safe_closing_tag:
                 ignored_level -= 1
                 ignored_level = max(ignored_level, 0)
             if ignored_level == 0:
@@ -317,9 +204,7 @@ def indent_html(rawcode: str, config: Config) -> str:
 
         # detect the outer quotes for jinja
         if config.profile == "jinja":
-            matches = re.findall(
-                r"=([\"'])(\{\{[\s\S]*?\}\})\1", tmp, flags=re.MULTILINE
-            )
+            matches = patterns.jinja_attribute_quotes.findall(tmp)
 
             for match in matches:
                 outer_quotes = match[0]
@@ -329,12 +214,16 @@ def indent_html(rawcode: str, config: Config) -> str:
                     "content": inner_content,
                 })
 
-        beautified_code += tmp
+        beautified_lines.append(tmp)
+
+    beautified_code = "".join(beautified_lines)
 
     # try to fix internal formatting of set tag
     def format_data(
         config: Config, contents: str, tag_size: int, leading_space: str
     ) -> str:
+        import json5 as json
+
         try:
             # try to format the contents as json
             data = json.loads(contents)
@@ -372,8 +261,10 @@ def indent_html(rawcode: str, config: Config) -> str:
 
         return (f"\n{leading_space}").join(contents.splitlines())
 
-    def format_set(config: Config, html: str, match: re.Match[str]) -> str:
-        if inside_ignored_block(config, html, match):
+    def format_set(
+        config: Config, regions: FormatRegions, match: re.Match[str]
+    ) -> str:
+        if regions.inside_ignored_block(match):
             return match.group()
 
         leading_space = match.group(1)
@@ -397,8 +288,10 @@ def indent_html(rawcode: str, config: Config) -> str:
 
         return f"{leading_space}{open_bracket} {tag} {contents} {close_bracket}"
 
-    def format_function(config: Config, html: str, match: re.Match[str]) -> str:
-        if inside_ignored_block(config, html, match):
+    def format_function(
+        config: Config, regions: FormatRegions, match: re.Match[str]
+    ) -> str:
+        if regions.inside_ignored_block(match):
             return match.group()
 
         leading_space = match.group(1)
@@ -452,24 +345,18 @@ def indent_html(rawcode: str, config: Config) -> str:
         return cleaned_match
 
     if not config.no_set_formatting:
-        func = partial(format_set, config, beautified_code)
-        # format set contents
-        beautified_code = re.sub(
-            r"([ ]*)({%-?)[ ]*(set)[ ]+?((?:(?!%}).)*?)(-?%})",
-            func,
-            beautified_code,
-            flags=RE_FLAGS_IMVD,
+        func = partial(
+            format_set, config, FormatRegions(config, beautified_code)
         )
+        # format set contents
+        beautified_code = patterns.set_contents.sub(func, beautified_code)
 
     if not config.no_function_formatting:
-        func = partial(format_function, config, beautified_code)
-        # format function contents
-        beautified_code = re.sub(
-            r"([ ]*)({{-?\+?)[ ]*?((?:(?!}}).)*?\w)(\((?:\"[^\"]*\"|'[^']*'|[^\)])*?\)[ ]*)((?:\[[^\]]*?\]|\.[^\s]+)[ ]*)?((?:(?!}}).)*?-?\+?}})",
-            func,
-            beautified_code,
-            flags=RE_FLAGS_IMVD,
+        func = partial(
+            format_function, config, FormatRegions(config, beautified_code)
         )
+        # format function contents
+        beautified_code = patterns.function_contents.sub(func, beautified_code)
 
     if not config.preserve_blank_lines:
         beautified_code = beautified_code.lstrip()
@@ -6,12 +6,13 @@ from functools import partial
 from typing import TYPE_CHECKING
 
 import jsbeautifier
-import regex as re
 from jsbeautifier.javascript.options import BeautifierOptions
 
-from ..helpers import child_of_unformatted_block
+from ..regions import FormatRegions
 
 if TYPE_CHECKING:
+    import regex as re
+
     from ..settings import Config
 
 
@@ -19,10 +20,10 @@ def format_js(html: str, config: Config) -> str:
     """Format javascript inside <script> tags."""
 
     def launch_formatter(
-        config: Config, html: str, match: re.Match[str]
+        config: Config, regions: FormatRegions, match: re.Match[str]
     ) -> str:
         """Add break after if not in ignored block."""
-        if child_of_unformatted_block(config, html, match):
+        if regions.child_of_unformatted_block(match):
             return match.group()
 
         if not match.group(3).strip():
@@ -58,11 +59,6 @@ def format_js(html: str, config: Config) -> str:
 
         return match.group(1) + match.group(2) + beautified + "\n" + indent
 
-    func = partial(launch_formatter, config, html)
+    func = partial(launch_formatter, config, FormatRegions(config, html))
 
-    return re.sub(
-        r"([ ]*?)(<(?:script)\b(?:\"[^\"]*\"|'[^']*'|{[^}]*}|[^'\">{}])*>)(.*?)(?=</script>)",
-        func,
-        html,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    return config.patterns.script.sub(func, html)
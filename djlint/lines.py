@@ -0,0 +1,236 @@
+"""Facts about a line of the document, used to indent it.
+
+A line is scanned once for the literals the line patterns need, then only
+the patterns whose literals were found are searched. Most lines hold only
+a few of the literals, so most patterns are never run on them.
+
+Templates repeat lines like ``</div>`` and ``{% endif %}`` over and over,
+so the results for recent lines are kept, for every file a worker formats.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, NamedTuple
+
+from .formatter.attributes import format_attributes
+from .helpers import (
+    is_ignored_block_closing,
+    is_ignored_block_opening,
+    is_safe_closing_tag,
+    is_script_style_block_closing,
+    is_script_style_block_opening,
+)
+from .literals import SHARED_FLAGS, required_literals
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import regex
+
+    from .literals import Literals
+    from .settings import Config
+
+# lines kept by each of the line caches, and the longest line kept. Long
+# lines, like minified ones, are rarely repeated, and would make the caches
+# of a worker or the daemon hold megabytes.
+LINE_CACHE_SIZE = 4096
+LINE_CACHE_MAX_LENGTH = 500
+
+
+def _literal_keys(
+    literals: Literals | None,
+) -> frozenset[tuple[str, bool]] | None:
+    if literals is None:
+        return None
+    return frozenset((x, literals.ignore_case) for x in literals.strings)
+
+
+class LineFacts(NamedTuple):
+    """What a line opens, closes and holds."""
+
+    ignored_block_opening: bool
+    safe_closing_tag: bool
+    script_style_opening: bool
+    ignored_block_closing: bool
+    script_style_closing: bool
+    ignored_inline: bool
+    single_line_tag: bool
+    set_opening: bool
+    set_closing: bool
+    set_opening_bracket: bool
+    set_closing_bracket: bool
+    tag_indent: bool
+    tag_unindent: bool
+    tag_unindent_line: bool
+    slt_starting: bool
+    slt_attributes_starting: bool
+    slt_ending: bool
+    slt_attributes_ending: bool
+
+
+class _Check(NamedTuple):
+    test: Callable[[str], object]
+    # the literals with their case sensitivity, one of which is needed.
+    literals: frozenset[tuple[str, bool]] | None
+
+
+class LineClassifier:
+    """Classifier of lines, compiled once for the settings."""
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        patterns = config.patterns
+
+        # the facts of a line and its formatted attributes only depend on
+        # the line, so they are cached.
+        self.cached_classify = lru_cache(maxsize=LINE_CACHE_SIZE)(
+            self._classify
+        )
+        self.cached_format_attributes = lru_cache(maxsize=LINE_CACHE_SIZE)(
+            self._format_attributes
+        )
+
+        # the test of each fact, in order, and the pattern it needs to match.
+        tests: tuple[
+            tuple[Callable[[str], object], regex.Pattern[str]], ...
+        ] = (
+            (
+                partial(is_ignored_block_opening, config),
+                patterns.ignored_block_opening,
+            ),
+            (partial(is_safe_closing_tag, config), patterns.safe_closing_tag),
+            (
+                partial(is_script_style_block_opening, config),
+                patterns.script_style_opening,
+            ),
+            (
+                partial(is_ignored_block_closing, config),
+                patterns.ignored_block_closing,
+            ),
+            (
+                partial(is_script_style_block_closing, config),
+                patterns.script_style_closing,
+            ),
+            *(
+                (pattern.search, pattern)
+                for pattern in (
+                    patterns.ignored_inline_line,
+                    patterns.single_line_tags,
+                    patterns.set_opening,
+                    patterns.set_closing,
+                    patterns.set_opening_bracket,
+                    patterns.set_closing_bracket,
+                    patterns.tag_indent_start,
+                    patterns.tag_unindent,
+                    patterns.tag_unindent_line_start,
+                    patterns.slt_starting,
+                    patterns.slt_attributes_starting,
+                    patterns.slt_ending,
+                    patterns.slt_attributes_ending,
+                )
+            ),
+        )
+        self.checks = tuple(
+            _Check(
+                test,
+                _literal_keys(
+                    required_literals(
+                        pattern.pattern, pattern.flags & SHARED_FLAGS
+                    )
+                ),
+            )
+            for test, pattern in tests
+        )
+
+        self.scans = tuple(
+            self._build_scan(
+                {
+                    string
+                    for check in self.checks
+                    if check.literals is not None
+                    for string, check_ignore_case in check.literals
+                    if check_ignore_case == ignore_case
+                },
+                ignore_case=ignore_case,
+            )
+            for ignore_case in (False, True)
+        )
+
+    @staticmethod
+    def _build_scan(
+        strings: set[str], *, ignore_case: bool
+    ) -> tuple[re.Pattern[str], dict[str, frozenset[tuple[str, bool]]]] | None:
+        """Build one pattern finding every literal.
+
+        The longest literal at each position is found, so every literal
+        found there is a prefix of it.
+        """
+        if not strings:
+            return None
+        pattern = re.compile(
+            "(?=("
+            + "|".join(
+                re.escape(x) for x in sorted(strings, key=len, reverse=True)
+            )
+            + "))"
+        )
+        prefixes = {
+            string: frozenset(
+                (x, ignore_case) for x in strings if string.startswith(x)
+            )
+            for string in strings
+        }
+        return pattern, prefixes
+
+    def literals(self, item: str) -> set[tuple[str, bool]]:
+        """Find the literals of the line patterns that are in a line."""
+        found: set[tuple[str, bool]] = set()
+        for ignore_case, scan in zip((False, True), self.scans):
+            if scan is None:
+                continue
+            pattern, prefixes = scan
+            # casefold also folds characters like the kelvin sign, that
+            # match an ascii letter when ignoring case.
+            text = item.casefold() if ignore_case else item
+            for match in pattern.findall(text):
+                found.update(prefixes[match])
+        return found
+
+    def classify(self, item: str) -> LineFacts:
+        """Get the facts of a line, from the cache if it is short."""
+        if len(item) > LINE_CACHE_MAX_LENGTH:
+            return self._classify(item)
+        return self.cached_classify(item)
+
+    def format_attributes(self, item: str, code: str) -> str:
+        """Spread the long attributes of a line, from the cache if it is short."""
+        if max(len(item), len(code)) > LINE_CACHE_MAX_LENGTH:
+            return self._format_attributes(item, code)
+        return self.cached_format_attributes(item, code)
+
+    def _classify(self, item: str) -> LineFacts:
+        """Get the facts of a line."""
+        found = self.literals(item)
+        return LineFacts(
+            *(
+                (check.literals is None or not found.isdisjoint(check.literals))
+                and bool(check.test(item))
+                for check in self.checks
+            )
+        )
+
+    def _format_attributes(self, item: str, code: str) -> str:
+        """Spread the long attributes of an indented line."""
+        return self.config.patterns.tag_attributes.sub(
+            partial(format_attributes, self.config, item), code
+        )
+
+    def cache_info(self) -> tuple[int, int]:
+        """Count the hits and misses of the line caches."""
+        infos = (
+            self.cached_classify.cache_info(),
+            self.cached_format_attributes.cache_info(),
+        )
+        return sum(x.hits for x in infos), sum(x.misses for x in infos)
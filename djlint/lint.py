@@ -3,22 +3,25 @@
 from __future__ import annotations
 
 import importlib
+import time
+from array import array
+from bisect import bisect_right
 from collections.abc import Sequence
-from typing import TYPE_CHECKING
+from functools import partial
+from itertools import accumulate, chain
+from operator import attrgetter
+from typing import TYPE_CHECKING, NamedTuple, overload
 
 import regex as re
 
-from .helpers import (
-    inside_ignored_linter_block,
-    inside_ignored_rule,
-    overlaps_ignored_block,
-)
+from .literals import DocumentLiterals, Literals, required_literals
+from .regions import LintRegions
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Mapping
     from pathlib import Path
 
-    from typing_extensions import TypedDict
+    from typing_extensions import Any, TypedDict
 
     from .settings import Config
 
@@ -28,6 +31,11 @@ if TYPE_CHECKING:
         match: str
         message: str
 
+    class RuleProfile(TypedDict):
+        time: float
+        matches: int
+        ignored: int
+
 
 flags = {
     "re.A": re.A,
@@ -56,92 +64,498 @@ def build_flags(flag_list: str | int) -> int:
     return combined_flags
 
 
+# code of the error reported when a rule or a file runs out of time.
+TIMEOUT_CODE = "E001"
+# code of the error reported when a python_module rule cannot be loaded.
+RULE_ERROR_CODE = "E002"
+
+
+class ErrorRecord(NamedTuple):
+    """A lint error, compact and hashable while the file is linted."""
+
+    line: int
+    column: int
+    offset: int
+    code: str
+    match: str
+    message: str
+
+    @classmethod
+    def from_dict(
+        cls, error: LintError | Mapping[str, str], lines: LineIndex
+    ) -> ErrorRecord:
+        """Read an error returned by a python_module rule, or by as_dict."""
+        line, column = (int(x) for x in error["line"].split(":"))
+        return cls(
+            line,
+            column,
+            lines.offset(line, column),
+            error["code"],
+            error["match"],
+            error["message"],
+        )
+
+    def as_dict(self) -> LintError:
+        """Get the error as it is cached and printed."""
+        return {
+            "code": self.code,
+            "line": f"{self.line}:{self.column}",
+            "match": self.match,
+            "message": self.message,
+        }
+
+
+class Rule(NamedTuple):
+    """A linter rule, ready to run on a file."""
+
+    name: str
+    message: str
+    # compiled patterns of a pattern rule.
+    patterns: tuple[re.Pattern[str], ...]
+    # run() of a python_module rule.
+    run: Callable[..., Any] | None
+    # the rule as configured, passed to python_module rules.
+    rule: Mapping[str, Any]
+    # literals of the requires key, one of which must be in the file.
+    requires: Literals | None
+
+
+class Scan(NamedTuple):
+    """A pattern scanned once per file for every rule that uses it."""
+
+    pattern: re.Pattern[str]
+    # indexes of the rules in RulePlan.rules.
+    rules: tuple[int, ...]
+    # literals the pattern needs to match, if they could be found.
+    literals: Literals | None
+
+
+class RulePlan(NamedTuple):
+    """Linter rules and per file ignores of a config, compiled once."""
+
+    rules: tuple[Rule, ...]
+    scans: tuple[Scan, ...]
+    per_file_ignores: tuple[tuple[re.Pattern[str], frozenset[str]], ...]
+
+
+def build_requires(rule: Mapping[str, Any]) -> Literals | None:
+    """Read the requires key of a rule.
+
+    It is a literal or a list of literals, one of which must be in a file
+    for the rule to run.
+    """
+    requires = rule.get("requires")
+    if not requires:
+        return None
+    if isinstance(requires, str):
+        requires = [requires]
+    ignore_case = bool(
+        build_flags(rule.get("flags", "re.DOTALL")) & re.IGNORECASE
+    )
+    return Literals(
+        frozenset(x.casefold() if ignore_case else x for x in requires),
+        ignore_case,
+    )
+
+
+def build_rule_plan(config: Config) -> RulePlan:
+    """Compile the enabled linter rules of a config.
+
+    Rules are already filtered by profile, include and ignore settings
+    when the config is loaded.
+    """
+    rules = []
+    for item in config.linter_rules:
+        rule = item["rule"]
+        requires = build_requires(rule)
+        if "python_module" in rule:
+            try:
+                run_rule = importlib.import_module(rule["python_module"]).run
+            except Exception as error:
+                # a broken custom rule is reported on each file, instead of
+                # stopping the other rules.
+                run_rule = partial(
+                    rule_load_error,
+                    rule["name"],
+                    f"{rule['python_module']}: {type(error).__name__}: {error}",
+                )
+            rules.append(
+                Rule(
+                    rule["name"], rule["message"], (), run_rule, rule, requires
+                )
+            )
+        else:
+            rule_flags = build_flags(rule.get("flags", "re.DOTALL"))
+            rules.append(
+                Rule(
+                    rule["name"],
+                    rule["message"],
+                    tuple(
+                        re.compile(pattern, flags=rule_flags)
+                        for pattern in rule["patterns"]
+                    ),
+                    None,
+                    rule,
+                    requires,
+                )
+            )
+
+    # rules sharing a pattern, like the django and jinja variants of a rule,
+    # scan the file once.
+    scans: dict[tuple[str, int], list[int]] = {}
+    literals: dict[tuple[str, int], Literals | None] = {}
+    for index, rule in enumerate(rules):
+        for pattern in rule.patterns:
+            key = (pattern.pattern, pattern.flags)
+            scans.setdefault(key, []).append(index)
+            if key not in literals:
+                literals[key] = required_literals(
+                    pattern.pattern,
+                    build_flags(rule.rule.get("flags", "re.DOTALL")),
+                )
+
+    per_file_ignores = tuple(
+        (
+            re.compile(pattern, flags=re.VERBOSE),
+            frozenset(x.strip() for x in codes.split(",")),
+        )
+        for pattern, codes in config.per_file_ignores.items()
+    )
+
+    return RulePlan(
+        tuple(rules),
+        tuple(
+            Scan(
+                re.compile(pattern, flags=pattern_flags),
+                tuple(scan_rules),
+                literals[pattern, pattern_flags],
+            )
+            for (pattern, pattern_flags), scan_rules in scans.items()
+        ),
+        per_file_ignores,
+    )
+
+
+class LineIndex(Sequence["dict[str, int]"]):
+    """Start offsets of the lines of a document.
+
+    Positions are found with a bisect. It is also a sequence of the
+    ``start`` and ``end`` of each line, like the line_ends list that
+    python_module rules used to receive.
+    """
+
+    def __init__(self, html: str) -> None:
+        lines = html.split("\n")
+        if not lines[-1]:
+            # a trailing newline does not start a line.
+            lines.pop()
+        self.starts = array("I", [0])
+        self.starts.extend(accumulate(len(x) + 1 for x in lines))
+        self.size = len(html)
+
+    def position(self, start: int) -> tuple[int, int]:
+        """Get the line number and column of a position."""
+        index = max(
+            bisect_right(self.starts, start, hi=max(len(self), 1)) - 1, 0
+        )
+        return index + 1, start - self.starts[index]
+
+    def offset(self, line: int, column: int) -> int:
+        """Get the position of a line number and column."""
+        if 0 < line <= len(self):
+            return self.starts[line - 1] + column
+        return column
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, int]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, int]]: ...
+
+    def __getitem__(  # type: ignore[explicit-override]
+        self, index: int | slice
+    ) -> dict[str, int] | list[dict[str, int]]:
+        if isinstance(index, slice):
+            return [self[x] for x in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return {
+            "start": self.starts[index],
+            "end": min(self.starts[index + 1], self.size),
+        }
+
+    def __len__(self) -> int:  # type: ignore[explicit-override]
+        return len(self.starts) - 1
+
+
 def get_line(start: int, line_ends: Sequence[Mapping[str, int]]) -> str:
     """Get the line number and index of match."""
+    if isinstance(line_ends, LineIndex):
+        return "{}:{}".format(*line_ends.position(start))
+
     line = next(pair for pair in line_ends if pair["end"] > start)
 
     return "{}:{}".format(line_ends.index(line) + 1, start - line["start"])
 
 
 def linter(
-    config: Config, html: str, filename: str, filepath: str
+    config: Config,
+    html: str,
+    filename: str,
+    filepath: str,
+    *,
+    profile: dict[str, RuleProfile] | None = None,
 ) -> dict[str, list[LintError]]:
-    """Lint a html string."""
-    errors: dict[str, list[LintError]] = {filename: []}
+    """Lint a html string.
+
+    The time, matches and ignored matches of each rule are added to
+    profile, if given.
+    """
+    # time budgets, a rule also stops at the deadline of the file.
+    rule_timeout = config.rule_timeout or None
+    deadline = (
+        time.monotonic() + config.file_timeout if config.file_timeout else None
+    )
+
     # build list of line ends for file
-    line_ends = [
-        {"start": m.start(), "end": m.end()}
-        for m in re.finditer(r"(?:.*\n)|(?:[^\n]+$)", html)
-    ]
+    line_ends = LineIndex(html)
 
+    plan = config.rule_plan
     ignored_rules: set[str] = set()
 
     # remove ignored rules for file
-    for pattern, rules in config.per_file_ignores.items():
-        if re.search(pattern, filepath, flags=re.VERBOSE):
-            ignored_rules.update(x.strip() for x in rules.split(","))
+    for pattern, codes in plan.per_file_ignores:
+        if pattern.search(filepath):
+            ignored_rules.update(codes)
 
-    for rule in config.linter_rules:
-        rule = rule["rule"]  # noqa: PLW2901
+    # ignored regions, found once for all rules.
+    regions = LintRegions(config, html)
+    # literals in the file, rules that need a missing literal are skipped.
+    document = DocumentLiterals(html)
 
-        # skip ignored rules
-        if rule["name"] in ignored_rules:
+    # errors of each rule, reported in the order of the rules.
+    rule_errors: list[list[ErrorRecord]] = [[] for _ in plan.rules]
+    # matches of each rule inside a djlint:off comment for it.
+    rule_ignored = [0] * len(plan.rules)
+
+    # rules based on python modules
+    for index, rule in enumerate(plan.rules):
+        if rule.run is None or rule.name in ignored_rules:
             continue
 
-        # rule based on python module
-        if "python_module" in rule:
-            rule_module = importlib.import_module(rule["python_module"])
-            module_errors = rule_module.run(
-                rule=rule,
-                config=config,
-                html=html,
-                filepath=filepath,
-                line_ends=line_ends,
+        if document.misses(rule.requires):
+            if profile is not None:
+                add_profile(profile, rule.name, 0, 0, 0)
+            continue
+
+        # a python_module rule cannot be stopped, it only uses up the time
+        # of the file.
+        if deadline is not None and time.monotonic() > deadline:
+            rule_errors[index].append(file_timeout_error(config, rule.name))
+            return finish(filename, rule_errors)
+
+        start_time = time.perf_counter()
+        module_errors = rule.run(
+            rule=rule.rule,
+            config=config,
+            html=html,
+            filepath=filepath,
+            line_ends=line_ends,
+            regions=regions,
+        )
+        if not isinstance(module_errors, Sequence):
+            msg = (
+                f"Error: {rule.name} python_module run() should return"
+                " a sequence of dict with keys: code, line, match, message."
+            )
+            raise AssertionError(msg)  # noqa: TRY004
+        if profile is not None:
+            # python_module rules filter their own ignored matches.
+            add_profile(
+                profile,
+                rule.name,
+                time.perf_counter() - start_time,
+                len(module_errors),
+                0,
             )
-            if not isinstance(module_errors, Sequence):
-                msg = (
-                    f"Error: {rule['name']} python_module run() should return"
-                    " a sequence of dict with keys: code, line, match, message."
+        rule_errors[index].extend(
+            ErrorRecord.from_dict(x, line_ends) for x in module_errors
+        )
+
+    # rules based on patterns
+    for scan in plan.scans:
+        # skip ignored rules
+        indexes = [
+            x for x in scan.rules if plan.rules[x].name not in ignored_rules
+        ]
+        if not indexes:
+            continue
+
+        # skip rules that cannot match
+        skipped = [
+            x
+            for x in indexes
+            if document.misses(scan.literals)
+            or document.misses(plan.rules[x].requires)
+        ]
+        if skipped:
+            if profile is not None:
+                for index in skipped:
+                    add_profile(profile, plan.rules[index].name, 0, 0, 0)
+            indexes = [x for x in indexes if x not in skipped]
+            if not indexes:
+                continue
+
+        timeout = rule_timeout
+        if deadline is not None:
+            time_left = deadline - time.monotonic()
+            if time_left <= 0:
+                rule_errors[indexes[0]].append(
+                    file_timeout_error(config, plan.rules[indexes[0]].name)
                 )
-                raise AssertionError(msg)
-            errors[filename].extend(module_errors)
+                return finish(filename, rule_errors)
+            timeout = min(timeout or time_left, time_left)
 
-        # rule based on patterns
-        else:
-            for pattern in rule["patterns"]:
-                for match in re.finditer(
-                    pattern,
-                    html,
-                    flags=build_flags(rule.get("flags", "re.DOTALL")),
-                ):
-                    if (
-                        not overlaps_ignored_block(config, html, match)
-                        and not inside_ignored_rule(
-                            config, html, match, rule["name"]
+        start_time = time.perf_counter()
+        # matches of the pattern, and matches ignored in the whole file.
+        matches = ignored = 0
+        try:
+            for match in scan.pattern.finditer(html, timeout=timeout):
+                matches += 1
+                if regions.overlaps_ignored_block(
+                    match
+                ) or regions.inside_ignored_linter_block(match):
+                    ignored += 1
+                    continue
+
+                start = match.start()
+                line, column = line_ends.position(start)
+                for index in indexes:
+                    rule = plan.rules[index]
+                    if regions.inside_ignored_rule(match, rule.name):
+                        rule_ignored[index] += 1
+                    else:
+                        rule_errors[index].append(
+                            ErrorRecord(
+                                line,
+                                column,
+                                start,
+                                rule.name,
+                                match.group().strip()[:20],
+                                rule.message,
+                            )
                         )
-                        and not inside_ignored_linter_block(config, html, match)
-                    ):
-                        errors[filename].append({
-                            "code": rule["name"],
-                            "line": get_line(match.start(), line_ends),
-                            "match": match.group().strip()[:20],
-                            "message": rule["message"],
-                        })
-
-    # remove duplicate matches
-    for filename, error_dict in errors.items():  # noqa: PLR1704
-        unique_errors = []
-        for dict_ in error_dict:
-            if dict_ not in unique_errors:
-                unique_errors.append(dict_)
-        errors[filename] = unique_errors
-    return errors
-
-
-def lint_file(config: Config, this_file: Path) -> dict[str, list[LintError]]:
+        except TimeoutError:
+            # the errors found so far are kept.
+            if deadline is not None and time.monotonic() >= deadline:
+                rule_errors[indexes[0]].append(
+                    file_timeout_error(config, plan.rules[indexes[0]].name)
+                )
+                return finish(filename, rule_errors)
+            for index in indexes:
+                rule_errors[index].append(
+                    rule_timeout_error(config, plan.rules[index].name)
+                )
+        finally:
+            if profile is not None:
+                # the time of a shared scan is split between its rules.
+                scan_time = (time.perf_counter() - start_time) / len(indexes)
+                for index in indexes:
+                    add_profile(
+                        profile,
+                        plan.rules[index].name,
+                        scan_time,
+                        matches,
+                        ignored + rule_ignored[index],
+                    )
+
+    return finish(filename, rule_errors)
+
+
+def add_profile(
+    profile: dict[str, RuleProfile],
+    code: str,
+    seconds: float,
+    matches: int,
+    ignored: int,
+) -> None:
+    """Add the time and matches of a rule to a profile."""
+    rule = profile.setdefault(code, {"time": 0, "matches": 0, "ignored": 0})
+    rule["time"] += seconds
+    rule["matches"] += matches
+    rule["ignored"] += ignored
+
+
+def merge_profiles(
+    total: dict[str, RuleProfile], profile: Mapping[str, RuleProfile]
+) -> None:
+    """Add the rules of a file profile to the profile of a run."""
+    for code, rule in profile.items():
+        add_profile(total, code, rule["time"], rule["matches"], rule["ignored"])
+
+
+def rule_timeout_error(config: Config, rule: str) -> ErrorRecord:
+    """Report a rule that was stopped after the rule timeout."""
+    return ErrorRecord(
+        1,
+        0,
+        0,
+        TIMEOUT_CODE,
+        rule,
+        f"Rule {rule} took longer than {config.rule_timeout:g}s and was"
+        " stopped.",
+    )
+
+
+def rule_load_error(name: str, reason: str, **_: Any) -> list[LintError]:
+    """Report a python_module rule that could not be loaded."""
+    return [
+        {
+            "code": RULE_ERROR_CODE,
+            "line": "1:0",
+            "match": name,
+            "message": f"Rule {name} could not be loaded. {reason}",
+        }
+    ]
+
+
+def file_timeout_error(config: Config, rule: str) -> ErrorRecord:
+    """Report a file that was not fully linted before the file timeout."""
+    return ErrorRecord(
+        1,
+        0,
+        0,
+        TIMEOUT_CODE,
+        rule,
+        f"Linting took longer than {config.file_timeout:g}s and was stopped"
+        f" at rule {rule}.",
+    )
+
+
+def finish(
+    filename: str, rule_errors: list[list[ErrorRecord]]
+) -> dict[str, list[LintError]]:
+    """Get the errors of a file, in the order they are reported."""
+    # remove duplicate matches, and sort by position. The sort is stable,
+    # errors at the same position stay in the order of the rules.
+    records = sorted(
+        dict.fromkeys(chain.from_iterable(rule_errors)),
+        key=attrgetter("line", "column"),
+    )
+    return {filename: [x.as_dict() for x in records]}
+
+
+def lint_file(
+    config: Config,
+    this_file: Path,
+    *,
+    profile: dict[str, RuleProfile] | None = None,
+) -> dict[str, list[LintError]]:
     """Check file for formatting errors."""
     filename = str(this_file)
 
     html = this_file.read_text(encoding="utf-8")
 
-    return linter(config, html, filename, this_file.as_posix())
+    return linter(config, html, filename, this_file.as_posix(), profile=profile)
@@ -0,0 +1,169 @@
+"""Literals a linter rule needs to find a match.
+
+Most rules can only match when a literal, like ``<img`` or ``}%``, is in
+the document. The literals are read from the parsed pattern, or from the
+``requires`` key of the rule, and a rule is skipped when none of its
+literals are in the document.
+"""
+
+from __future__ import annotations
+
+import re
+import warnings
+from typing import TYPE_CHECKING, NamedTuple
+
+try:
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # pragma: no cover
+    import sre_parse  # python < 3.11
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from typing_extensions import Any
+
+ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+REPEATS = frozenset(
+    getattr(sre_parse, x)
+    for x in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, x)
+)
+
+# syntax the regex module reads differently from sre_parse: posix classes,
+# unicode properties and other escapes, version flags and fuzzy matching.
+REGEX_SYNTAX = re.compile(
+    r"""
+    \[\[:
+    | \\[pPXGKLmM]
+    | \(\?[a-zA-Z]*V[01]
+    | \{[\d\s<=+,]*[deis](?![a-z])
+    """,
+    re.VERBOSE,
+)
+
+# flags with the same value and meaning in both modules.
+SHARED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+
+
+class Literals(NamedTuple):
+    """A pattern can only match if one of the literals is found."""
+
+    strings: frozenset[str]
+    ignore_case: bool
+
+
+def required_literals(pattern: str, flags: int) -> Literals | None:
+    """Find the literals a pattern needs to match.
+
+    Patterns using syntax only the regex module knows are not read, and
+    have no literals. Their rules only skip files with ``requires``.
+    """
+    if flags & ~SHARED_FLAGS or REGEX_SYNTAX.search(pattern):
+        return None
+
+    try:
+        # sre_parse warns about syntax that the regex module reads as
+        # nested sets or set operations.
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            parsed = sre_parse.parse(pattern, flags)
+
+        ignore_case = bool(parsed.state.flags & sre_parse.SRE_FLAG_IGNORECASE)
+        strings = _sequence(parsed, ignore_case=ignore_case)
+    except Exception:
+        # sre_parse is private. A pattern it cannot read, or a change to
+        # its internals, only leaves the rule without literals.
+        return None
+
+    if not strings:
+        return None
+    return Literals(strings, ignore_case)
+
+
+def _sequence(
+    items: Iterable[tuple[int, Any]], *, ignore_case: bool
+) -> frozenset[str] | None:
+    """Get the best set of literals one of which a sequence needs.
+
+    Consecutive literal characters make up a string. Groups, branches and
+    repeats of at least one are read too, but not joined to the literal
+    characters around them. The set whose shortest string is the longest
+    is kept.
+    """
+    best: frozenset[str] | None = None
+    run: list[str] = []
+
+    def keep(strings: frozenset[str] | None) -> None:
+        nonlocal best
+        if strings and (
+            best is None or min(map(len, strings)) > min(map(len, best))
+        ):
+            best = strings
+
+    for op, av in items:
+        # when ignoring case, only ascii letters are compared lowercased.
+        if op == sre_parse.LITERAL and (not ignore_case or chr(av).isascii()):
+            run.append(chr(av).lower() if ignore_case else chr(av))
+            continue
+
+        keep(frozenset({"".join(run)}) if run else None)
+        run = []
+
+        if op == sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, group = av
+            # a group that turns case sensitivity on or off is not read.
+            if not (add_flags | del_flags) & sre_parse.SRE_FLAG_IGNORECASE:
+                keep(_sequence(group, ignore_case=ignore_case))
+        elif op == sre_parse.BRANCH:
+            strings: set[str] = set()
+            for branch in av[1]:
+                branch_strings = _sequence(branch, ignore_case=ignore_case)
+                if not branch_strings:
+                    # a branch that needs no literal.
+                    break
+                strings.update(branch_strings)
+            else:
+                keep(frozenset(strings))
+        elif op in REPEATS and av[0] >= 1:
+            keep(_sequence(av[2], ignore_case=ignore_case))
+        elif op == sre_parse.ASSERT:
+            # a lookaround that must match needs its literals too.
+            keep(_sequence(av[1], ignore_case=ignore_case))
+        elif op == ATOMIC_GROUP:
+            keep(_sequence(av, ignore_case=ignore_case))
+
+    keep(frozenset({"".join(run)}) if run else None)
+    return best
+
+
+class DocumentLiterals:
+    """Literals found in a document, each searched for once."""
+
+    def __init__(self, html: str) -> None:
+        self.html = html
+        self.folded: str | None = None
+        self.found: dict[tuple[str, bool], bool] = {}
+
+    def __contains__(self, literals: Literals) -> bool:
+        return any(
+            self.has(x, ignore_case=literals.ignore_case)
+            for x in literals.strings
+        )
+
+    def misses(self, literals: Literals | None) -> bool:
+        """Check if none of the literals are in the document."""
+        return literals is not None and literals not in self
+
+    def has(self, string: str, *, ignore_case: bool) -> bool:
+        """Check if a string is in the document."""
+        key = (string, ignore_case)
+        if key not in self.found:
+            if ignore_case:
+                if self.folded is None:
+                    # casefold also folds characters like the kelvin sign,
+                    # that match an ascii letter when ignoring case.
+                    self.folded = self.html.casefold()
+                self.found[key] = string in self.folded
+            else:
+                self.found[key] = string in self.html
+        return self.found[key]
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import json
 import math
 import shutil
 import sys
 from collections import Counter
+from operator import itemgetter
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -13,17 +15,22 @@ import regex as re
 from click import echo
 from colorama import Fore, Style
 
+from .lint import RULE_ERROR_CODE, TIMEOUT_CODE, merge_profiles
+
 if TYPE_CHECKING:
-    from collections.abc import Collection, Iterable, Mapping, Sequence
+    from collections.abc import Iterable, Mapping, Sequence
 
     from typing_extensions import TypedDict
 
-    from .lint import LintError
+    from .lint import LintError, RuleProfile
+    from .reformat import FormatTimings
     from .settings import Config
 
     class ProcessResult(TypedDict, total=False):
         format_message: dict[str, tuple[str, ...]]
         lint_message: dict[str, list[LintError]]
+        rule_profile: dict[str, RuleProfile]
+        format_timings: FormatTimings
 
 
 try:
@@ -43,71 +50,145 @@ def print_output(
     config: Config, file_errors: Iterable[ProcessResult], file_count: int
 ) -> int:
     """Print results to console."""
-    file_quantity = build_quantity(file_count)
-    # format errors
-    reformat_success_message = ""
-    lint_success_message = ""
-    lint_error_count = 0
-    format_error_count = 0
-    print_blanks = not config.stdin and not config.quiet
-
-    if print_blanks:
-        echo()
+    printer = ResultPrinter(config)
+    printer.start()
 
     for error in sorted(
         file_errors,
         key=lambda x: next(iter(next(iter(x.values())))),  # type: ignore[call-overload]
     ):
-        if error.get("format_message") and not config.stdin:
+        printer.add(error)
+
+    return printer.finish(file_count)
+
+
+class ResultPrinter:
+    """Print file results one by one and count them for the summary."""
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.lint_error_count = 0
+        self.format_error_count = 0
+        self.codes: Counter[str] = Counter()
+        # time and matches of each linter rule, with --profile-rules.
+        self.profile: dict[str, RuleProfile] = {}
+        # time of each formatter stage and line cache use, with --timings.
+        self.timings: FormatTimings = {
+            "stages": {},
+            "line_hits": 0,
+            "line_misses": 0,
+        }
+        self.print_blanks = not config.stdin and not config.quiet
+
+    def start(self) -> None:
+        """Print the output header."""
+        if self.print_blanks:
+            echo()
+
+    def add(self, error: ProcessResult) -> None:
+        """Print the messages of a file."""
+        if error.get("format_message") and not self.config.stdin:
             # reformat message
-            format_error_count += build_check_output(
-                error["format_message"], config
+            self.format_error_count += build_check_output(
+                error["format_message"], self.config
             )
 
         if error.get("lint_message"):
             # lint message
-            lint_error_count += build_output(error["lint_message"], config)
+            self.lint_error_count += build_output(
+                error["lint_message"], self.config
+            )
+            self.codes.update(
+                x["code"] for x in next(iter(error["lint_message"].values()))
+            )
 
-    if config.statistics and config.lint:
-        build_stats_output([x.get("lint_message") for x in file_errors], config)
+        if error.get("rule_profile"):
+            merge_profiles(self.profile, error["rule_profile"])
 
-    tense_message = (
-        build_quantity(format_error_count) + " would be"
-        if config.check
-        else build_quantity_tense(format_error_count)
-    )
-    reformat_success_message = f"{tense_message} updated."
+        if error.get("format_timings"):
+            from .reformat import merge_timings
 
-    error_case = "error" if lint_error_count == 1 else "errors"
-    lint_success_message += (
-        f"Linted {file_quantity}, found {lint_error_count} {error_case}."
-    )
+            merge_timings(self.timings, error["format_timings"])
 
-    if print_blanks:
-        echo()
+    def finish(self, file_count: int) -> int:
+        """Print statistics and the summary, return the error count."""
+        config = self.config
+        file_quantity = build_quantity(file_count)
+        format_error_count = self.format_error_count
+        lint_error_count = self.lint_error_count
 
-    if (
-        not config.quiet
-        and not config.stdin
-        and (config.reformat or config.check)
-    ):
-        reformat_success_color = (
-            Fore.RED + Style.BRIGHT if (format_error_count) > 0 else Fore.BLUE
-        )
-        echo(
-            f"{reformat_success_color}{reformat_success_message}{Style.RESET_ALL}"
+        if config.statistics and config.lint:
+            build_stats_output(self.codes, config)
+
+        if config.profile_rules and config.lint:
+            build_profile_output(self.profile, config)
+
+        if config.timings and (config.reformat or config.check):
+            build_timings_output(self.timings)
+
+        tense_message = (
+            build_quantity(format_error_count) + " would be"
+            if config.check
+            else build_quantity_tense(format_error_count)
         )
+        reformat_success_message = f"{tense_message} updated."
 
-    if config.lint and not config.quiet:
-        lint_success_color = (
-            Fore.RED + Style.BRIGHT if (lint_error_count) > 0 else Fore.BLUE
+        error_case = "error" if lint_error_count == 1 else "errors"
+        lint_success_message = (
+            f"Linted {file_quantity}, found {lint_error_count} {error_case}."
         )
-        echo(f"{lint_success_color}{lint_success_message}{Style.RESET_ALL}")
 
-    if print_blanks:
-        echo()
+        if self.print_blanks:
+            echo()
+
+        if (
+            not config.quiet
+            and not config.stdin
+            and (config.reformat or config.check)
+        ):
+            reformat_success_color = (
+                Fore.RED + Style.BRIGHT
+                if (format_error_count) > 0
+                else Fore.BLUE
+            )
+            echo(
+                f"{reformat_success_color}{reformat_success_message}{Style.RESET_ALL}"
+            )
 
-    return lint_error_count + format_error_count
+        if config.lint and not config.quiet:
+            lint_success_color = (
+                Fore.RED + Style.BRIGHT if (lint_error_count) > 0 else Fore.BLUE
+            )
+            echo(f"{lint_success_color}{lint_success_message}{Style.RESET_ALL}")
+
+        if self.print_blanks:
+            echo()
+
+        return lint_error_count + format_error_count
+
+
+class ReorderBuffer:
+    """Print results in path order as soon as all earlier paths are done.
+
+    Results that arrive early are held until then, and dropped once printed.
+    """
+
+    def __init__(self, printer: ResultPrinter, paths: Iterable[Path]) -> None:
+        self.printer = printer
+        self.order = sorted(str(x) for x in paths)
+        self.position = 0
+        self.pending: dict[str, ProcessResult] = {}
+
+    def add(self, this_file: Path, error: ProcessResult) -> None:
+        """Queue the result of a file and print the ones that are ready."""
+        self.pending[str(this_file)] = error
+
+        while (
+            self.position < len(self.order)
+            and self.order[self.position] in self.pending
+        ):
+            self.printer.add(self.pending.pop(self.order[self.position]))
+            self.position += 1
 
 
 def build_relative_path(url: str, project_root: Path) -> str:
@@ -123,10 +204,8 @@ def build_output(
     error: Mapping[str, Iterable[LintError]], config: Config
 ) -> int:
     """Build output for file errors."""
-    errors = sorted(
-        next(iter(error.values())),
-        key=lambda x: tuple(int(i) for i in x["line"].split(":")),
-    )
+    # the linter returns errors sorted by position.
+    errors = list(next(iter(error.values())))
 
     width, _ = shutil.get_terminal_size()
 
@@ -221,24 +300,14 @@ def build_quantity_tense(size: int) -> str:
     )
 
 
-def build_stats_output(
-    errors: Collection[Mapping[str, Iterable[LintError]] | None], config: Config
-) -> int:
+def build_stats_output(codes: Counter[str], config: Config) -> int:
     """Build output for linter statistics."""
-    if not errors:
-        return 0
-
-    codes = tuple(
-        code["code"]
-        for error in errors
-        if error
-        for code in next(iter(error.values()))
-    )
-
     messages = {
         rule["rule"]["name"]: rule["rule"]["message"]
         for rule in config.linter_rules
     }
+    messages[TIMEOUT_CODE] = "Rule or file ran out of time."
+    messages[RULE_ERROR_CODE] = "Python module rule could not be loaded."
 
     echo()
     width, _ = shutil.get_terminal_size()
@@ -248,11 +317,9 @@ def build_stats_output(
 
     if messages and codes:
         longest_code = len(max(messages.keys(), key=len))
-        longest_count = len(
-            str(max(Counter(codes).values(), key=_count_digits))
-        )
+        longest_count = len(str(max(codes.values(), key=_count_digits)))
 
-        for code in sorted(Counter(codes).items()):
+        for code in sorted(codes.items()):
             code_space = (longest_code - len(code[0])) * " "
             count_space = (longest_count - _count_digits(code[1])) * " "
 
@@ -260,4 +327,68 @@ def build_stats_output(
                 f"{Fore.YELLOW}{code[0]}{Fore.BLUE} {code_space}{code[1]}{Style.RESET_ALL} {count_space}{messages[code[0]]}"
             )
 
-    return sum(Counter(codes).values())
+    return sum(codes.values())
+
+
+def build_profile_output(
+    profile: Mapping[str, RuleProfile], config: Config
+) -> None:
+    """Build output for the linter rule profile, slowest rules first."""
+    rules = sorted(profile.items(), key=lambda x: x[1]["time"], reverse=True)
+
+    if config.profile_rules_json:
+        Path(config.profile_rules_json).write_text(
+            json.dumps(
+                [{"code": code, **rule} for code, rule in rules], indent=2
+            ),
+            encoding="utf-8",
+        )
+
+    echo()
+    width, _ = shutil.get_terminal_size()
+    echo(
+        f"{Fore.GREEN}{Style.BRIGHT}Rule Profile{Style.RESET_ALL}\n{Style.DIM}{'─' * width}{Style.RESET_ALL}"
+    )
+
+    if not rules:
+        return
+
+    longest_code = max(len(code) for code, _ in rules)
+    echo(
+        f"{'Code':<{longest_code}} {'Time (ms)':>10} {'Matches':>9} {'Ignored':>9}"
+    )
+    for code, rule in rules:
+        echo(
+            f"{Fore.YELLOW}{code:<{longest_code}}{Style.RESET_ALL}"
+            f" {Fore.BLUE}{rule['time'] * 1000:>10.1f}{Style.RESET_ALL}"
+            f" {rule['matches']:>9} {rule['ignored']:>9}"
+        )
+
+
+def build_timings_output(timings: FormatTimings) -> None:
+    """Build output for the formatter timings, slowest stages first."""
+    stages = sorted(timings["stages"].items(), key=itemgetter(1), reverse=True)
+
+    echo()
+    width, _ = shutil.get_terminal_size()
+    echo(
+        f"{Fore.GREEN}{Style.BRIGHT}Formatter Timings{Style.RESET_ALL}\n{Style.DIM}{'─' * width}{Style.RESET_ALL}"
+    )
+
+    if not stages:
+        return
+
+    longest_stage = max(len(stage) for stage, _ in stages)
+    echo(f"{'Stage':<{longest_stage}} {'Time (ms)':>10}")
+    for stage, seconds in stages:
+        echo(
+            f"{Fore.YELLOW}{stage:<{longest_stage}}{Style.RESET_ALL}"
+            f" {Fore.BLUE}{seconds * 1000:>10.1f}{Style.RESET_ALL}"
+        )
+
+    lookups = timings["line_hits"] + timings["line_misses"]
+    if lookups:
+        echo(
+            f"\nLine cache: {timings['line_hits']} of {lookups} lookups hit"
+            f" ({timings['line_hits'] / lookups:.1%})"
+        )
@@ -0,0 +1,464 @@
+"""Compiled regex patterns of a config.
+
+The formatter and helpers run the same patterns on every line of every
+file. Compiling them once per Config skips the regex cache lookup on
+each call, and the recompiles once the size limited cache overflows.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+import regex as re
+
+from .helpers import RE_FLAGS_IMVD, RE_FLAGS_IV, RE_FLAGS_IVD, RE_FLAGS_IVM
+
+if TYPE_CHECKING:
+    from .settings import Config
+
+
+class Patterns:
+    """Compiled patterns of the helpers, formatter and rules.
+
+    Each pattern is compiled when it is first used, so linting does not
+    pay for the formatter patterns. Config.patterns is not pickled, each
+    worker builds its own.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+
+    @property
+    def _line_contents(self) -> str:
+        return r"([^\n]*?)" if self.config.preserve_blank_lines else r"(.*?)"
+
+    @property
+    def _trailing_contents(self) -> str:
+        return r" \t" if self.config.preserve_blank_lines else r"\n \t"
+
+    @staticmethod
+    def _tags(setting: str | None) -> list[str]:
+        return [x.strip() for x in setting.split(",")] if setting else []
+
+    @cached_property
+    def unformatted_blocks(self) -> re.Pattern[str]:
+        return re.compile(self.config.unformatted_blocks, flags=RE_FLAGS_IMVD)
+
+    @cached_property
+    def ignored_blocks(self) -> re.Pattern[str]:
+        return re.compile(self.config.ignored_blocks, flags=RE_FLAGS_IMVD)
+
+    @cached_property
+    def ignored_inline_blocks(self) -> re.Pattern[str]:
+        return re.compile(self.config.ignored_inline_blocks, flags=RE_FLAGS_IV)
+
+    @cached_property
+    def ignored_blocks_inline(self) -> re.Pattern[str]:
+        return re.compile(
+            self.config.ignored_blocks_inline, flags=RE_FLAGS_IMVD
+        )
+
+    @cached_property
+    def ignored_block_opening(self) -> re.Pattern[str]:
+        return re.compile(self.config.ignored_block_opening, flags=RE_FLAGS_IV)
+
+    @cached_property
+    def ignored_block_closing(self) -> re.Pattern[str]:
+        return re.compile(self.config.ignored_block_closing, flags=RE_FLAGS_IV)
+
+    @cached_property
+    def script_style_inline(self) -> re.Pattern[str]:
+        return re.compile(self.config.script_style_inline, flags=RE_FLAGS_IMVD)
+
+    @cached_property
+    def script_style_inline_line(self) -> re.Pattern[str]:
+        return re.compile(self.config.script_style_inline, flags=RE_FLAGS_IV)
+
+    @cached_property
+    def script_style_opening(self) -> re.Pattern[str]:
+        return re.compile(self.config.script_style_opening, flags=RE_FLAGS_IV)
+
+    @cached_property
+    def script_style_closing(self) -> re.Pattern[str]:
+        return re.compile(self.config.script_style_closing, flags=RE_FLAGS_IV)
+
+    @cached_property
+    def ignored_trans_blocks(self) -> re.Pattern[str]:
+        return re.compile(self.config.ignored_trans_blocks, flags=RE_FLAGS_IVD)
+
+    @cached_property
+    def ignored_trans_blocks_closing(self) -> re.Pattern[str]:
+        return re.compile(
+            self.config.ignored_trans_blocks_closing, flags=RE_FLAGS_IV
+        )
+
+    @cached_property
+    def trans_trimmed_blocks(self) -> re.Pattern[str]:
+        return re.compile(self.config.trans_trimmed_blocks, flags=RE_FLAGS_IVD)
+
+    @cached_property
+    def safe_closing_inline(self) -> re.Pattern[str]:
+        config = self.config
+        return re.compile(
+            config.ignored_inline_blocks + r" | " + config.ignored_blocks,
+            flags=RE_FLAGS_IMVD,
+        )
+
+    @cached_property
+    def safe_closing_tag(self) -> re.Pattern[str]:
+        return re.compile(self.config.safe_closing_tag, flags=RE_FLAGS_IV)
+
+    @cached_property
+    def template_blocks(self) -> re.Pattern[str]:
+        return re.compile(self.config.template_blocks, flags=RE_FLAGS_IMVD)
+
+    @cached_property
+    def ignored_linter_blocks(self) -> re.Pattern[str]:
+        return re.compile(
+            self.config.ignored_linter_blocks, flags=RE_FLAGS_IMVD
+        )
+
+    @cached_property
+    def ignored_rules(self) -> tuple[re.Pattern[str], ...]:
+        return tuple(
+            re.compile(x, flags=RE_FLAGS_IVD) for x in self.config.ignored_rules
+        )
+
+    @cached_property
+    def rule_list_split(self) -> re.Pattern[str]:
+        return re.compile(r"\s|,")
+
+    @cached_property
+    def html_tag(self) -> re.Pattern[str]:
+        return re.compile(
+            self.config.html_tag_regex,
+            flags=re.MULTILINE | re.VERBOSE | re.IGNORECASE,
+        )
+
+    @cached_property
+    def html_break_before(self) -> re.Pattern[str]:
+        config = self.config
+        return re.compile(
+            rf"{config.break_before}\K(</?(?:{config.break_html_tags})\b(\"[^\"]*\"|'[^']*'|{{[^}}]*}}|[^'\">{{}}])*>)",
+            flags=re.IGNORECASE | re.VERBOSE,
+        )
+
+    @cached_property
+    def html_break_after(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"(</?(?:{self.config.break_html_tags})\b(\"[^\"]*\"|'[^']*'|{{[^}}]*}}|[^'\">{{}}])*>)(?!\s*?\n)(?=[^\n])",
+            flags=re.IGNORECASE | re.VERBOSE,
+        )
+
+    @cached_property
+    def template_break_before(self) -> re.Pattern[str]:
+        config = self.config
+        return re.compile(
+            config.break_before
+            + r"\K((?:{%|{{\#)[ ]*?(?:"
+            + config.break_template_tags
+            + ")[^}]+?[%}]})",
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def template_break_after(self) -> re.Pattern[str]:
+        return re.compile(
+            r"((?:{%|{{\#)[ ]*?(?:"
+            + self.config.break_template_tags
+            + ")[^}]+?[%}]})(?=[^\n])",
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def leading_space(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"^[ \t]*{self._line_contents}([{self._trailing_contents}]*)$",
+            flags=re.M,
+        )
+
+    @cached_property
+    def leading_space_before_tag(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"^[ \t]*((?:<|{{%).*?)([{self._trailing_contents}]*)$", flags=re.M
+        )
+
+    @cached_property
+    def trailing_space(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"^{self._line_contents}([{self._trailing_contents}]*)$",
+            flags=re.M,
+        )
+
+    @cached_property
+    def blank_line_after_tags(self) -> tuple[re.Pattern[str], ...]:
+        return tuple(
+            re.compile(
+                rf"((?:{{%\s*?{tag}\b[^}}]+?%}}\n?)+)",
+                flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
+            )
+            for tag in self._tags(self.config.blank_line_after_tag)
+        )
+
+    @cached_property
+    def blank_line_before_tags(self) -> tuple[re.Pattern[str], ...]:
+        return tuple(
+            re.compile(
+                rf"(?<!^\n)((?:{{%\s*?{tag}\b[^}}]+?%}}\n?)+)",
+                flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
+            )
+            for tag in self._tags(self.config.blank_line_before_tag)
+        )
+
+    @cached_property
+    def yaml_front_matter(self) -> re.Pattern[str]:
+        return re.compile(r"(^---.+?---)$", flags=re.MULTILINE | re.DOTALL)
+
+    @cached_property
+    def blank_line_after_groups(self) -> tuple[re.Pattern[str], ...]:
+        return tuple(
+            re.compile(
+                rf"((?:{{%\s*?{tag}[^}}]+?%}}\n?)+)",
+                flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
+            )
+            for tag in self._tags(self.config.blank_line_after_tag)
+        )
+
+    @cached_property
+    def blank_line_before_groups(self) -> tuple[re.Pattern[str], ...]:
+        return tuple(
+            re.compile(
+                rf"((?:{{%\s*?{tag}[^}}]+?%}}\n?)+)",
+                flags=re.IGNORECASE | re.MULTILINE | re.DOTALL,
+            )
+            for tag in self._tags(self.config.blank_line_before_tag)
+        )
+
+    # the whitespace after the opening tag is possessive. Giving it back
+    # cannot lead to a match, and it is the indent of the next line.
+    @cached_property
+    def single_line_html(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"(<({self.config.optional_single_line_html_tags})\b(?:\"[^\"]*\"|'[^']*'|{{[^}}]*}}|[^'\">{{}}])*>)\s*+([^<\n]*?)\s*?(</(\2)>)",
+            flags=re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE,
+        )
+
+    @cached_property
+    def single_line_template(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"((?:\s|^){{%-?[ ]*?({self.config.optional_single_line_template_tags})\b(?:(?!\n|%}}).)*?%}})\s*+([^%\n]*?)\s*?({{%-?[ ]+?end(\2)[ ]*?%}})",
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def template_tag_spacing(self) -> re.Pattern[str]:
+        return re.compile(r"({%-?\+?)[ ]*?(\w(?:(?!%}).)*?)[ ]*?(\+?-?%})")
+
+    @cached_property
+    def variable_tag_spacing(self) -> re.Pattern[str]:
+        return re.compile(r"({{)[ ]*?(\w(?:(?!}}).)*?)[ ]*?(\+?-?}})")
+
+    @cached_property
+    def handlebars_tag_spacing(self) -> re.Pattern[str]:
+        return re.compile(r"({{#(?:each|if).+?[^ ])(}})")
+
+    @cached_property
+    def ignored_inline_line(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"^\s*?(?:{self.config.ignored_inline_blocks})", flags=RE_FLAGS_IVM
+        )
+
+    @cached_property
+    def single_line_tags(self) -> re.Pattern[str]:
+        config = self.config
+        return re.compile(
+            rf"""^(?:[^<\s].*?)? # start of a line, optionally with some text
+                    (?:
+                        (?:<({config.indent_html_tags})>)(?:.*?)(?:</(?:\1)>) # <span>stuff</span> >>>> match 1
+                       |(?:<({config.indent_html_tags})\b[^>]+?>)(?:.*?)(?:</(?:\2)>) # <span stuff>stuff</span> >>> match 2
+                       |(?:<(?:{config.always_self_closing_html_tags})\b[^>]*?/?>) # <img stuff />
+                       |(?:<(?:{config.indent_html_tags})\b[^>]*?/>) # <img />
+                       |(?:{{%[ ]*?({config.optional_single_line_template_tags})[ ]+?.*?%}})(?:.*?)(?:{{%[ ]+?end(?:\3)[ ]+?.*?%}}) # >>> match 3
+                       |{config.ignored_inline_blocks}
+                    )[ \t]*?
+                    (?:
+                    .*? # anything
+                    (?: # followed by another slt
+                        (?:<({config.indent_html_tags})>)(?:.*?)(?:</(?:\4)>) # <span>stuff</span> >>>> match 1
+                       |(?:<({config.indent_html_tags})\b[^>]+?>)(?:.*?)(?:</(?:\5)>) # <span stuff>stuff</span> >>> match 2
+                       |(?:<(?:{config.always_self_closing_html_tags})\b[^>]*?/?>) # <img stuff />
+                       |(?:<(?:{config.indent_html_tags})\b[^>]*?/>) # <img />
+                       |(?:{{%[ ]*?({config.optional_single_line_template_tags})[ ]+?.*?%}})(?:.*?)(?:{{%[ ]+?end(?:\6)[ ]+?.*?%}}) # >>> match 3
+                       |{config.ignored_inline_blocks}
+                    )[ \t]*?
+                    )*? # optional of course
+                    [^<]*?$ # with no other tags following until end of line
+                """,
+            flags=RE_FLAGS_IVM,
+        )
+
+    @cached_property
+    def set_closing(self) -> re.Pattern[str]:
+        return re.compile(
+            r"^(?!.*\{\%).*%\}.*$",
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def set_closing_bracket(self) -> re.Pattern[str]:
+        return re.compile(
+            r"^[ ]*}|^[ ]*]", flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE
+        )
+
+    @cached_property
+    def tag_unindent(self) -> re.Pattern[str]:
+        return re.compile(
+            self.config.tag_unindent,
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def slt_ending(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"(<({self.config.indent_html_tags})>)(.*?)(</(\2)>[^<]*?$)",
+            flags=RE_FLAGS_IVM,
+        )
+
+    @cached_property
+    def slt_attributes_ending(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"(<({self.config.indent_html_tags})\\b[^>]+?>)(.*?)(</(\2)>[^<]*?$)",
+            flags=RE_FLAGS_IVM,
+        )
+
+    @cached_property
+    def slt_starting(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"(^<({self.config.indent_html_tags})>)(.*?)(</(\2)>)",
+            flags=RE_FLAGS_IVM,
+        )
+
+    @cached_property
+    def slt_attributes_starting(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"(^<({self.config.indent_html_tags})\b[^>]+?>)(.*?)(</(\2)>)",
+            flags=RE_FLAGS_IVM,
+        )
+
+    @cached_property
+    def tag_unindent_line_start(self) -> re.Pattern[str]:
+        return re.compile(
+            r"^" + str(self.config.tag_unindent_line),
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def set_opening(self) -> re.Pattern[str]:
+        return re.compile(
+            r"^([ ]*{%[ ]*?set)(?!.*%}).*$",
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def set_opening_bracket(self) -> re.Pattern[str]:
+        return re.compile(
+            r"(\{(?![^{}]*%[}\s])(?=[^{}]*$)|\[(?=[^\]]*$))",
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def tag_indent_start(self) -> re.Pattern[str]:
+        return re.compile(
+            r"^(?:" + str(self.config.tag_indent) + r")",
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def tag_attributes(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"(\s*?)(<(?:{self.config.indent_html_tags}))\s((?:\"[^\"]*\"|'[^']*'|{{[^}}]*}}|[^'\">{{}}\/])+?)(\s?/?>)",
+            flags=re.VERBOSE | re.IGNORECASE,
+        )
+
+    @cached_property
+    def jinja_attribute_quotes(self) -> re.Pattern[str]:
+        return re.compile(r"=([\"'])(\{\{[\s\S]*?\}\})\1", flags=re.MULTILINE)
+
+    @cached_property
+    def set_contents(self) -> re.Pattern[str]:
+        return re.compile(
+            r"([ ]*)({%-?)[ ]*(set)[ ]+?((?:(?!%}).)*?)(-?%})",
+            flags=RE_FLAGS_IMVD,
+        )
+
+    @cached_property
+    def function_contents(self) -> re.Pattern[str]:
+        return re.compile(
+            r"([ ]*)({{-?\+?)[ ]*?((?:(?!}}).)*?\w)(\((?:\"[^\"]*\"|'[^']*'|[^\)])*?\)[ ]*)((?:\[[^\]]*?\]|\.[^\s]+)[ ]*)?((?:(?!}}).)*?-?\+?}})",
+            flags=RE_FLAGS_IMVD,
+        )
+
+    @cached_property
+    def attribute(self) -> re.Pattern[str]:
+        return re.compile(self.config.attribute_pattern, flags=re.VERBOSE)
+
+    @cached_property
+    def template_unindent(self) -> re.Pattern[str]:
+        return re.compile(self.config.template_unindent, flags=re.I | re.X)
+
+    @cached_property
+    def tag_unindent_line(self) -> re.Pattern[str]:
+        return re.compile(self.config.tag_unindent_line, flags=re.I | re.X)
+
+    @cached_property
+    def template_indent(self) -> re.Pattern[str]:
+        return re.compile(self.config.template_indent, flags=re.I | re.X)
+
+    @cached_property
+    def attribute_break_before(self) -> re.Pattern[str]:
+        config = self.config
+        return re.compile(
+            config.break_before
+            + r".\K((?:{%|{{\#)[ ]*?(?:"
+            + config.break_template_tags
+            + ")[^}]+?[%|}]})",
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def attribute_break_after(self) -> re.Pattern[str]:
+        return re.compile(
+            r"((?:{%|{{\#)[ ]*?(?:"
+            + self.config.break_template_tags
+            + ")[^}]+?[%|}]})([^\n]+)$",
+            flags=re.IGNORECASE | re.MULTILINE | re.VERBOSE,
+        )
+
+    @cached_property
+    def style(self) -> re.Pattern[str]:
+        return re.compile(
+            r"([ ]*?)(<(?:style)\b(?:\"[^\"]*\"|'[^']*'|{[^}]*}|[^'\">{}])*>)(.*?)(?=</style>)",
+            flags=re.IGNORECASE | re.DOTALL,
+        )
+
+    @cached_property
+    def script(self) -> re.Pattern[str]:
+        return re.compile(
+            r"([ ]*?)(<(?:script)\b(?:\"[^\"]*\"|'[^']*'|{[^}]*}|[^'\">{}])*>)(.*?)(?=</script>)",
+            flags=re.IGNORECASE | re.DOTALL,
+        )
+
+    @cached_property
+    def tag_with_attributes(self) -> re.Pattern[str]:
+        return re.compile(
+            r"<(/?(\w+))\s*(" + self.config.attribute_pattern + r"|\s*)*\s*?>",
+            flags=re.VERBOSE,
+        )
+
+    @cached_property
+    def self_closing_tag(self) -> re.Pattern[str]:
+        return re.compile(
+            rf"^/?{self.config.always_self_closing_html_tags}\b",
+            flags=re.I | re.X,
+        )
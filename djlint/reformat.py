@@ -6,42 +6,91 @@ Much code is borrowed from https://github.com/rareyman/HTMLBeautify, many thanks
 from __future__ import annotations
 
 import difflib
+import time
 from typing import TYPE_CHECKING
 
 from .formatter.compress import compress_html
 from .formatter.condense import clean_whitespace, condense_html
-from .formatter.css import format_css
 from .formatter.expand import expand_html
 from .formatter.indent import indent_html
-from .formatter.js import format_js
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from pathlib import Path
 
+    from typing_extensions import TypedDict
+
     from .settings import Config
 
+    class FormatTimings(TypedDict):
+        stages: dict[str, float]
+        line_hits: int
+        line_misses: int
+
+
+def new_timings() -> FormatTimings:
+    """Start the formatter timings of a run."""
+    return {"stages": {}, "line_hits": 0, "line_misses": 0}
+
+
+def merge_timings(total: FormatTimings, timings: FormatTimings) -> None:
+    """Add the formatter timings of a file to the timings of the run."""
+    for stage, seconds in timings["stages"].items():
+        total["stages"][stage] = total["stages"].get(stage, 0) + seconds
+    total["line_hits"] += timings["line_hits"]
+    total["line_misses"] += timings["line_misses"]
+
+
+def formatter(
+    config: Config, rawcode: str, *, timings: FormatTimings | None = None
+) -> str:
+    """Format a html string.
 
-def formatter(config: Config, rawcode: str) -> str:
-    """Format a html string."""
+    With timings, the time of each stage and the use of the line caches
+    are added to them.
+    """
     if not rawcode:
         return rawcode
 
+    def run(stage: Callable[[str, Config], str], html: str) -> str:
+        if timings is None:
+            return stage(html, config)
+        start = time.perf_counter()
+        html = stage(html, config)
+        stages = timings["stages"]
+        stages[stage.__name__] = (
+            stages.get(stage.__name__, 0) + time.perf_counter() - start
+        )
+        return html
+
+    hits, misses = config.line_classifier.cache_info()
+
     # naturalize the line breaks
-    compressed = compress_html("\n".join(rawcode.splitlines()), config)
+    compressed = run(compress_html, "\n".join(rawcode.splitlines()))
 
-    expanded = expand_html(compressed, config)
+    expanded = run(expand_html, compressed)
 
-    condensed = clean_whitespace(expanded, config)
+    condensed = run(clean_whitespace, expanded)
 
-    indented_code = indent_html(condensed, config)
+    indented_code = run(indent_html, condensed)
 
-    beautified_code = condense_html(indented_code, config)
+    beautified_code = run(condense_html, indented_code)
 
+    # the beautifiers are only imported when they are used.
     if config.format_css:
-        beautified_code = format_css(beautified_code, config)
+        from .formatter.css import format_css
+
+        beautified_code = run(format_css, beautified_code)
 
     if config.format_js:
-        beautified_code = format_js(beautified_code, config)
+        from .formatter.js import format_js
+
+        beautified_code = run(format_js, beautified_code)
+
+    if timings is not None:
+        new_hits, new_misses = config.line_classifier.cache_info()
+        timings["line_hits"] += new_hits - hits
+        timings["line_misses"] += new_misses - misses
 
     # preserve original line endings
     line_ending = rawcode.find("\n")
@@ -55,17 +104,15 @@ def formatter(config: Config, rawcode: str) -> str:
 
 
 def reformat_file(
-    config: Config, this_file: Path
+    config: Config, this_file: Path, *, timings: FormatTimings | None = None
 ) -> dict[str, tuple[str, ...]]:
     """Reformat html file."""
     with this_file.open(encoding="utf-8", newline="") as f:
         rawcode = f.read()
 
-    beautified_code = formatter(config, rawcode)
+    beautified_code = formatter(config, rawcode, timings=timings)
 
-    if (
-        config.check is not True and beautified_code != rawcode
-    ) or config.stdin:
+    if config.check is not True and beautified_code != rawcode:
         with this_file.open("w", encoding="utf-8", newline="") as f:
             f.write(beautified_code)
 
@@ -0,0 +1,178 @@
+"""Regions of a document the linter and formatter leave alone.
+
+The regions are found once per document, then each match is checked
+with a bisect instead of scanning the document again.
+"""
+
+from __future__ import annotations
+
+import itertools
+from bisect import bisect_left, bisect_right
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import regex as re
+
+    from .settings import Config
+
+
+class Intervals:
+    """Closed intervals, merged so a position is found with one bisect."""
+
+    def __init__(self, spans: Iterable[tuple[int, int]]) -> None:
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        for start, end in sorted(spans):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __contains__(self, position: int) -> bool:
+        index = bisect_right(self.starts, position) - 1
+        return index >= 0 and position <= self.ends[index]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class Blocks:
+    """Intervals checked for containing a whole span."""
+
+    def __init__(self, spans: Iterable[tuple[int, int]]) -> None:
+        self.starts: list[int] = []
+        # the furthest end of the blocks starting at or before each start.
+        self.ends: list[int] = []
+        for start, end in sorted(spans):
+            self.starts.append(start)
+            self.ends.append(max(end, self.ends[-1]) if self.ends else end)
+
+    def contain(self, start: int, end: int) -> bool:
+        """Check if one block contains the span."""
+        index = bisect_right(self.starts, start) - 1
+        return index >= 0 and end <= self.ends[index]
+
+    def surround(self, start: int, end: int) -> bool:
+        """Check if one block starting before the span contains it."""
+        index = bisect_left(self.starts, start) - 1
+        return index >= 0 and end <= self.ends[index]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class FormatRegions:
+    """Blocks of one version of a document the formatter leaves alone.
+
+    A stage makes new regions each time it changes the document. Each kind
+    of block is found when first needed.
+    """
+
+    def __init__(self, config: Config, html: str) -> None:
+        self.config = config
+        self.html = html
+
+    @cached_property
+    def ignored_blocks(self) -> Blocks:
+        patterns = self.config.patterns
+        return Blocks(
+            x.span()
+            for x in itertools.chain(
+                patterns.ignored_blocks.finditer(self.html),
+                patterns.ignored_inline_blocks.finditer(self.html),
+            )
+        )
+
+    @cached_property
+    def unformatted_blocks(self) -> Blocks:
+        return Blocks(
+            x.span()
+            for x in self.config.patterns.unformatted_blocks.finditer(self.html)
+        )
+
+    @cached_property
+    def template_blocks(self) -> Blocks:
+        return Blocks(
+            x.span()
+            for x in self.config.patterns.template_blocks.finditer(self.html)
+        )
+
+    def inside_ignored_block(self, match: re.Match[str]) -> bool:
+        """Check if a match is inside a block that is not indented."""
+        return self.ignored_blocks.contain(match.start(), match.end())
+
+    def child_of_unformatted_block(self, match: re.Match[str]) -> bool:
+        """Check if a match is inside a block that is not formatted."""
+        return self.unformatted_blocks.surround(match.start(), match.end())
+
+    def inside_template_block(self, match: re.Match[str]) -> bool:
+        """Check if a match is inside a template block."""
+        return self.template_blocks.contain(match.start(), match.end())
+
+
+class LintRegions:
+    """Ignored regions of a document, found once for every rule.
+
+    Python rules receive it as the ``regions`` argument of run().
+    """
+
+    def __init__(self, config: Config, html: str) -> None:
+        patterns = config.patterns
+        self.ignored_blocks = Intervals(
+            x.span()
+            for x in itertools.chain(
+                patterns.ignored_blocks.finditer(html),
+                patterns.ignored_inline_blocks.finditer(html),
+            )
+        )
+        self.linter_blocks = Blocks(
+            x.span() for x in patterns.ignored_linter_blocks.finditer(html)
+        )
+
+        # djlint:off comments. Without a rule list they turn off every
+        # rule, else only the listed rules.
+        everything: list[tuple[int, int]] = []
+        rules: dict[str, list[tuple[int, int]]] = {}
+        for rule_regex in patterns.ignored_rules:
+            for match in rule_regex.finditer(html):
+                codes = match.group(1).strip()
+                if not codes:
+                    everything.append(match.span())
+                    continue
+                for code in patterns.rule_list_split.split(codes):
+                    rules.setdefault(code, []).append(match.span())
+
+        self.ignored_everywhere = Intervals(everything)
+        self.ignored_rules = {
+            code: Intervals(spans) for code, spans in rules.items()
+        }
+
+    def overlaps_ignored_block(self, match: re.Match[str]) -> bool:
+        """Check if a match starts or ends in an ignored block."""
+        return (
+            match.start() in self.ignored_blocks
+            or match.end() in self.ignored_blocks
+        )
+
+    def inside_ignored_linter_block(self, match: re.Match[str]) -> bool:
+        """Check if a match is inside of a ignored linter block."""
+        return self.linter_blocks.contain(match.start(), match.end())
+
+    def inside_ignored_rule(self, match: re.Match[str], rule: str) -> bool:
+        """Check if a match is inside a djlint:off comment for the rule."""
+        intervals = self.ignored_rules.get(rule)
+        return (intervals is not None and match.start() in intervals) or (
+            match.end() in self.ignored_everywhere
+        )
+
+    def is_ignored(self, match: re.Match[str], rule: str) -> bool:
+        """Check if errors of a rule are ignored at a match."""
+        return (
+            self.overlaps_ignored_block(match)
+            or self.inside_ignored_rule(match, rule)
+            or self.inside_ignored_linter_block(match)
+        )
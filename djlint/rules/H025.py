@@ -6,19 +6,14 @@ import copy
 from itertools import chain
 from typing import TYPE_CHECKING
 
-import regex as re
-
-from ..helpers import (
-    inside_ignored_linter_block,
-    inside_ignored_rule,
-    overlaps_ignored_block,
-)
 from ..lint import get_line
+from ..regions import LintRegions
 
 if TYPE_CHECKING:
+    import regex as re
     from typing_extensions import Any
 
-    from ..lint import LintError
+    from ..lint import LineIndex, LintError
     from ..settings import Config
 
 
@@ -27,23 +22,21 @@ def run(
     config: Config,
     html: str,
     filepath: str,
-    line_ends: list[dict[str, int]],
+    line_ends: LineIndex,
     *args: Any,
+    regions: LintRegions | None = None,
     **kwargs: Any,
 ) -> tuple[LintError, ...]:
     """Check for orphans html tags."""
+    if regions is None:
+        regions = LintRegions(config, html)
+
     open_tags: list[re.Match[str]] = []
     orphan_tags: list[re.Match[str]] = []
 
-    for match in re.finditer(
-        r"<(/?(\w+))\s*(" + config.attribute_pattern + r"|\s*)*\s*?>",
-        html,
-        flags=re.VERBOSE,
-    ):
-        if match.group(1) and not re.search(
-            rf"^/?{config.always_self_closing_html_tags}\b",
-            match.group(1),
-            flags=re.I | re.X,
+    for match in config.patterns.tag_with_attributes.finditer(html):
+        if match.group(1) and not config.patterns.self_closing_tag.search(
+            match.group(1)
         ):
             # close tags should equal open tags
             if match.group(1)[0] != "/":
@@ -65,9 +58,5 @@ def run(
             "message": rule["message"],
         }
         for match in chain(open_tags, orphan_tags)
-        if (
-            not overlaps_ignored_block(config, html, match)
-            and not inside_ignored_rule(config, html, match, rule["name"])
-            and not inside_ignored_linter_block(config, html, match)
-        )
+        if not regions.is_ignored(match, rule["name"])
     )
@@ -2,22 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
+import importlib.util
 import json
 import logging
 import sys
+from functools import cache, cached_property
+from importlib import metadata
 from itertools import chain
 
 # get pyproject.toml settings
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-import yaml
 from click import echo
 from colorama import Fore
 from HtmlTagNames import html_tag_names
 from HtmlVoidElements import html_void_elements
-from pathspec import PathSpec
-from pathspec.patterns.gitwildmatch import GitWildMatchPatternError
 
 if sys.version_info >= (3, 11):
     try:
@@ -29,11 +30,17 @@ if sys.version_info >= (3, 11):
 else:
     import tomli as tomllib
 
+
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator, Mapping
 
+    from pathspec import PathSpec
     from typing_extensions import Any, TypeVar
 
+    from .lines import LineClassifier
+    from .lint import RulePlan
+    from .patterns import Patterns
+
     _TMappingStrAny = TypeVar("_TMappingStrAny", bound=Mapping[str, Any])
 
 
@@ -60,6 +67,9 @@ def find_project_root(src: Path) -> Path:
 
 def load_gitignore(root: Path) -> PathSpec:
     """Search upstream for a .gitignore file."""
+    from pathspec import PathSpec
+    from pathspec.patterns.gitwildmatch import GitWildMatchPatternError
+
     gitignore = root / ".gitignore"
     if gitignore.is_file():
         with gitignore.open(encoding="utf-8") as this_file:
@@ -189,6 +199,8 @@ def load_custom_rules(src: Path) -> Any:
     djlint_rules_file = find_djlint_rules(src)
 
     if djlint_rules_file:
+        import yaml
+
         return yaml.load(
             djlint_rules_file.read_text(encoding="utf-8"),
             Loader=yaml.SafeLoader,
@@ -246,6 +258,9 @@ class Config:
         format_js: bool = False,
         configuration: str | None = None,
         statistics: bool = False,
+        profile_rules: bool = False,
+        profile_rules_json: str | None = None,
+        timings: bool = False,
         include: str = "",
         ignore_case: bool = False,
         ignore_blocks: str = "",
@@ -268,6 +283,13 @@ class Config:
         no_function_formatting: bool = False,
         no_set_formatting: bool = False,
         max_blank_lines: int | None = None,
+        rule_timeout: float | None = None,
+        file_timeout: float | None = None,
+        no_cache: bool = False,
+        jobs: int | None = None,
+        stream: bool = False,
+        changed_since: str | None = None,
+        staged: bool = False,
     ) -> None:
         self.reformat = reformat
         self.check = check
@@ -283,7 +305,6 @@ class Config:
             self.project_root, configuration
         )
 
-        self.gitignore = load_gitignore(self.project_root)
         # custom configuration options
 
         self.use_gitignore: bool = use_gitignore or djlint_settings.get(
@@ -375,6 +396,10 @@ class Config:
         self.files: list[str] | None = djlint_settings.get("files", None)
         self.stdin = False
 
+        # only check the files git reports as changed.
+        self.changed_since = changed_since
+        self.staged = staged
+
         # codes to exclude
         profile_dict: dict[str, tuple[str, ...]] = {
             "html": ("D", "J", "T", "N", "M"),
@@ -401,6 +426,8 @@ class Config:
         )
 
         # load linter rules
+        import yaml
+
         rule_set = validate_rules(
             chain(
                 yaml.safe_load(
@@ -427,6 +454,10 @@ class Config:
         )
 
         self.statistics = statistics
+        self.profile_rules: bool = profile_rules or bool(profile_rules_json)
+        self.profile_rules_json: str | None = profile_rules_json
+        self.timings: bool = timings
+        self.stream: bool = stream or djlint_settings.get("stream", False)
 
         # base options
         default_indent = 4
@@ -453,6 +484,66 @@ class Config:
             )
             self.max_blank_lines = max_blank_lines or 0
 
+        # time budgets of the linter in seconds, 0 is no limit.
+        self.rule_timeout: float | None = rule_timeout
+        if rule_timeout is None and "rule_timeout" in djlint_settings:
+            try:
+                self.rule_timeout = max(
+                    float(djlint_settings["rule_timeout"]), 0
+                )
+            except ValueError:
+                echo(
+                    Fore.RED
+                    + f"Error: Invalid pyproject.toml rule_timeout value {djlint_settings['rule_timeout']}"
+                )
+
+        self.file_timeout: float | None = file_timeout
+        if file_timeout is None and "file_timeout" in djlint_settings:
+            try:
+                self.file_timeout = max(
+                    float(djlint_settings["file_timeout"]), 0
+                )
+            except ValueError:
+                echo(
+                    Fore.RED
+                    + f"Error: Invalid pyproject.toml file_timeout value {djlint_settings['file_timeout']}"
+                )
+
+        # number of worker processes, 0 uses all cores.
+        self.jobs: int | None = jobs
+        if jobs is None and "jobs" in djlint_settings:
+            try:
+                self.jobs = max(int(djlint_settings["jobs"]), 0)
+            except ValueError:
+                echo(
+                    Fore.RED
+                    + f"Error: Invalid pyproject.toml jobs value {djlint_settings['jobs']}"
+                )
+
+        # persistent result cache, not used when profiling as cached files
+        # are not linted or formatted again.
+        self.cache: bool = not (
+            no_cache
+            or self.profile_rules
+            or self.timings
+            or djlint_settings.get("no_cache", False)
+        )
+        self.cache_dir: Path = self.project_root / djlint_settings.get(
+            "cache_dir", ".djlint_cache"
+        )
+
+        # size limit of the cache, in megabytes
+        self.max_cache_size = 256
+        try:
+            self.max_cache_size = int(
+                djlint_settings.get("max_cache_size", self.max_cache_size)
+            )
+        except ValueError:
+            echo(
+                Fore.RED
+                + f"Error: Invalid pyproject.toml max_cache_size value {djlint_settings['max_cache_size']}"
+            )
+
         # From ruff and black
         default_exclude: str = r"""
             __pypackages__
@@ -859,9 +950,9 @@ class Config:
             | {{-?\s*/\*(?!\s*djlint\:\s*(?:off|on)).*?\*/\s*-?}}
             | <!--.*?-->
             | <\?php.*?\?>
-            | {%[ ]*?blocktranslate\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*?endblocktranslate[ ]*?%}
-            | {%[ ]*?blocktrans\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*?endblocktrans[ ]*?%}
-            | {%[ ]*?comment\b(?:(?!%}).)*?%}(?:(?!djlint:(?:off|on)).)*?(?={%[ ]*?endcomment[ ]*?%})
+            | {%[ ]*blocktranslate\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*endblocktranslate[ ]*%}
+            | {%[ ]*blocktrans\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*endblocktrans[ ]*%}
+            | {%[ ]*comment\b(?:(?!%}).)*?%}(?:(?!djlint:(?:off|on)).)*?(?={%[ ]*endcomment[ ]*%})
             | ^---[\s\S]+?---
         """
         self.script_style_inline: str = r"""
@@ -885,9 +976,9 @@ class Config:
             | {{-?\s*/\*(?!\s*djlint\:\s*(?:off|on)).*?\*/\s*-?}}
             | <!--.*?-->
             | <\?php.*?\?>
-            | {%[ ]*?blocktranslate\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*?endblocktranslate[ ]*?%}
-            | {%[ ]*?blocktrans\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*?endblocktrans[ ]*?%}
-            | {%[ ]*?comment\b(?:(?!%}).)*?%}(?:(?!djlint:(?:off|on)).)*?(?={%[ ]*?endcomment[ ]*?%})
+            | {%[ ]*blocktranslate\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*endblocktranslate[ ]*%}
+            | {%[ ]*blocktrans\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*endblocktrans[ ]*%}
+            | {%[ ]*comment\b(?:(?!%}).)*?%}(?:(?!djlint:(?:off|on)).)*?(?={%[ ]*endcomment[ ]*%})
             | ^---[\s\S]+?---
         """
 
@@ -904,15 +995,15 @@ class Config:
         )
 
         self.ignored_trans_blocks: str = r"""
-              {%[ ]*?blocktranslate?\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*?endblocktranslate?[ ]*?%}
-            | {%[ ]*?blocktrans\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*?endblocktrans[ ]*?%}
+              {%[ ]*blocktranslate?\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*endblocktranslate?[ ]*%}
+            | {%[ ]*blocktrans\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*endblocktrans[ ]*%}
         """
         self.trans_trimmed_blocks: str = r"""
-              {%[ ]*?blocktranslate\b(?:(?!%}).)*?\btrimmed\b(?:(?!%}).)*?%}.*?{%[ ]*?endblocktranslate[ ]*?%}
-            | {%[ ]*?blocktrans\b(?:(?!%}).)*?\btrimmed\b(?:(?!%}).)*?%}.*?{%[ ]*?endblocktrans[ ]*?%}
+              {%[ ]*blocktranslate\b(?:(?!%}).)*?\btrimmed\b(?:(?!%}).)*?%}.*?{%[ ]*endblocktranslate[ ]*%}
+            | {%[ ]*blocktrans\b(?:(?!%}).)*?\btrimmed\b(?:(?!%}).)*?%}.*?{%[ ]*endblocktrans[ ]*%}
         """
         self.ignored_trans_blocks_closing: str = r"""
-         {%[ ]*?endblocktrans(?:late)?(?:(?!%}).)*?%}
+         {%[ ]*endblocktrans(?:late)?(?:(?!%}).)*?%}
         """
 
         self.ignored_inline_blocks: str = r"""
@@ -922,8 +1013,8 @@ class Config:
             | {\*.*?\*}
             | {\#(?!.*djlint:[ ]*?(?:off|on)\b).*\#}
             | <\?php.*?\?>
-            | {%[ ]*?comment\b(?:(?!%}).)*?%}(?:(?!djlint:(?:off|on)).)*?{%[ ]*?endcomment[ ]*?%}
-            | {%[ ]*?blocktrans(?:late)?\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*?endblocktrans(?:late)?[ ]*?%}
+            | {%[ ]*comment\b(?:(?!%}).)*?%}(?:(?!djlint:(?:off|on)).)*?{%[ ]*endcomment[ ]*%}
+            | {%[ ]*blocktrans(?:late)?\b(?:(?!%}|\btrimmed\b).)*?%}.*?{%[ ]*endblocktrans(?:late)?[ ]*%}
         """
 
         self.optional_single_line_html_tags: str = r"""
@@ -1071,3 +1162,133 @@ class Config:
               )
         """
         )
+
+    @cached_property
+    def gitignore(self) -> PathSpec:
+        """Gitignore patterns of the project, loaded when first used."""
+        return load_gitignore(self.project_root)
+
+    @cached_property
+    def patterns(self) -> Patterns:
+        """Compiled patterns of the settings, built when first used."""
+        from .patterns import Patterns
+
+        return Patterns(self)
+
+    @cached_property
+    def rule_plan(self) -> RulePlan:
+        """Compiled linter rules of the settings, built when first used."""
+        from .lint import build_rule_plan
+
+        return build_rule_plan(self)
+
+    @cached_property
+    def line_classifier(self) -> LineClassifier:
+        """Classifier of the lines to indent, built when first used."""
+        from .lines import LineClassifier
+
+        return LineClassifier(self)
+
+    # object only has a __getstate__ from python 3.11.
+    def __getstate__(  # type: ignore[explicit-override, unused-ignore]
+        self,
+    ) -> dict[str, Any]:
+        # workers compile their own patterns and rules.
+        state = self.__dict__.copy()
+        state.pop("patterns", None)
+        state.pop("rule_plan", None)
+        state.pop("line_classifier", None)
+        return state
+
+    def __copy__(self) -> Config:
+        # copies in the same process share the compiled patterns and rules.
+        copied = object.__new__(type(self))
+        copied.__dict__.update(self.__dict__)
+        return copied
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Hash of every setting that can change lint or format results.
+
+        Used to key the result cache, so it also covers the djLint version,
+        its own source and the source of any python_module rules.
+        """
+        settings = {
+            key: value
+            for key, value in vars(self).items()
+            if key not in _FINGERPRINT_EXCLUDES
+        }
+        digest = hashlib.sha256(
+            json.dumps(
+                settings, sort_keys=True, default=_fingerprint_default
+            ).encode("utf-8")
+        )
+        digest.update(metadata.version("djlint").encode("utf-8"))
+        digest.update(_source_digest())
+
+        for rule in self.linter_rules:
+            module = rule["rule"].get("python_module")
+            if not module:
+                continue
+            try:
+                spec = importlib.util.find_spec(module)
+            except ImportError:
+                spec = None
+            if spec and spec.origin and Path(spec.origin).is_file():
+                digest.update(Path(spec.origin).read_bytes())
+
+        return digest.hexdigest()
+
+
+# settings that do not change the result of linting or formatting a file.
+# results cut short by a time budget are not cached.
+_FINGERPRINT_EXCLUDES = frozenset({
+    "cache",
+    "cache_dir",
+    "changed_since",
+    "exclude",
+    "extension",
+    "file_timeout",
+    "files",
+    "fingerprint",
+    "gitignore",
+    "jobs",
+    "line_classifier",
+    "linter_output_format",
+    "max_cache_size",
+    "patterns",
+    "profile_rules",
+    "profile_rules_json",
+    "project_root",
+    "quiet",
+    "require_pragma",
+    "rule_plan",
+    "rule_timeout",
+    "staged",
+    "statistics",
+    "stdin",
+    "stream",
+    "timings",
+    "use_gitignore",
+    "warn",
+})
+
+
+def _fingerprint_default(value: object) -> Any:
+    """Make the remaining config values json serializable."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, Path):
+        return value.as_posix()
+    return repr(value)
+
+
+@cache
+def _source_digest() -> bytes:
+    """Hash the source of djLint, which changes without a version bump."""
+    digest = hashlib.sha256()
+    package = Path(__file__).parent
+    for path in sorted(chain(package.rglob("*.py"), package.rglob("*.yaml"))):
+        digest.update(path.relative_to(package).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.digest()
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import click
 import regex as re
 from click import echo
 from colorama import Fore
@@ -19,37 +20,20 @@ def get_src(src: Iterable[Path], config: Config) -> list[Path]:
     """Get source files."""
     paths = []
     for item in src:
-        # normalize path
-
-        normalized_item = item.resolve()
+        normalized_item = source_path(item)
 
         if (
             normalized_item.is_file()
             and no_pragma(config, normalized_item)
-            and (
-                (
-                    config.use_gitignore
-                    and not config.gitignore.match_file(normalized_item)
-                )
-                or not config.use_gitignore
-            )
+            and not_gitignored(config, normalized_item)
         ):
             paths.append(normalized_item)
             continue
 
-        # remove leading . from extension
-        extension = str(config.extension)
-        extension = extension.removeprefix(".")
-
         paths.extend(
             x
-            for x in normalized_item.glob(f"**/*.{extension}")
-            if not re.search(config.exclude, x.as_posix(), flags=re.VERBOSE)
-            and no_pragma(config, x)
-            and (
-                (config.use_gitignore and not config.gitignore.match_file(x))
-                or not config.use_gitignore
-            )
+            for x in normalized_item.glob(f"**/*.{extension(config)}")
+            if is_source_file(config, x)
         )
 
     if not paths:
@@ -58,6 +42,95 @@ def get_src(src: Iterable[Path], config: Config) -> list[Path]:
     return paths
 
 
+def get_changed_src(src: Iterable[Path], config: Config) -> list[Path]:
+    """Get the source files git reports as changed.
+
+    Only files inside the source paths that pass the same extension,
+    exclude, gitignore and pragma checks as a tree walk are returned.
+    """
+    roots = [source_path(x) for x in src]
+    root = config.project_root.resolve()
+
+    diff = ["diff", "-z", "--name-only", "--diff-filter=d", "--relative"]
+    if config.staged:
+        diff.append("--cached")
+    if config.changed_since:
+        diff.extend(("--end-of-options", config.changed_since))
+
+    changed = git_files(root, *diff)
+    if not config.staged:
+        # new files are not in the diff until they are added.
+        changed += git_files(
+            root, "ls-files", "-z", "--others", "--exclude-standard"
+        )
+
+    paths = []
+    for name in dict.fromkeys(changed):
+        this_file = root / name
+        if (
+            any(x == this_file or x in this_file.parents for x in roots)
+            and this_file.match(f"*.{extension(config)}")
+            and this_file.is_file()
+            and is_source_file(config, this_file)
+        ):
+            paths.append(this_file)
+
+    if not paths:
+        echo(Fore.BLUE + "No files to check! 😢")
+
+    return paths
+
+
+def git_files(cwd: Path, *args: str) -> list[str]:
+    """Run a git command that lists files separated by nul."""
+    import subprocess
+
+    try:
+        result = subprocess.run(  # noqa: S603
+            ("git", *args),
+            cwd=cwd,
+            capture_output=True,
+            check=True,
+            encoding="utf-8",
+        )
+    except FileNotFoundError as error:
+        msg = "git was not found, it is needed to find the changed files."
+        raise click.ClickException(msg) from error
+    except subprocess.CalledProcessError as error:
+        raise click.ClickException(error.stderr.strip()) from error
+
+    return [x for x in result.stdout.split("\0") if x]
+
+
+def extension(config: Config) -> str:
+    """Get the extension of source files, without a leading dot."""
+    return str(config.extension).removeprefix(".")
+
+
+def source_path(item: Path) -> Path:
+    """Normalize a source path, so every run prints and caches it the same."""
+    return item.resolve()
+
+
+def is_source_file(config: Config, this_file: Path) -> bool:
+    """Check a file found in a source directory against the settings."""
+    return is_included(config, this_file) and no_pragma(config, this_file)
+
+
+def is_included(config: Config, this_file: Path) -> bool:
+    """Check a file against the exclude and gitignore settings."""
+    return not re.search(
+        config.exclude, this_file.as_posix(), flags=re.VERBOSE
+    ) and not_gitignored(config, this_file)
+
+
+def not_gitignored(config: Config, this_file: Path) -> bool:
+    """Verify the file is not gitignored, if gitignore is used."""
+    return not config.use_gitignore or not config.gitignore.match_file(
+        this_file
+    )
+
+
 html_patterns = (r"<!--\s*djlint\:on\s*-->",)
 django_jinja_patterns = (
     r"\{#\s*djlint\:on\s*#\}",
@@ -74,24 +147,32 @@ def no_pragma(config: Config, this_file: Path) -> bool:
         return True
 
     with this_file.open(encoding="utf-8") as open_file:
-        first_line = open_file.readline()
-
-        pragma_patterns = {
-            "html": html_patterns,
-            "django": django_jinja_patterns + html_patterns,
-            "jinja": django_jinja_patterns + html_patterns,
-            "nunjucks": nunjucks_patterns + html_patterns,
-            "handlebars": handlebars_patterns + html_patterns,
-            "golang": golang_patterns + html_patterns,
-            "angular": html_patterns,
-            "all": django_jinja_patterns
-            + nunjucks_patterns
-            + handlebars_patterns
-            + golang_patterns
-            + html_patterns,
-        }
-
-        return any(
-            re.match(pattern, first_line)
-            for pattern in pragma_patterns[config.profile]
-        )
+        return has_pragma(config, open_file.readline())
+
+
+def has_pragma(config: Config, text: str) -> bool:
+    """Check the first line of a template for the pragma, if it is required."""
+    if not config.require_pragma:
+        return True
+
+    first_line = text.partition("\n")[0]
+
+    pragma_patterns = {
+        "html": html_patterns,
+        "django": django_jinja_patterns + html_patterns,
+        "jinja": django_jinja_patterns + html_patterns,
+        "nunjucks": nunjucks_patterns + html_patterns,
+        "handlebars": handlebars_patterns + html_patterns,
+        "golang": golang_patterns + html_patterns,
+        "angular": html_patterns,
+        "all": django_jinja_patterns
+        + nunjucks_patterns
+        + handlebars_patterns
+        + golang_patterns
+        + html_patterns,
+    }
+
+    return any(
+        re.match(pattern, first_line)
+        for pattern in pragma_patterns[config.profile]
+    )
@@ -0,0 +1,193 @@
+"""Watch templates and check them again when they change.
+
+The tree is walked once. After that, each poll lists only the directories
+whose mtime changed and hashes only the files whose mtime or size changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import regex as re
+from click import echo
+from colorama import Fore
+
+from . import process, run
+from .cache import ResultCache
+from .output import ResultPrinter, build_quantity
+from .src import extension, is_included, no_pragma, source_path
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from .settings import Config
+
+# seconds between polls of the tree.
+POLL_INTERVAL = 0.5
+
+
+class Watcher:
+    """Poll a template tree for changed files."""
+
+    def __init__(self, config: Config, src: Iterable[Path]) -> None:
+        self.config = config
+        self.pattern = f"*.{extension(config)}"
+        # directory mtimes, to only list directories with added or removed
+        # entries.
+        self.directories: dict[Path, int] = {}
+        # file mtime and size, and the hash of the last checked content.
+        self.files: dict[Path, tuple[int, int]] = {}
+        self.hashes: dict[Path, str] = {}
+
+        for item in src:
+            path = source_path(item)
+            if path.is_dir():
+                self.list_directory(path)
+            elif path.is_file():
+                self.files[path] = (-1, -1)
+
+        # files found by the first walk are not changes.
+        self.files = {x: stat_file(x) for x in self.files}
+
+    def is_excluded(self, directory: Path) -> bool:
+        """Check if all files below a directory are excluded."""
+        return bool(
+            re.search(
+                self.config.exclude,
+                directory.as_posix() + "/",
+                flags=re.VERBOSE,
+            )
+        )
+
+    def list_directory(self, directory: Path) -> None:
+        """List a directory and track its new files and directories."""
+        try:
+            self.directories[directory] = directory.stat().st_mtime_ns
+            entries = list(os.scandir(directory))
+        except OSError:
+            self.directories.pop(directory, None)
+            return
+
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                if path not in self.directories and not self.is_excluded(path):
+                    self.list_directory(path)
+            elif (
+                path not in self.files
+                and path.match(self.pattern)
+                and is_included(self.config, path)
+            ):
+                # new files are seen as changed. The pragma is checked when
+                # a file changes, as it can be added later.
+                self.files[path] = (-1, -1)
+
+    def poll(self) -> list[Path]:
+        """Get the files whose content changed since the last poll."""
+        for directory, mtime in list(self.directories.items()):
+            if modified_time(directory) != mtime:
+                self.list_directory(directory)
+
+        changed = []
+        for path, stat in list(self.files.items()):
+            new_stat = stat_file(path)
+            if new_stat == stat:
+                continue
+
+            if new_stat[0] == -1:
+                # the file was removed.
+                del self.files[path]
+                self.hashes.pop(path, None)
+                continue
+
+            self.files[path] = new_stat
+            digest = hash_file(path)
+            if digest != self.hashes.get(path):
+                self.hashes[path] = digest
+                changed.append(path)
+
+        return sorted(changed)
+
+    def update(self, paths: Iterable[Path]) -> None:
+        """Record the state of files after djLint rewrote them."""
+        for path in paths:
+            self.files[path] = stat_file(path)
+            self.hashes[path] = hash_file(path)
+
+
+def modified_time(path: Path) -> int:
+    """Get the modification time of a path, -1 if it is missing."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+def stat_file(path: Path) -> tuple[int, int]:
+    """Get the modification time and size of a file."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return (-1, -1)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def hash_file(path: Path) -> str:
+    """Hash the content of a file."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def check_files(config: Config, paths: Sequence[Path]) -> None:
+    """Lint and format changed files and print the results."""
+    printer = ResultPrinter(config)
+    printer.start()
+    checked = 0
+    for this_file in paths:
+        if no_pragma(config, this_file):
+            printer.add(process(config, this_file))
+            checked += 1
+    printer.finish(checked)
+
+    if config.cache:
+        ResultCache(config).prune()
+
+
+def watch(
+    config: Config,
+    src: Sequence[str],
+    *,
+    interval: float = POLL_INTERVAL,
+    polls: int | None = None,
+) -> None:
+    """Check the sources, then check changed files until interrupted.
+
+    ``polls`` limits the number of polls, it is used by the tests.
+    """
+    run(config, src)
+
+    watcher = Watcher(config, (Path(x) for x in src))
+    echo(
+        f"{Fore.BLUE}Watching {build_quantity(len(watcher.files))} for changes."
+        " Press Ctrl+C to stop."
+    )
+
+    try:
+        while polls is None or polls > 0:
+            if polls is not None:
+                polls -= 1
+            time.sleep(interval)
+
+            changed = watcher.poll()
+            if changed:
+                check_files(config, changed)
+                # reformatting rewrites the files, that is not a new change.
+                watcher.update(changed)
+    except KeyboardInterrupt:
+        pass
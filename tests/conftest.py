@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import difflib
+import functools
 import shutil
 import tempfile
 from pathlib import Path
@@ -26,6 +27,19 @@ if TYPE_CHECKING:
     from djlint.lint import LintError
 
 
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run without the result cache, so no test passes on a stale result."""
+    init = Config.__init__
+
+    @functools.wraps(init)
+    def config_init(self: Config, *args: Any, **kwargs: Any) -> None:
+        init(self, *args, **kwargs)
+        self.cache = False
+
+    monkeypatch.setattr(Config, "__init__", config_init)
+
+
 @pytest.fixture
 def runner() -> CliRunner:
     """Click runner for djlint tests."""
@@ -0,0 +1,65 @@
+"""Benchmark the stages of the formatter on the test templates.
+
+condense_html used to backtrack over the indent after every opening tag,
+and expand_html looked for the template blocks again for every tag. The
+stages also hashed the whole document to look up its ignored blocks for
+every match.
+
+uv run pytest tests/test_benchmarks/test_formatter_stages.py -m benchmark -n 0 -s
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from djlint.formatter.compress import compress_html
+from djlint.formatter.condense import clean_whitespace, condense_html
+from djlint.formatter.expand import expand_html
+from djlint.formatter.indent import indent_html
+from djlint.settings import Config
+
+pytestmark = pytest.mark.benchmark
+
+STAGES = (compress_html, expand_html, clean_whitespace, indent_html)
+
+
+def _document(size: int) -> str:
+    templates = "\n".join(
+        x.read_text(encoding="utf-8")
+        for x in sorted(Path("tests").rglob("*.html"))
+    )
+    html = (templates * (size // len(templates) + 1))[:size]
+    return "\n".join(html.splitlines())
+
+
+def _stage_times(config: Config, html: str) -> dict[str, float]:
+    times = {}
+    for stage in STAGES:
+        start = time.perf_counter()
+        html = stage(html, config)
+        times[stage.__name__] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    condense_html(html, config)
+    times[condense_html.__name__] = time.perf_counter() - start
+    return times
+
+
+def test_formatter_stages() -> None:
+    config = Config("-", profile="django")
+    small = _stage_times(config, _document(10_000))
+    large = _stage_times(config, _document(20_000))
+
+    print()
+    for name, seconds in large.items():
+        print(
+            f"{name}: {small[name]:.3f}s for 10K characters,"
+            f" {seconds:.3f}s for 20K characters"
+        )
+
+    # twice the characters, about twice the time.
+    for name in ("compress_html", "condense_html"):
+        assert large[name] < 4 * small[name] + 0.05, name
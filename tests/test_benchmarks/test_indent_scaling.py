@@ -0,0 +1,55 @@
+"""Benchmark indent_html on growing templates.
+
+The indented lines used to be added to one string, and every tag spacing,
+set and function match hashed the whole document to find the ignored
+blocks. The lines are now joined once, and the ignored blocks are found
+once for each version of the document.
+
+uv run pytest tests/test_benchmarks/test_indent_scaling.py -m benchmark -n 0 -s
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from djlint.formatter.indent import indent_html
+from djlint.settings import Config
+
+pytestmark = pytest.mark.benchmark
+
+BLOCK = """<table class="row">
+<tr>
+<td style="padding: 0">
+{% if user %}
+<a href="{{ url }}" class="button">{{user.name}}</a>
+{% endif %}
+</td>
+</tr>
+</table>
+<p>Thanks</p>
+"""
+
+LINE_COUNTS = (1_000, 10_000, 100_000)
+
+
+def test_indent_scaling() -> None:
+    config = Config("-", profile="django")
+    block_lines = BLOCK.count("\n")
+
+    times = []
+    for lines in LINE_COUNTS:
+        html = BLOCK * (lines // block_lines)
+        start = time.perf_counter()
+        indent_html(html, config)
+        times.append(time.perf_counter() - start)
+
+    print()
+    for lines, seconds in zip(LINE_COUNTS, times):
+        print(
+            f"{lines} lines: {seconds:.3f}s, {seconds / lines * 1e6:.1f}µs/line"
+        )
+
+    # ten times the lines in well under a hundred times the time.
+    assert times[2] < 30 * times[1]
@@ -0,0 +1,55 @@
+"""Benchmark classifying the lines to indent.
+
+Every line used to be searched with each of the line patterns. The
+classifier scans a line once for the literals the patterns need, and
+only searches with the patterns whose literals it found. Lines that
+were seen before are taken from the line cache.
+
+uv run pytest tests/test_benchmarks/test_line_classifier.py -m benchmark -n 0 -s
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from djlint.settings import Config
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_line_classifier() -> None:
+    classifier = Config("-", profile="all").line_classifier
+    lines = [
+        line
+        for template in sorted(Path("tests").rglob("*.html"))
+        for line in template.read_text(encoding="utf-8").splitlines()
+    ] * 100
+
+    start = time.perf_counter()
+    for item in lines:
+        for check in classifier.checks:
+            check.test(item)
+    every_time = time.perf_counter() - start
+
+    classify = classifier.cached_classify.__wrapped__
+    start = time.perf_counter()
+    for item in lines:
+        classify(item)
+    classify_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for item in lines:
+        classifier.classify(item)
+    cached_time = time.perf_counter() - start
+
+    print(
+        f"\n{len(lines)} lines: every pattern"
+        f" {every_time / len(lines) * 1e6:.1f}µs/line,"
+        f" classifier {classify_time / len(lines) * 1e6:.1f}µs/line,"
+        f" with the line cache {cached_time / len(lines) * 1e6:.1f}µs/line"
+        f" ({classifier.cached_classify.cache_info().hits} hits)"
+    )
+    assert cached_time < classify_time < every_time
@@ -0,0 +1,64 @@
+"""Benchmark the pattern scans the linter runs per document.
+
+Rules that share a pattern, like the django and jinja variants of a
+rule, scan the document once and report a match to each rule. That only
+saves the few scans of identical patterns, the time is about the same.
+
+Rules are not combined further. Joining the patterns of a flag set into
+one alternation with named groups was measured, and with the regex
+module it is slower than separate scans: each separate pattern jumps
+between candidates with a fast literal search, an alternation tries
+every branch at every position. An alternation would also only report
+one rule where the matches of several rules overlap, and patterns with
+backreferences cannot be joined.
+
+uv run pytest tests/test_benchmarks/test_lint_scans.py -m benchmark -n 0 -s
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from djlint.settings import Config
+
+pytestmark = pytest.mark.benchmark
+
+DOCUMENT_SIZE = 200_000
+
+
+def _document() -> str:
+    templates = "\n".join(
+        x.read_text(encoding="utf-8")
+        for x in sorted(Path("tests").rglob("*.html"))
+    )
+    return (templates * (DOCUMENT_SIZE // len(templates) + 1))[:DOCUMENT_SIZE]
+
+
+def test_lint_scans() -> None:
+    config = Config("-", profile="all")
+    plan = config.rule_plan
+    html = _document()
+
+    rule_patterns = [x for rule in plan.rules for x in rule.patterns]
+    assert len(plan.scans) <= len(rule_patterns)
+
+    start = time.perf_counter()
+    for pattern in rule_patterns:
+        for _ in pattern.finditer(html):
+            pass
+    per_rule_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for scan in plan.scans:
+        for _ in scan.pattern.finditer(html):
+            pass
+    scan_time = time.perf_counter() - start
+
+    print(
+        f"\n{len(html) // 1000} KB document:"
+        f" {len(rule_patterns)} scans per rule in {per_rule_time:.3f}s,"
+        f" {len(plan.scans)} shared scans in {scan_time:.3f}s"
+    )
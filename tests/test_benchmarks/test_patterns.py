@@ -0,0 +1,96 @@
+"""Count the patterns the formatter gives to the regex module.
+
+The helpers and formatter stages used to pass pattern strings and flags
+to the regex module on every line, paying a cache lookup each time and a
+recompile once the cache overflowed. Config.patterns compiles them once,
+so later files only give the module the few patterns built per match.
+
+uv run pytest tests/test_benchmarks/test_patterns.py -s
+"""
+
+from __future__ import annotations
+
+import importlib
+import pickle  # noqa: S403
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import regex
+
+from djlint.reformat import formatter
+from djlint.settings import Config
+
+if TYPE_CHECKING:
+    import pytest
+    from typing_extensions import Any
+
+FILE_COUNT = 200
+
+TEMPLATE = """{% extends "base.html" %}
+{% load static %}
+{% block content %}
+<div class="container"><div class="row">
+{% for item in items %}<div class="col" id="item-{{ item.id }}" data-name="{{ item.name }}" data-value="{{ item.value|default:'none' }}">
+<a href="{% url 'detail' item.id %}"><span>{{ item.name }}</span></a>
+{% if item.active %}<strong>active</strong>{% else %}<em>inactive</em>{% endif %}
+</div>{% endfor %}
+</div></div>
+<pre>   keep
+   this</pre>
+<script>var a = {b: 1};</script>
+{% endblock %}
+"""
+
+
+def test_patterns_formatter(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = Config("-", profile="django")
+
+    # every pattern given to the regex module goes through _compile, which
+    # looks up or fills the regex cache.
+    compiles: Counter[str] = Counter()
+    regex_main = importlib.import_module("regex._main")
+    compile_pattern = regex_main._compile  # noqa: SLF001
+
+    def count_compile(pattern: object, *args: Any, **kwargs: Any) -> Any:
+        if isinstance(pattern, str):
+            compiles[pattern] += 1
+        return compile_pattern(pattern, *args, **kwargs)
+
+    monkeypatch.setattr("regex._main._compile", count_compile)
+
+    # the first file compiles the patterns it uses.
+    formatted = formatter(config, TEMPLATE)
+    first_file = sum(compiles.values())
+    patterns = config.patterns
+    registry = {
+        x.pattern
+        for x in vars(patterns).values()
+        if isinstance(x, regex.Pattern)
+    }
+
+    compiles.clear()
+    for _ in range(FILE_COUNT):
+        assert formatter(config, TEMPLATE) == formatted
+    per_file = sum(compiles.values()) / FILE_COUNT
+
+    # the registry is built once per config, and its patterns are not
+    # given to the regex module as strings again.
+    assert config.patterns is patterns
+    assert registry
+    assert not registry & set(compiles)
+    assert per_file * 5 < first_file
+
+    print(
+        f"\n{first_file} patterns for the first file,"
+        f" then {per_file:.1f} per file over {FILE_COUNT} files"
+    )
+
+
+def test_patterns_not_pickled() -> None:
+    config = Config("-", profile="django")
+    formatted = formatter(config, TEMPLATE)
+
+    copied = pickle.loads(pickle.dumps(config))  # noqa: S301
+    assert "patterns" not in vars(copied)
+    assert copied.fingerprint == config.fingerprint
+    assert formatter(copied, TEMPLATE) == formatted
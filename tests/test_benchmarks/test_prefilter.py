@@ -0,0 +1,53 @@
+"""Benchmark skipping the linter rules whose literals are not in a file.
+
+Each literal is searched for once per file with a substring search, which
+is much cheaper than a scan with the pattern of the rule.
+
+uv run pytest tests/test_benchmarks/test_prefilter.py -s
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from djlint.lint import RulePlan, Scan, linter
+from djlint.literals import DocumentLiterals
+from djlint.settings import Config
+
+
+def test_prefilter() -> None:
+    config = Config("-", profile="all")
+    plan = config.rule_plan
+    full_config = Config("-", profile="all")
+    full_config.__dict__["rule_plan"] = RulePlan(
+        plan.rules,
+        tuple(Scan(x.pattern, x.rules, None) for x in plan.scans),
+        plan.per_file_ignores,
+    )
+    templates = [
+        x.read_text(encoding="utf-8")
+        for x in sorted(Path("tests").rglob("*.html"))
+    ]
+
+    skipped = 0
+    for html in templates:
+        document = DocumentLiterals(html)
+        skipped += sum(document.misses(x.literals) for x in plan.scans)
+
+    start = time.perf_counter()
+    for html in templates:
+        linter(full_config, html, "-", "-")
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for html in templates:
+        linter(config, html, "-", "-")
+    prefilter_time = time.perf_counter() - start
+
+    print(
+        f"\n{len(templates)} templates: every scan in {full_time:.3f}s,"
+        f" {skipped} of {len(plan.scans) * len(templates)} scans skipped"
+        f" in {prefilter_time:.3f}s"
+    )
+    assert skipped
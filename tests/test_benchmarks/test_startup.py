@@ -0,0 +1,90 @@
+"""Benchmark the cold start of djlint.
+
+Formatter, pool and progress bar dependencies are imported when they are
+used, so --version, stdin and lint runs do not pay for them.
+
+uv run pytest tests/test_benchmarks/test_startup.py -m benchmark -n 0 -s
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+# modules that must not be imported by ``import djlint``.
+HEAVY_MODULES = (
+    "concurrent.futures.process",
+    "cssbeautifier",
+    "djlint.reformat",
+    "djlint.settings",
+    "jsbeautifier",
+    "json5",
+    "pathspec",
+    "tqdm",
+    "yaml",
+)
+
+# cumulative import time of djlint in microseconds. A typical cold import
+# takes about half of this, importing everything eagerly took more.
+IMPORT_BUDGET = 150_000
+
+
+def _loaded_modules(script: str, stdin: str = "") -> list[str]:
+    """Run a script in a fresh interpreter, get the heavy modules it loaded."""
+    result = subprocess.run(  # noqa: S603
+        (
+            sys.executable,
+            "-c",
+            script + "\nprint(sorted(set(sys.modules) & set(HEAVY_MODULES)),"
+            " file=sys.stderr)",
+        ),
+        input=stdin,
+        capture_output=True,
+        check=False,
+        encoding="utf-8",
+    )
+    return result.stderr.strip().splitlines()[-1:]
+
+
+def test_lazy_imports() -> None:
+    prefix = f"import sys\nHEAVY_MODULES = {HEAVY_MODULES!r}\n"
+
+    assert _loaded_modules(prefix + "import djlint") == ["[]"]
+
+    # linting stdin needs the settings and rules, but no formatter.
+    lint = (
+        "from djlint import main\n"
+        "try:\n"
+        "    main(['-', '--lint'], standalone_mode=False)\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+    assert _loaded_modules(prefix + lint, "<p>text</p>") == [
+        "['djlint.settings', 'yaml']"
+    ]
+
+
+def _import_time() -> int:
+    result = subprocess.run(  # noqa: S603
+        (sys.executable, "-X", "importtime", "-c", "import djlint"),
+        capture_output=True,
+        check=True,
+        encoding="utf-8",
+    )
+    line = next(
+        x
+        for x in reversed(result.stderr.splitlines())
+        if x.endswith("| djlint")
+    )
+    return int(line.split("|")[1])
+
+
+@pytest.mark.benchmark
+def test_import_time() -> None:
+    best = min(_import_time() for _ in range(3))
+    print(
+        f"\nimport djlint: {best / 1000:.1f}ms, budget {IMPORT_BUDGET / 1000:.0f}ms"
+    )
+    assert best < IMPORT_BUDGET
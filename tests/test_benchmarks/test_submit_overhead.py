@@ -0,0 +1,81 @@
+"""Benchmark the cost of submitting files to the process pool.
+
+Every task used to pickle the whole Config. With the pool initializer,
+the Config is sent to each worker once, and small files are batched so
+each task only carries a chunk of paths.
+
+uv run pytest tests/test_benchmarks/test_submit_overhead.py -m benchmark -n 0 -s
+"""
+
+from __future__ import annotations
+
+import pickle  # noqa: S403
+import time
+from pathlib import Path
+
+import pytest
+
+from djlint import (
+    build_chunks,
+    init_worker,
+    process,
+    process_paths,
+    worker_config,
+)
+from djlint.settings import Config
+
+FILE_COUNT = 10_000
+
+
+def _submit_cost(tasks: list[tuple[object, ...]]) -> tuple[int, float]:
+    """Size and time of sending tasks to a worker and loading them there."""
+    start = time.perf_counter()
+    size = 0
+    for task in tasks:
+        payload = pickle.dumps(task)
+        size += len(payload)
+        pickle.loads(payload)  # noqa: S301
+    return size, time.perf_counter() - start
+
+
+@pytest.mark.benchmark
+def test_submit_overhead() -> None:
+    config = Config("tests/test_djlint/bad.html")
+    paths = [Path(f"templates/{i}.html") for i in range(FILE_COUNT)]
+
+    before_size, before_time = _submit_cost([
+        (process, config, path) for path in paths
+    ])
+    chunks = build_chunks(paths, 4)
+    after_size, after_time = _submit_cost([
+        (process_paths, chunk) for chunk in chunks
+    ])
+    # the config still travels once per worker.
+    init_size, init_time = _submit_cost([(init_worker, config)])
+    after_size += init_size
+    after_time += init_time
+
+    print(
+        f"\n{FILE_COUNT} files, per-file config: {before_size / 1024:.0f} KiB"
+        f" in {before_time:.3f}s"
+        f"\n{FILE_COUNT} files, initializer and {len(chunks)} chunks:"
+        f" {after_size / 1024:.0f} KiB in {after_time:.3f}s"
+    )
+
+    assert after_size * 10 < before_size
+    assert after_time < before_time
+
+
+def test_process_paths() -> None:
+    config = Config("tests/test_djlint/bad.html", lint=True, no_cache=True)
+    paths = [
+        Path("tests/test_djlint/bad.html"),
+        Path("tests/test_djlint/-.html"),
+    ]
+    init_worker(config)
+    try:
+        result = process_paths(paths)
+    finally:
+        worker_config.clear()
+
+    assert result == [process(config, x) for x in paths]
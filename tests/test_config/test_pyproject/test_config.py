@@ -29,6 +29,7 @@ def test_profile() -> None:
     assert config.ignore_case is True
     assert config.include == "H014,H015"
     assert config.indent == 3 * " "
+    assert config.jobs == 2
     assert (
         config.linter_output_format
         == "{code} {message} {match} {filename}:{line}"
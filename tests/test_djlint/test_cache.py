@@ -0,0 +1,122 @@
+"""Djlint result cache tests.
+
+run::
+
+    pytest tests/test_djlint/test_cache.py
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+import djlint
+import djlint.reformat
+from djlint import main as djlint_main
+from djlint.settings import Config
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from click.testing import CliRunner
+
+
+@pytest.fixture(autouse=True)
+def no_cache() -> None:
+    """These tests use the result cache."""
+
+
+def _raise(*_: object) -> None:
+    msg = "cache was not used"
+    raise AssertionError(msg)
+
+
+def _report(output: str) -> list[str]:
+    """Get the lint lines and summary, without the timed progress bar."""
+    return [x for x in output.splitlines() if "Linting" not in x]
+
+
+def test_lint_cache(
+    runner: CliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+    template = tmp_path / "a.html"
+    template.write_text("<div class=test></div>", encoding="utf-8")
+
+    result = runner.invoke(djlint_main, (str(template),))
+    assert result.exit_code == 1
+    assert "H011 1:" in result.output
+    assert len(tuple((tmp_path / ".djlint_cache").glob("*.json"))) == 1
+
+    # unchanged files are served from the cache
+    monkeypatch.setattr(djlint, "lint_file", _raise)
+    cached = runner.invoke(djlint_main, (str(template),))
+    assert cached.exit_code == 1
+    assert _report(cached.output) == _report(result.output)
+
+    # a changed file, or --no-cache, runs the linter again
+    template.write_text("<div class=other></div>", encoding="utf-8")
+    assert isinstance(
+        runner.invoke(djlint_main, (str(template),)).exception, AssertionError
+    )
+    assert isinstance(
+        runner.invoke(djlint_main, (str(template), "--no-cache")).exception,
+        AssertionError,
+    )
+
+
+def test_reformat_cache(
+    runner: CliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+    template = tmp_path / "a.html"
+    template.write_text("<div><p>nice stuff here</p></div>", encoding="utf-8")
+
+    result = runner.invoke(djlint_main, (str(template), "--reformat"))
+    assert result.exit_code == 1
+    formatted = template.read_text(encoding="utf-8")
+    assert formatted == "<div>\n    <p>nice stuff here</p>\n</div>\n"
+
+    # replaying the cache entry rewrites the file
+    template.write_text("<div><p>nice stuff here</p></div>", encoding="utf-8")
+    monkeypatch.setattr(djlint.reformat, "reformat_file", _raise)
+    cached = runner.invoke(djlint_main, (str(template), "--reformat"))
+    assert cached.exit_code == 1
+    assert "1 file was updated." in cached.output
+    assert template.read_text(encoding="utf-8") == formatted
+
+
+def test_cache_size(runner: CliRunner, tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.djlint]\nmax_cache_size=0\ncache_dir='cache'\n", encoding="utf-8"
+    )
+    template = tmp_path / "a.html"
+    template.write_text("<p>text</p>", encoding="utf-8")
+
+    result = runner.invoke(djlint_main, (str(template),))
+    assert result.exit_code == 0
+    assert (tmp_path / "cache").is_dir()
+    assert not tuple((tmp_path / "cache").glob("*.json"))
+
+
+def test_fingerprint(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+
+    # how files are scheduled does not change their results
+    assert (
+        Config(str(tmp_path)).fingerprint
+        == Config(str(tmp_path), jobs=2, stream=True).fingerprint
+    )
+    assert (
+        Config(str(tmp_path)).fingerprint
+        != Config(str(tmp_path), profile="django").fingerprint
+    )
+
+    # so does a change to djLint itself, without a new version.
+    fingerprint = Config(str(tmp_path)).fingerprint
+    monkeypatch.setattr(
+        "djlint.settings._source_digest", lambda: b"changed source"
+    )
+    assert Config(str(tmp_path)).fingerprint != fingerprint
@@ -0,0 +1,137 @@
+"""Djlint daemon tests.
+
+run::
+
+    pytest tests/test_djlint/test_daemon.py
+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from djlint import main as djlint
+
+if sys.platform != "win32":
+    from djlint import daemon
+    from djlint.daemon import ConfigStore, DaemonServer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from click.testing import CliRunner
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="the daemon uses Unix sockets"
+)
+
+
+def test_daemon(runner: CliRunner, tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+    template = tmp_path / "a.html"
+    template.write_text("<div class=test></div>", encoding="utf-8")
+    socket_path = tmp_path / "djlint.sock"
+    args = (str(template), "--no-cache", "--daemon-socket", str(socket_path))
+
+    local = runner.invoke(djlint, args)
+    assert local.exit_code == 1
+
+    with DaemonServer(socket_path) as server:
+        assert not socket_path.stat().st_mode & 0o077
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            result = runner.invoke(djlint, (*args, "--use-daemon"))
+            assert result.exit_code == 1
+            assert "H011 1:0" in result.output
+            assert "Linted 1 file, found 1 error." in result.output
+
+            # the warm config is reused until a config file changes
+            assert len(server.configs.configs) == 1
+            runner.invoke(djlint, (*args, "--use-daemon"))
+            (tmp_path / "pyproject.toml").write_text(
+                "[tool.djlint]\nignore='H011'\n", encoding="utf-8"
+            )
+            result = runner.invoke(djlint, (*args, "--use-daemon"))
+            assert result.exit_code == 0
+
+            result = runner.invoke(
+                djlint,
+                (
+                    "-",
+                    "--reformat",
+                    "--use-daemon",
+                    "--daemon-socket",
+                    str(socket_path),
+                ),
+                input="<div><p>x</p></div>",
+            )
+            assert result.output == "<div>\n    <p>x</p>\n</div>\n"
+        finally:
+            server.shutdown()
+            thread.join()
+
+
+def test_daemon_fallback(runner: CliRunner, tmp_path: Path) -> None:
+    # without a daemon the client runs locally
+    result = runner.invoke(
+        djlint,
+        (
+            "-",
+            "--reformat",
+            "--use-daemon",
+            "--daemon-socket",
+            str(tmp_path / "missing.sock"),
+        ),
+        input="<div><p>x</p></div>",
+    )
+    assert result.exit_code == 0
+    assert result.output == "<div>\n    <p>x</p>\n</div>\n"
+
+
+def test_config_store(tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+    store = ConfigStore()
+    config = store.get(str(tmp_path), {"profile": "django"})
+    warm = store.get(str(tmp_path), {"profile": "django"})
+
+    # each run gets a copy that shares the compiled settings
+    assert warm is not config
+    for name in ("patterns", "rule_plan", "line_classifier"):
+        assert name in vars(warm)
+        assert getattr(warm, name) is getattr(config, name)
+
+
+def test_socket_owner(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    socket_path = tmp_path / "djlint.sock"
+    with DaemonServer(socket_path):
+        assert daemon.is_owned(socket_path)
+
+        # the client does not trust a socket of another user
+        other_user = os.getuid() + 1
+        monkeypatch.setattr("os.getuid", lambda: other_user)
+        assert daemon.request(socket_path, ["-"], {}, "<div></div>") is None
+
+
+def test_default_socket(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert daemon.default_socket() == tmp_path / "djlint.sock"
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setattr("tempfile.gettempdir", lambda: str(tmp_path))
+    socket_path = daemon.default_socket()
+    assert socket_path.parent.parent == tmp_path
+    assert socket_path.parent.name.startswith("djlint-")
+
+
+def test_missing_src(runner: CliRunner) -> None:
+    result = runner.invoke(djlint, ())
+    assert result.exit_code == 2
+    assert "Missing argument 'SRC ...'." in result.output
@@ -14,21 +14,33 @@ or::
 
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
+import tempfile
 from importlib import metadata
 from pathlib import Path
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
 
-from djlint import main as djlint
+import djlint as djlint_module
+from djlint import build_chunks, get_worker_count, main as djlint
+from djlint.output import ReorderBuffer
+from djlint.settings import Config
 from tests.conftest import write_to_file
 
 if TYPE_CHECKING:
     from tempfile import _TemporaryFileWrapper
 
+    import pytest
     from click.testing import CliRunner
 
 
+def _raise(*_: object) -> None:
+    msg = "stdin should stay in memory"
+    raise AssertionError(msg)
+
+
 def test_help(runner: CliRunner) -> None:
     result = runner.invoke(djlint, ("-h",))
     assert result.exit_code == 0
@@ -77,6 +89,101 @@ def test_multiple_files(runner: CliRunner) -> None:
     assert "3 files would be updated." in result.output
 
 
+def test_jobs(runner: CliRunner) -> None:
+    result = runner.invoke(
+        djlint,
+        (
+            "tests/test_djlint/multiple_files/a",
+            "tests/test_djlint/multiple_files/b",
+            "--check",
+            "--jobs",
+            "0",
+        ),
+    )
+    assert result.exit_code == 1
+    assert "3 files would be updated." in result.output
+
+    result = runner.invoke(
+        djlint, ("tests/test_djlint/multiple_files/a", "--jobs", "-1")
+    )
+    assert result.exit_code == 2
+
+
+def test_stream(runner: CliRunner) -> None:
+    result = runner.invoke(
+        djlint,
+        (
+            "tests/test_djlint/multiple_files/b",
+            "tests/test_djlint/multiple_files/a",
+            "--check",
+            "--lint",
+            "--stream",
+            "--statistics",
+        ),
+    )
+    assert result.exit_code == 1
+    assert "3 files would be updated." in result.output
+    assert "Linted 3 files, found 0 errors." in result.output
+    assert "Statistics" in result.output
+    positions = [
+        result.output.index(str(Path("multiple_files", *x)))
+        for x in (("a", "a.html"), ("b", "b1.html"), ("b", "b2.html"))
+    ]
+    assert positions == sorted(positions)
+
+
+def test_reorder_buffer() -> None:
+    printed: list[str] = []
+    printer = SimpleNamespace(add=lambda x: printed.append(x["name"]))
+    buffer = ReorderBuffer(printer, (Path("b"), Path("c"), Path("a")))  # type: ignore[arg-type]
+
+    buffer.add(Path("c"), {"name": "c"})  # type: ignore[typeddict-unknown-key]
+    buffer.add(Path("b"), {"name": "b"})  # type: ignore[typeddict-unknown-key]
+    assert not printed
+
+    buffer.add(Path("a"), {"name": "a"})  # type: ignore[typeddict-unknown-key]
+    assert printed == ["a", "b", "c"]
+    assert not buffer.pending
+
+
+def test_worker_count() -> None:
+    config = Config("tests/test_djlint/bad.html")
+    assert get_worker_count(config, 1) == 1
+    assert get_worker_count(config, 100) == min(os.cpu_count() or 1, 4)
+
+    config.jobs = 0
+    assert get_worker_count(config, 1000) == (os.cpu_count() or 1)
+
+    config.jobs = 16
+    assert get_worker_count(config, 3) == 3
+
+
+def test_build_chunks(tmp_path: Path) -> None:
+    small = []
+    for i in range(100):
+        small.append(tmp_path / f"{i}.html")
+        small[-1].write_text("<p></p>" * 100, encoding="utf-8")
+    large = tmp_path / "large.html"
+    large.write_text("<p></p>" * 100_000, encoding="utf-8")
+
+    # small files are batched, with a few chunks per worker.
+    assert 8 <= len(build_chunks(small, 2)) < 20
+
+    # the large file runs first and alone.
+    chunks = build_chunks([*small, large], 2)
+    assert chunks[0] == [large]
+    assert sorted(x for chunk in chunks for x in chunk) == sorted([
+        *small,
+        large,
+    ])
+
+    # streamed files are sent in the order they are printed.
+    chunks = build_chunks([large, *small], 2, in_order=True)
+    assert [x for chunk in chunks for x in chunk] == sorted(
+        [*small, large], key=str
+    )
+
+
 def test_bad_path(runner: CliRunner) -> None:
     result = runner.invoke(djlint, ("tests/nowhere",))
     assert result.exit_code == 2
@@ -135,6 +242,27 @@ def test_stdin(runner: CliRunner) -> None:
     assert result.output == "<div></div>\n"
 
 
+def test_stdin_in_memory(
+    runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # stdin is formatted in memory, without a file walk or a temp file.
+    monkeypatch.setattr(djlint_module, "get_src", _raise)
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", _raise)
+
+    result = runner.invoke(
+        djlint, ("-", "--reformat", "--lint"), input="<div class=a></div>"
+    )
+    assert result.exit_code == 1
+    assert result.output.startswith("<div class=a></div>\n")
+    assert "H011 1:0" in result.output
+
+    result = runner.invoke(
+        djlint, ("-", "--require-pragma"), input="<div class=a></div>"
+    )
+    assert result.exit_code == 0
+    assert "No files to check!" in result.output
+
+
 def test_stdin_non_ascii(runner: CliRunner) -> None:
     result = runner.invoke(djlint, ("-", "--reformat"), input="必須")
     assert result.output == "必須\n"
@@ -0,0 +1,112 @@
+"""Djlint git changed files tests.
+
+run::
+
+    pytest tests/test_djlint/test_git.py
+
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from djlint import main as djlint
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from click.testing import CliRunner
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="git is not installed"
+)
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(  # noqa: S603
+        (
+            "git",
+            "-c",
+            "user.name=djlint",
+            "-c",
+            "user.email=djlint@example.com",
+            *args,
+        ),
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.djlint]\nno_cache=true\n", encoding="utf-8"
+    )
+    (tmp_path / "templates").mkdir()
+    for name in ("a", "b", "c"):
+        (tmp_path / "templates" / f"{name}.html").write_text(
+            "<p>text</p>\n", encoding="utf-8"
+        )
+    _git(tmp_path, "init")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-m", "init")
+    return tmp_path
+
+
+def test_changed_since(runner: CliRunner, repo: Path) -> None:
+    (repo / "templates" / "a.html").write_text(
+        "<div class=a></div>\n", encoding="utf-8"
+    )
+    (repo / "templates" / "new.html").write_text(
+        "<div class=new></div>\n", encoding="utf-8"
+    )
+    (repo / "templates" / "new.txt").write_text(
+        "<div></div>\n", encoding="utf-8"
+    )
+    (repo / "templates" / "c.html").unlink()
+
+    result = runner.invoke(djlint, (str(repo), "--changed-since", "HEAD"))
+    assert result.exit_code == 1
+    assert "Linted 2 files, found 2 errors." in result.output
+
+    # source paths limit the changed files
+    result = runner.invoke(
+        djlint, (str(repo / "templates" / "a.html"), "--changed-since", "HEAD")
+    )
+    assert "Linted 1 file, found 1 error." in result.output
+
+    # excludes still apply
+    result = runner.invoke(
+        djlint,
+        (str(repo), "--changed-since", "HEAD", "--extend-exclude", "new.html"),
+    )
+    assert "Linted 1 file, found 1 error." in result.output
+
+    result = runner.invoke(djlint, (str(repo), "--changed-since", "nothing"))
+    assert result.exit_code == 1
+    assert "Error:" in result.output
+
+
+def test_staged(runner: CliRunner, repo: Path) -> None:
+    (repo / "templates" / "a.html").write_text(
+        "<div class=a></div>\n", encoding="utf-8"
+    )
+    (repo / "templates" / "b.html").write_text(
+        "<div class=b></div>\n", encoding="utf-8"
+    )
+    _git(repo, "add", "templates/b.html")
+
+    result = runner.invoke(djlint, (str(repo), "--staged"))
+    assert result.exit_code == 1
+    assert "Linted 1 file, found 1 error." in result.output
+    assert "b.html" in result.output
+
+    _git(repo, "commit", "-m", "b")
+    result = runner.invoke(djlint, (str(repo), "--staged"))
+    assert result.exit_code == 0
+    assert "No files to check!" in result.output
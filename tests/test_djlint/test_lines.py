@@ -0,0 +1,101 @@
+"""Djlint tests for the classifier and cache of lines to indent.
+
+run::
+
+   pytest tests/test_djlint/test_lines.py --cov=src/djlint --cov-branch \
+          --cov-report xml:coverage.xml --cov-report term-missing
+
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from djlint import main as djlint
+from djlint.lines import LINE_CACHE_MAX_LENGTH, LINE_CACHE_SIZE, LineFacts
+from djlint.reformat import formatter, new_timings
+from djlint.settings import Config
+
+if TYPE_CHECKING:
+    from click.testing import CliRunner
+
+
+@pytest.mark.parametrize(
+    "profile", ["html", "django", "jinja", "nunjucks", "handlebars", "golang"]
+)
+def test_classify(profile: str) -> None:
+    """Skipping patterns does not change the facts of the test templates."""
+    classifier = Config("-", profile=profile).line_classifier
+    assert any(x.literals is not None for x in classifier.checks)
+
+    for template in sorted(Path("tests").rglob("*.html")):
+        for item in template.read_text(encoding="utf-8").splitlines():
+            assert classifier.classify(item) == LineFacts(
+                *(bool(x.test(item)) for x in classifier.checks)
+            ), (template, item)
+
+
+def test_classify_facts() -> None:
+    classify = Config("-", profile="django").line_classifier.classify
+
+    assert not any(classify("plain text"))
+    assert classify("<div>").tag_indent
+    assert classify("</DIV>").tag_unindent
+    assert classify("{% endif %}").tag_unindent
+    assert classify("{% else %}").tag_unindent_line
+    assert classify("<span>text</span>").single_line_tag
+    assert classify("<script>").script_style_opening
+    assert classify("<pre>").ignored_block_opening
+    # the block closes on the same line.
+    assert not classify("<pre>text</pre>").ignored_block_opening
+    assert classify("{% set x = {").set_opening
+
+
+def test_line_cache() -> None:
+    config = Config("-", profile="django")
+    classifier = config.line_classifier
+    timings = new_timings()
+
+    formatter(config, "<div>\n<p>a</p>\n<p>a</p>\n</div>\n", timings=timings)
+    assert timings["line_hits"] > 0
+    assert timings["line_misses"] > 0
+    assert set(timings["stages"]) >= {"compress_html", "indent_html"}
+
+    # the cache is kept for the next file.
+    hits, _ = classifier.cache_info()
+    formatter(config, "<div>\n<p>a</p>\n</div>\n")
+    assert classifier.cache_info()[0] > hits
+
+    # and it is bounded.
+    for number in range(LINE_CACHE_SIZE + 10):
+        classifier.classify(f"<p>{number}</p>")
+    assert classifier.cached_classify.cache_info().currsize == LINE_CACHE_SIZE
+
+    # long lines are not kept.
+    long_line = "<p>" + "x" * LINE_CACHE_MAX_LENGTH + "</p>"
+    classifier.cached_classify.cache_clear()
+    classifier.cached_format_attributes.cache_clear()
+    assert classifier.classify(long_line) == classifier.classify("<p>x</p>")
+    classifier.format_attributes(long_line, long_line)
+    assert classifier.cached_classify.cache_info().currsize == 1
+    assert classifier.cached_format_attributes.cache_info().currsize == 0
+
+
+def test_timings_cli(runner: CliRunner, tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.djlint]\n", encoding="utf-8"
+    )
+    (tmp_path / "one.html").write_text("<div><p>a</p></div>", encoding="utf-8")
+    (tmp_path / "two.html").write_text("<div><p>a</p></div>", encoding="utf-8")
+
+    result = runner.invoke(djlint, (str(tmp_path), "--check", "--timings"))
+    assert "Formatter Timings" in result.output
+    assert "indent_html" in result.output
+    assert "Line cache:" in result.output
+    assert result.exit_code == 1
+
+    # timing does not use the result cache.
+    assert not (tmp_path / ".djlint_cache").exists()
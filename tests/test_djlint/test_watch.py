@@ -0,0 +1,123 @@
+"""Djlint watch mode tests.
+
+run::
+
+    pytest tests/test_djlint/test_watch.py
+
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from djlint import main as djlint
+from djlint.settings import Config
+from djlint.src import get_src
+from djlint.watch import Watcher, check_files
+
+if TYPE_CHECKING:
+    import pytest
+    from click.testing import CliRunner
+
+
+def _write(path: Path, text: str, mtime: int) -> None:
+    # set the mtime, file systems may not see a change in the same tick.
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_watcher(tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "x.html").write_text("", encoding="utf-8")
+    template = tmp_path / "a.html"
+    _write(template, "<p>a</p>", 1_000_000_000)
+    (tmp_path / "a.txt").write_text("", encoding="utf-8")
+
+    watcher = Watcher(Config(str(tmp_path)), (tmp_path,))
+    assert list(watcher.files) == [template]
+    assert watcher.poll() == []
+
+    _write(template, "<p>b</p>", 2_000_000_000)
+    assert watcher.poll() == [template]
+
+    # a new mtime with the same content is not a change
+    _write(template, "<p>b</p>", 3_000_000_000)
+    assert watcher.poll() == []
+
+    # new files in new directories are found
+    (tmp_path / "sub").mkdir()
+    new = tmp_path / "sub" / "b.html"
+    new.write_text("<p>c</p>", encoding="utf-8")
+    assert watcher.poll() == [new]
+
+    template.unlink()
+    assert watcher.poll() == []
+    assert list(watcher.files) == [new]
+
+
+def test_watcher_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.html").write_text("<p>a</p>", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    # the paths are the ones a run without --watch prints and caches.
+    config = Config("sub")
+    src = [Path("sub"), Path("sub/a.html")]
+    for item in src:
+        assert list(Watcher(config, (item,)).files) == get_src((item,), config)
+
+
+def test_watcher_pragma(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.djlint]\nrequire_pragma=true\n", encoding="utf-8"
+    )
+    template = tmp_path / "a.html"
+    _write(template, "<div class=a></div>", 1_000_000_000)
+    config = Config(str(tmp_path), lint=True)
+
+    # files without the pragma are watched, in case it is added.
+    watcher = Watcher(config, (tmp_path,))
+    assert list(watcher.files) == [template]
+
+    _write(template, "<div class=b></div>", 2_000_000_000)
+    check_files(config, watcher.poll())
+    assert "H011" not in capsys.readouterr().out
+
+    _write(template, "<!-- djlint:on -->\n<div class=c></div>", 3_000_000_000)
+    check_files(config, watcher.poll())
+    assert "H011" in capsys.readouterr().out
+
+
+def test_watch(
+    runner: CliRunner, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+    template = tmp_path / "a.html"
+    _write(template, "<div><p>a</p></div>", 1_000_000_000)
+    polls: list[None] = []
+
+    def sleep(_: float) -> None:
+        polls.append(None)
+        if len(polls) == 1:
+            _write(template, "<div><p>b</p></div>", 2_000_000_000)
+        else:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr("djlint.watch.time.sleep", sleep)
+    result = runner.invoke(djlint, (str(tmp_path), "--reformat", "--watch"))
+
+    assert result.exit_code == 0
+    assert "Watching 1 file for changes." in result.output
+    assert result.output.count("1 file was updated.") == 2
+    assert (
+        template.read_text(encoding="utf-8") == "<div>\n    <p>b</p>\n</div>\n"
+    )
+
+    result = runner.invoke(djlint, ("-", "--watch"))
+    assert result.exit_code == 2
@@ -0,0 +1,87 @@
+"""Djlint tests for the line index of the linter.
+
+run::
+
+   pytest tests/test_linter/test_line_index.py --cov=src/djlint --cov-branch \
+          --cov-report xml:coverage.xml --cov-report term-missing
+
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+import regex as re
+
+from djlint.lint import ErrorRecord, LineIndex, get_line, linter
+from djlint.settings import Config
+
+
+def _line_ends(html: str) -> list[dict[str, int]]:
+    """Line ends as python_module rules used to receive them."""
+    return [
+        {"start": m.start(), "end": m.end()}
+        for m in re.finditer(r"(?:.*\n)|(?:[^\n]+$)", html)
+    ]
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        pytest.param("", id="empty"),
+        pytest.param("<div>", id="one line"),
+        pytest.param("<div>\n", id="trailing newline"),
+        pytest.param("\n\n<div>\n\n</div>", id="blank lines"),
+        pytest.param("<div>\r\n  <p>\r\n</div>\r\n", id="crlf"),
+    ],
+)
+def test_line_index(html: str) -> None:
+    line_ends = _line_ends(html)
+    index = LineIndex(html)
+
+    assert list(index) == line_ends
+    assert len(index) == len(line_ends)
+    for position in range(len(html)):
+        assert get_line(position, index) == get_line(position, line_ends)
+
+
+def test_line_index_sequence() -> None:
+    index = LineIndex("a\nbb\nccc")
+    assert index[-1] == {"start": 5, "end": 8}
+    assert index[1:] == [{"start": 2, "end": 5}, {"start": 5, "end": 8}]
+    assert index.index({"start": 2, "end": 5}) == 1
+    with pytest.raises(IndexError):
+        index[3]
+
+
+def test_line_index_lookups() -> None:
+    """Lookups do not walk the lines."""
+    html = "<div></div>\n" * 20_000
+    positions = range(0, len(html), 97)
+
+    start = time.perf_counter()
+    index = LineIndex(html)
+    lines = [get_line(x, index) for x in positions]
+    elapsed = time.perf_counter() - start
+
+    assert lines[-1] == get_line(positions[-1], _line_ends(html))
+    print(f"\n{len(index)} lines, {len(positions)} lookups in {elapsed:.3f}s")
+
+
+def test_error_records() -> None:
+    """Errors are deduplicated and sorted by line and column as numbers."""
+    config = Config("-", profile="html")
+    html = "\n" * 9 + "<img>\n<img><img>\n"
+    errors = linter(config, html, "-", "-")["-"]
+
+    assert [x["line"] for x in errors if x["code"] == "H006"] == [
+        "10:0",
+        "11:0",
+        "11:5",
+    ]
+    assert len(errors) == len({tuple(x.values()) for x in errors})
+
+    record = ErrorRecord.from_dict(errors[1], LineIndex(html))
+    assert (record.line, record.column, record.offset) == (10, 0, 9)
+    assert record.as_dict() == errors[1]
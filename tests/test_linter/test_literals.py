@@ -0,0 +1,224 @@
+"""Djlint tests for the literals that linter rules need to match.
+
+run::
+
+   pytest tests/test_linter/test_literals.py --cov=src/djlint --cov-branch \
+          --cov-report xml:coverage.xml --cov-report term-missing
+
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import pytest
+import regex as re
+
+from djlint.lint import RulePlan, Scan, linter
+from djlint.literals import DocumentLiterals, Literals, required_literals
+from djlint.settings import Config
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@pytest.mark.parametrize(
+    ("pattern", "flags", "expected"),
+    [
+        pytest.param(
+            r"<img\b[^>]*>",
+            0,
+            Literals(frozenset({"<img"}), ignore_case=False),
+            id="run",
+        ),
+        pytest.param(
+            r"<(?:link|script)\s+href=",
+            0,
+            Literals(frozenset({"href="}), ignore_case=False),
+            id="longest",
+        ),
+        pytest.param(
+            r"<(?:link|script)\s",
+            0,
+            Literals(frozenset({"link", "script"}), ignore_case=False),
+            id="branch",
+        ),
+        pytest.param(
+            r"JavaScript:",
+            re.I,
+            Literals(frozenset({"javascript:"}), ignore_case=True),
+            id="ignore case",
+        ),
+        pytest.param(
+            r"(?i)</HTML>",
+            0,
+            Literals(frozenset({"</html>"}), ignore_case=True),
+            id="inline flag",
+        ),
+        pytest.param(
+            r"(?<=<)/?p",
+            0,
+            Literals(frozenset({"<"}), ignore_case=False),
+            id="lookbehind",
+        ),
+        pytest.param(
+            r"(?:ab)+",
+            0,
+            Literals(frozenset({"ab"}), ignore_case=False),
+            id="repeat",
+        ),
+        pytest.param(r"(?:ab)*c?", 0, None, id="optional"),
+        pytest.param(
+            r"<(?:a|\w+)>",
+            0,
+            Literals(frozenset({"<"}), ignore_case=False),
+            id="open branch",
+        ),
+        pytest.param(
+            r"x(?i:abc)",
+            0,
+            Literals(frozenset({"x"}), ignore_case=False),
+            id="scoped flag",
+        ),
+        pytest.param(r"\p{L}+:", 0, None, id="regex syntax"),
+        pytest.param(r"[[:alpha:]]\$", 0, None, id="posix class"),
+        pytest.param(r"(?:colour){e<=1}", 0, None, id="fuzzy"),
+        pytest.param(r"(?V1)[\w--\d]x", 0, None, id="version flag"),
+        pytest.param(r"ab[[]c", 0, None, id="nested set"),
+        pytest.param(r"abc", re.V1, None, id="regex flag"),
+    ],
+)
+def test_required_literals(
+    pattern: str, flags: int, expected: Literals | None
+) -> None:
+    literals = required_literals(pattern, flags)
+    assert literals == expected
+
+    # the literals are found in every match.
+    if literals is not None:
+        for text in (
+            "<img src=a>",
+            "<script href=x>",
+            "<link >",
+            "javascript:",
+            "</html>",
+            "<p>",
+            "abab",
+            "xabc",
+        ):
+            if re.search(pattern, text, flags=flags):
+                assert literals in DocumentLiterals(text)
+
+
+@pytest.mark.parametrize(
+    "parse",
+    [
+        pytest.param(lambda *_: 1 / 0, id="raises"),
+        pytest.param(lambda *_: object(), id="new shape"),
+    ],
+)
+def test_broken_parser(
+    parse: Callable[..., object], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A change to the private parser only turns the prefilter off."""
+    monkeypatch.setattr(
+        "djlint.literals.sre_parse", SimpleNamespace(parse=parse)
+    )
+    assert required_literals(r"<img\b", 0) is None
+
+    config = Config("-", profile="all")
+    assert all(x.literals is None for x in config.rule_plan.scans)
+    assert {x["code"] for x in linter(config, "<img>", "-", "-")["-"]} >= {
+        "H006"
+    }
+
+
+def test_document_literals() -> None:
+    document = DocumentLiterals("<IMG src=a>")
+    assert Literals(frozenset({"<img"}), ignore_case=True) in document
+    assert Literals(frozenset({"<img"}), ignore_case=False) not in document
+    assert Literals(frozenset({"<a", "src"}), ignore_case=False) in document
+    assert not document.misses(None)
+
+    # letters that match an ascii letter when ignoring case.
+    document = DocumentLiterals("Kſ")
+    assert re.search("ks", document.html, flags=re.I)
+    assert Literals(frozenset({"ks"}), ignore_case=True) in document
+
+
+def test_prefilter_results() -> None:
+    """Skipping rules does not change the errors of the test templates."""
+    config = Config("-", profile="all")
+    plan = config.rule_plan
+    assert any(x.literals for x in plan.scans)
+
+    full_config = Config("-", profile="all")
+    full_config.__dict__["rule_plan"] = RulePlan(
+        plan.rules,
+        tuple(Scan(x.pattern, x.rules, None) for x in plan.scans),
+        plan.per_file_ignores,
+    )
+
+    for template in sorted(Path("tests").rglob("*.html")):
+        html = template.read_text(encoding="utf-8")
+        assert linter(config, html, "-", "-") == linter(
+            full_config, html, "-", "-"
+        ), template
+
+
+def test_requires(tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.djlint]\n", encoding="utf-8"
+    )
+    (tmp_path / ".djlint_rules.yaml").write_text(
+        """- rule:
+    name: X001
+    message: Image in a card
+    flags: re.I
+    requires: Card
+    patterns:
+      - <img
+- rule:
+    name: X002
+    message: Bad module
+    requires: [bad, worse]
+    python_module: tests.test_linter.test_python_module_rules.my_module
+""",
+        encoding="utf-8",
+    )
+    config = Config(str(tmp_path), profile="django")
+
+    def codes(html: str) -> set[str]:
+        return {x["code"] for x in linter(config, html, "-", "-")["-"]}
+
+    assert codes("<img>") >= {"H006"}
+    assert "X001" not in codes("<img>")
+    assert "X001" in codes("<div class=CARD><img>")
+    assert "X002" not in codes("<div>")
+    assert "X002" in codes("<div>bad</div>")
+
+
+def test_regex_syntax_rules(tmp_path: Path) -> None:
+    """Rules using syntax of the regex module run on every file."""
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.djlint]\n", encoding="utf-8"
+    )
+    (tmp_path / ".djlint_rules.yaml").write_text(
+        """- rule:
+    name: C001
+    message: Letter before a dollar
+    patterns:
+      - '[[:alpha:]]\\$'
+- rule:
+    name: C002
+    message: Colour
+    patterns:
+      - (?:colour){e<=1}
+""",
+        encoding="utf-8",
+    )
+    config = Config(str(tmp_path), profile="django")
+    errors = linter(config, "<p>a$ color</p>", "-", "-")["-"]
+    assert {x["code"] for x in errors} >= {"C001", "C002"}
@@ -0,0 +1,87 @@
+"""Djlint tests for the linter rule profile.
+
+run::
+
+   pytest tests/test_linter/test_profile_rules.py --cov=src/djlint --cov-branch \
+          --cov-report xml:coverage.xml --cov-report term-missing
+
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from djlint import main as djlint
+from djlint.lint import linter, merge_profiles
+from djlint.settings import Config
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from click.testing import CliRunner
+
+    from djlint.lint import RuleProfile
+
+HTML = """<img>
+<!-- djlint:off -->
+<img>
+<!-- djlint:on -->
+{# djlint:off H013 #}<img>{# djlint:on #}
+"""
+
+
+def test_profile() -> None:
+    config = Config("-", profile="html")
+    profile: dict[str, RuleProfile] = {}
+    errors = linter(config, HTML, "-", "-", profile=profile)["-"]
+
+    assert set(profile) == {x["rule"]["name"] for x in config.linter_rules}
+    # H013 is turned off by the djlint:off comments.
+    assert profile["H013"]["matches"] == 3
+    assert profile["H013"]["ignored"] == 2
+    assert [x["code"] for x in errors].count("H013") == 1
+    # python_module rules are profiled too.
+    assert profile["H025"]["time"] > 0
+
+    total: dict[str, RuleProfile] = {}
+    merge_profiles(total, profile)
+    merge_profiles(total, profile)
+    assert total["H013"]["matches"] == 6
+    assert total["H025"]["time"] == 2 * profile["H025"]["time"]
+
+
+def test_profile_rules_cli(runner: CliRunner, tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text(
+        "[tool.djlint]\n", encoding="utf-8"
+    )
+    (tmp_path / "one.html").write_text(HTML, encoding="utf-8")
+    (tmp_path / "two.html").write_text(HTML, encoding="utf-8")
+    output = tmp_path / "profile.json"
+
+    result = runner.invoke(
+        djlint,
+        (
+            str(tmp_path),
+            "--profile",
+            "html",
+            "--statistics",
+            "--profile-rules-json",
+            str(output),
+        ),
+    )
+    assert "Statistics" in result.output
+    assert "Rule Profile" in result.output
+    assert result.exit_code == 1
+
+    # the profile of both files, slowest rules first.
+    rules = json.loads(output.read_text(encoding="utf-8"))
+    assert [x["time"] for x in rules] == sorted(
+        (x["time"] for x in rules), reverse=True
+    )
+    assert {"code": "H013", "matches": 6, "ignored": 4}.items() <= next(
+        x for x in rules if x["code"] == "H013"
+    ).items()
+
+    # profiling does not use the result cache.
+    assert not (tmp_path / ".djlint_cache").exists()
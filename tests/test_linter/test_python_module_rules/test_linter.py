@@ -12,8 +12,12 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from djlint import main as djlint
+from djlint.settings import Config
+from tests.test_linter.test_python_module_rules import my_module
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from click.testing import CliRunner
 
 
@@ -29,3 +33,40 @@ def test_custom_rules(runner: CliRunner) -> None:
     assert """T001 2:4""" in result.output
     assert """Linted 2 files, found 1 error.""" in result.output
     assert result.exit_code == 1
+
+
+def test_rule_plan() -> None:
+    """Test that python_module rules are resolved once per config."""
+    config = Config(
+        "tests/test_linter/test_python_module_rules/", profile="django"
+    )
+    plan = config.rule_plan
+    assert config.rule_plan is plan
+
+    rules = {rule.name: rule for rule in plan.rules}
+    assert rules["T001"].run is my_module.run
+    assert not rules["T001"].patterns
+    assert rules["H025"].run is not None
+    assert rules["H006"].patterns
+    assert rules["H006"].run is None
+
+
+def test_broken_module(runner: CliRunner, tmp_path: Path) -> None:
+    """A rule module that fails to load is reported, the others still run."""
+    (tmp_path / "pyproject.toml").write_text("[tool]", encoding="utf-8")
+    (tmp_path / ".djlint_rules.yaml").write_text(
+        """- rule:
+    name: T002
+    message: Missing module
+    python_module: tests.does_not_exist
+""",
+        encoding="utf-8",
+    )
+    (tmp_path / "html.html").write_text("<img>\n", encoding="utf-8")
+
+    result = runner.invoke(djlint, (str(tmp_path), "--profile", "django"))
+    print(result.output)
+    assert "E002 1:0 Rule T002 could not be loaded." in result.output
+    assert "ModuleNotFoundError" in result.output
+    assert "H006 1:0" in result.output
+    assert result.exit_code == 1
@@ -0,0 +1,225 @@
+"""Djlint tests for the ignored regions index of the linter and formatter.
+
+run::
+
+   pytest tests/test_linter/test_regions.py --cov=src/djlint --cov-branch \
+          --cov-report xml:coverage.xml --cov-report term-missing
+
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import regex as re
+
+from djlint import helpers
+from djlint.lint import linter
+from djlint.regions import Blocks, FormatRegions, Intervals, LintRegions
+from djlint.settings import Config
+
+HTML = """<div>
+<!-- djlint:off -->
+<img src="a.png">
+<!-- djlint:on -->
+{# djlint:off H006,H013 #}
+<img src="b.png">
+{# djlint:on #}
+<script>
+  var img = "<img>";
+</script>
+<pre><img></pre>
+<img src="c.png">{% comment %}<img>{% endcomment %}
+{# djlint:off H025 , H013 #}
+<img src="d.png"><span>
+{# djlint:on #}
+<!-- djlint:off H006-->
+<img src="e.png">
+<!-- djlint:on -->
+{% raw %}<img src="f.png">{% endraw %}
+</div>
+"""
+
+
+def test_intervals() -> None:
+    intervals = Intervals([(10, 20), (0, 5), (15, 30), (40, 40)])
+    assert len(intervals) == 3
+    assert [x in intervals for x in (0, 5, 6, 10, 25, 30, 31, 40, 41)] == [
+        True,
+        True,
+        False,
+        True,
+        True,
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert 1 not in Intervals([])
+
+
+def test_blocks() -> None:
+    blocks = Blocks([(0, 50), (10, 20), (60, 70)])
+    assert blocks.contain(10, 50)
+    assert blocks.contain(60, 70)
+    assert not blocks.contain(45, 61)
+    assert not blocks.contain(55, 58)
+    assert not Blocks([]).contain(0, 0)
+
+    # blocks starting at the span do not surround it.
+    assert blocks.surround(10, 20)
+    assert not blocks.surround(0, 20)
+    assert not blocks.surround(60, 70)
+    assert not Blocks([]).surround(0, 0)
+
+
+def test_format_regions() -> None:
+    """The index gives the same answers as scanning the blocks."""
+    config = Config("-", profile="all")
+    patterns = config.patterns
+    regions = FormatRegions(config, HTML)
+
+    ignored = [
+        *patterns.ignored_blocks.finditer(HTML),
+        *patterns.ignored_inline_blocks.finditer(HTML),
+    ]
+    unformatted = list(patterns.unformatted_blocks.finditer(HTML))
+    assert ignored
+    assert unformatted
+
+    for match in re.finditer(r"<[^>]*>|{[^}]*}", HTML):
+        assert regions.inside_ignored_block(match) == any(
+            x.start() <= match.start() and match.end() <= x.end()
+            for x in ignored
+        )
+        assert regions.child_of_unformatted_block(match) == any(
+            x.start() < match.start() and match.end() <= x.end()
+            for x in unformatted
+        )
+
+
+def test_lint_regions() -> None:
+    config = Config("-", profile="all")
+    regions = LintRegions(config, HTML)
+    tags = list(re.finditer(r"<[^>]*>|{[^}]*}", HTML))
+
+    # tags touching an ignored block, like the script, pre and comment.
+    assert [
+        x.group() for x in tags if not regions.overlaps_ignored_block(x)
+    ] == [
+        "<div>",
+        "{# djlint:off H006,H013 #}",
+        '<img src="b.png">',
+        "{# djlint:on #}",
+        "{# djlint:off H025 , H013 #}",
+        '<img src="d.png">',
+        "<span>",
+        "{# djlint:on #}",
+        '<img src="e.png">',
+        "{% raw %}",
+        '<img src="f.png">',
+        "{% endraw %}",
+        "</div>",
+    ]
+    assert [
+        x.group() for x in tags if regions.inside_ignored_linter_block(x)
+    ] == ["{% raw %}", '<img src="f.png">']
+
+    # a djlint:off without rules ignores every rule.
+    off = ["<!-- djlint:off -->", '<img src="a.png">']
+    assert {
+        rule: [x.group() for x in tags if regions.inside_ignored_rule(x, rule)]
+        for rule in ("H006", "H013", "H025")
+    } == {
+        "H006": [
+            *off,
+            "{# djlint:off H006,H013 #}",
+            '<img src="b.png">',
+            "{# djlint:on #}",
+            "<!-- djlint:off H006-->",
+            '<img src="e.png">',
+            "<!-- djlint:on -->",
+        ],
+        "H013": [
+            *off,
+            "{# djlint:off H006,H013 #}",
+            '<img src="b.png">',
+            "{# djlint:on #}",
+            "{# djlint:off H025 , H013 #}",
+            '<img src="d.png">',
+            "<span>",
+            "{# djlint:on #}",
+        ],
+        "H025": [
+            *off,
+            "{# djlint:off H025 , H013 #}",
+            '<img src="d.png">',
+            "<span>",
+            "{# djlint:on #}",
+        ],
+    }
+
+
+def test_helpers() -> None:
+    """The helpers kept for custom rules answer like the regions."""
+    config = Config("-", profile="all")
+    format_regions = FormatRegions(config, HTML)
+    lint_regions = LintRegions(config, HTML)
+
+    for match in re.finditer(r"<[^>]*>|{[^}]*}", HTML):
+        for name in (
+            "inside_ignored_block",
+            "child_of_unformatted_block",
+            "inside_template_block",
+        ):
+            assert getattr(helpers, name)(config, HTML, match) == getattr(
+                format_regions, name
+            )(match)
+        for name in ("overlaps_ignored_block", "inside_ignored_linter_block"):
+            assert getattr(helpers, name)(config, HTML, match) == getattr(
+                lint_regions, name
+            )(match)
+        assert helpers.inside_ignored_rule(
+            config, HTML, match, "H006"
+        ) == lint_regions.inside_ignored_rule(match, "H006")
+
+
+def test_large_template() -> None:
+    """Linting scales with the size of the template."""
+    config = Config("-", profile="all")
+    html = "\n".join(
+        x.read_text(encoding="utf-8")
+        for x in sorted(Path("tests").rglob("*.html"))
+    )
+    html = (html * 20)[:25_000]
+
+    start = time.perf_counter()
+    errors = linter(config, html, "-", "-")["-"]
+    print(
+        f"\n{len(html) // 1000} KB template, {len(errors)} errors"
+        f" in {time.perf_counter() - start:.3f}s"
+    )
+    assert errors
+
+
+def test_many_suppressions() -> None:
+    """Suppression checks do not walk every djlint:off comment."""
+    config = Config("-", profile="all")
+    html = "".join(
+        f"{{# djlint:off H0{i % 40:02d} #}}<img src='{i}.png'>{{# djlint:on #}}\n"
+        for i in range(500)
+    )
+
+    start = time.perf_counter()
+    regions = LintRegions(config, html)
+    errors = linter(config, html, "-", "-")["-"]
+    elapsed = time.perf_counter() - start
+
+    assert len(regions.ignored_rules) == 40
+    assert {x["code"] for x in errors} >= {"H006", "H013"}
+    assert all(
+        x["code"] != "H006" or (int(x["line"].split(":")[0]) - 1) % 40 != 6
+        for x in errors
+    )
+    print(f"\n500 suppressions, {len(errors)} errors in {elapsed:.3f}s")
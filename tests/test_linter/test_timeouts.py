@@ -0,0 +1,112 @@
+"""Djlint tests for the time budgets of the linter.
+
+run::
+
+   pytest tests/test_linter/test_timeouts.py --cov=src/djlint --cov-branch \
+          --cov-report xml:coverage.xml --cov-report term-missing
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from djlint import main as djlint
+from djlint.lint import TIMEOUT_CODE, linter
+from djlint.settings import Config
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from click.testing import CliRunner
+
+# the tempered dot looks for a closing tag from every opening tag. The
+# closing tag is in the document, so the rule is not skipped.
+SLOW_RULE = """- rule:
+    name: X001
+    message: Slow rule
+    patterns:
+      - <a(?:(?!</a>).)*?</b>
+"""
+SLOW_HTML = "</b>" + "<a>" * 20_000
+
+
+def _project(tmp_path: Path, settings: str = "") -> Path:
+    (tmp_path / "pyproject.toml").write_text(
+        f"[tool.djlint]\n{settings}", encoding="utf-8"
+    )
+    (tmp_path / ".djlint_rules.yaml").write_text(SLOW_RULE, encoding="utf-8")
+    return tmp_path
+
+
+def test_rule_timeout(tmp_path: Path) -> None:
+    config = Config(str(_project(tmp_path)), profile="django", rule_timeout=0.1)
+    errors = linter(config, SLOW_HTML, "-", "-")["-"]
+
+    assert {
+        "code": TIMEOUT_CODE,
+        "line": "1:0",
+        "match": "X001",
+        "message": "Rule X001 took longer than 0.1s and was stopped.",
+    } in errors
+    assert "X001" not in {x["code"] for x in errors}
+
+    # other rules still run.
+    errors = linter(config, "<img>", "-", "-")["-"]
+    assert {x["code"] for x in errors} == {"H006", "H013"}
+
+
+def test_file_timeout(tmp_path: Path) -> None:
+    config = Config(
+        str(_project(tmp_path, "file_timeout = 0.1")), profile="django"
+    )
+    assert config.file_timeout == 0.1
+    assert config.rule_timeout is None
+
+    errors = linter(config, SLOW_HTML, "-", "-")["-"]
+    timeouts = [x for x in errors if x["code"] == TIMEOUT_CODE]
+    assert len(timeouts) == 1
+    assert timeouts[0]["message"].startswith("Linting took longer than 0.1s")
+
+
+def test_no_timeout(tmp_path: Path) -> None:
+    config = Config(
+        str(_project(tmp_path, "rule_timeout = 0")), profile="django"
+    )
+    assert not config.rule_timeout
+
+    errors = linter(config, "<a></b>", "-", "-")["-"]
+    assert "X001" in {x["code"] for x in errors}
+
+
+def test_timeout_cli(runner: CliRunner, tmp_path: Path) -> None:
+    """A slow file is reported and the other files are still linted."""
+    _project(tmp_path)
+    (tmp_path / "slow.html").write_text(SLOW_HTML, encoding="utf-8")
+    (tmp_path / "ok.html").write_text("<img>", encoding="utf-8")
+
+    result = runner.invoke(
+        djlint,
+        (
+            str(tmp_path),
+            "--profile",
+            "django",
+            "--rule-timeout",
+            "0.1",
+            "--ignore",
+            "H025",
+            "--statistics",
+        ),
+    )
+    assert "E001 1:0 Rule X001 took longer than 0.1s" in result.output
+    assert "H006 1:0" in result.output
+    assert "Linted 2 files" in result.output
+    assert "Rule or file ran out of time." in result.output
+    assert result.exit_code == 1
+
+    # the result of the slow file is not cached.
+    assert not any(
+        TIMEOUT_CODE in x.read_text(encoding="utf-8", errors="ignore")
+        for x in (tmp_path / ".djlint_cache").rglob("*")
+        if x.is_file()
+    )